@@ -0,0 +1,118 @@
+# Database/Allocation.py
+"""
+Automatic batch allocation for sales orders.
+
+Every open line of an order (quantity sold less what is already assigned to
+batches) is filled from the batches with stock still available, taking them
+first-expired-first-out when a batch has an ExpiryDate and first-in-first-out
+by batch date otherwise. Candidate batches are kept in a heap per product, so an
+order costs one query for its lines, one for the candidate batches and one
+executemany for the Sales_Inventory_Batch rows, all in one transaction.
+allocate_pending() runs the same pass over every "Not Delivered" order, oldest
+first, sharing the heaps so no unit is promised twice.
+"""
+import heapq
+import sqlite3
+from typing import NamedTuple
+
+from Database.Database import DatabaseConnection
+
+
+class Allocation(NamedTuple):
+    sale_no: str
+    product_id: int
+    batch_id: int
+    quantity: int
+
+
+class AllocationResult(NamedTuple):
+    allocations: list  # [Allocation, ...]
+    shortfalls: list  # [(SaleNo, ProductID, quantity still unassigned), ...]
+
+
+class BatchAllocator:
+
+    def __init__(self, db_connection: DatabaseConnection = None):
+        self.db_connection = db_connection or DatabaseConnection()
+
+    def allocate(self, saleNo: str) -> AllocationResult:
+        """Fills the open lines of one sales order that has not been delivered yet."""
+        return self._run("s.SaleNo = ? AND s.Status != 'Delivered'", (saleNo,))
+
+    def allocate_pending(self) -> AllocationResult:
+        """Fills the open lines of every "Not Delivered" sales order, oldest order first."""
+        return self._run("s.Status = 'Not Delivered'", ())
+
+    def _run(self, where: str, params: tuple) -> AllocationResult:
+        db = self.db_connection
+        try:
+            with db.transaction():
+                lines = self._open_lines(where, params)
+                heaps = self._candidate_batches({line[3] for line in lines})
+
+                allocations, shortfalls, rows = [], [], []
+                for salesInventoryID, saleNo, _, productID, remaining in lines:
+                    heap = heaps.get(productID, [])
+                    while remaining > 0 and heap:
+                        key, batchID, available = heapq.heappop(heap)
+                        taken = min(remaining, available)
+                        if available > taken:
+                            heapq.heappush(heap, (key, batchID, available - taken))
+                        remaining -= taken
+                        allocations.append(Allocation(saleNo, productID, batchID, taken))
+                        rows.append((salesInventoryID, batchID, taken))
+                    if remaining > 0:
+                        shortfalls.append((saleNo, productID, remaining))
+
+                self._write(rows)
+                self._log(allocations)
+                return AllocationResult(allocations, shortfalls)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return AllocationResult([], [])
+
+    def _open_lines(self, where: str, params: tuple) -> list:
+        """Returns [(SalesInventoryID, SaleNo, SaleID, ProductID, unassigned quantity), ...] ordered by sale."""
+        cursor = self.db_connection.cursor
+        cursor.execute(f"""SELECT si.SalesInventoryID, s.SaleNo, s.SaleID, si.ProductID,
+            si.QuantitySold - COALESCE((SELECT SUM(b.QuantityTaken) FROM Sales_Inventory_Batch b
+            WHERE b.SalesInventoryID = si.SalesInventoryID), 0) AS Remaining
+            FROM Sales s INNER JOIN Sales_Inventory si ON s.SaleID = si.SaleID
+            WHERE {where} AND Remaining > 0
+            ORDER BY s.SaleID, si.SalesInventoryID""", params)
+        return cursor.fetchall()
+
+    def _candidate_batches(self, productIDs: set) -> dict:
+        """Returns {ProductID: heap of ((expiry key, batch date, PBatchID), PBatchID, available)}"""
+        if not productIDs:
+            return {}
+        cursor = self.db_connection.cursor
+        cursor.execute(f"""SELECT a.ProductID, a.PBatchID, a.Available, pb.ExpiryDate, pb.BatchDate
+            FROM Batch_Availability a INNER JOIN Product_Batch pb ON a.PBatchID = pb.PBatchID
+            WHERE a.ProductID IN ({', '.join('?' * len(productIDs))}) AND a.Available > 0""", sorted(productIDs))
+        heaps = {}
+        for productID, batchID, available, expiry, batchDate in cursor.fetchall():
+            # Batches with an expiry date go first, soonest first; the rest follow in batch order
+            key = (expiry is None, expiry or "", batchDate or "", batchID)
+            heaps.setdefault(productID, []).append((key, batchID, available))
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        return heaps
+
+    def _write(self, rows: list) -> None:
+        cursor = self.db_connection.cursor
+        cursor.executemany("""UPDATE Sales_Inventory_Batch SET QuantityTaken = QuantityTaken + ?3
+            WHERE SalesInventoryBatchID = (SELECT MIN(SalesInventoryBatchID) FROM Sales_Inventory_Batch
+            WHERE SalesInventoryID = ?1 AND PBatchID = ?2)""", rows)
+        cursor.executemany("""INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken)
+            SELECT ?1, ?2, ?3 WHERE NOT EXISTS
+            (SELECT 1 FROM Sales_Inventory_Batch WHERE SalesInventoryID = ?1 AND PBatchID = ?2)""", rows)
+
+    def _log(self, allocations: list) -> None:
+        totals = {}
+        for allocation in allocations:
+            totals[allocation.sale_no] = totals.get(allocation.sale_no, 0) + allocation.quantity
+        for saleNo, quantity in totals.items():
+            self.db_connection.logger.info(f"Allocate Sales Order | Assigned {quantity} units to {saleNo}",
+                                           type="report", key="User Activities")
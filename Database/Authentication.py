@@ -127,8 +127,8 @@ class authentication:
         cursor = self.db_connection.cursor
         hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=14))
         try:
-            cursor.execute("""UPDATE Accounts SET HashedPW = ? WHERE WorkerID = ?""", (hashed, employeeID,))
-            self.db_connection.connection.commit()
+            with self.db_connection.transaction():
+                cursor.execute("""UPDATE Accounts SET HashedPW = ? WHERE WorkerID = ?""", (hashed, employeeID,))
         except sqlite3.Error as err:
             logger.error(f"Password reset failed: {err}")
 
@@ -139,12 +139,13 @@ class authentication:
         hashed = bcrypt.hashpw(employeePassword.encode("utf-8"), bcrypt.gensalt(rounds=14))
 
         try:
-            cursor.execute("""INSERT INTO Workers (RoleID, Name, ContactNumber)
-                              VALUES (?, ?, ?)""", (employeeRoleID, employeeName, employeeContactNumber,))
-            employeeID = cursor.lastrowid
-            cursor.execute("""INSERT INTO Accounts (WorkerID, Email, HashedPW)
-                              VALUES (?, ?, ?)""", (employeeID, email, hashed,))
-            self.db_connection.connection.commit()
+            with self.db_connection.transaction():
+                cursor.execute("""INSERT INTO Workers (RoleID, Name, ContactNumber)
+                                  VALUES (?, ?, ?)""", (employeeRoleID, employeeName, employeeContactNumber,))
+                employeeID = cursor.lastrowid
+                cursor.execute("""INSERT INTO Accounts (WorkerID, Email, HashedPW)
+                                  VALUES (?, ?, ?)""", (employeeID, email, hashed,))
+                self.db_connection.lookups.invalidate("Workers")
             return True
         except sqlite3.Error as e:
             logger.error(f"Create account error: {e}")
@@ -157,15 +158,16 @@ class authentication:
         hashed = bcrypt.hashpw(employeePassword.encode("utf-8"), bcrypt.gensalt(rounds=14))
 
         try:
-            cursor.execute("""UPDATE Workers
-                              SET RoleID = ?, Name = ?, ContactNumber = ?
-                              WHERE WorkerID = ?""",
-                           (employeeRoleID, employeeName, employeeContactNumber, employeeID,))
-            cursor.execute("""UPDATE Accounts
-                              SET Email = ?, HashedPW = ?
-                              WHERE WorkerID = ?""",
-                           (email, hashed, employeeID))
-            self.db_connection.connection.commit()
+            with self.db_connection.transaction():
+                cursor.execute("""UPDATE Workers
+                                  SET RoleID = ?, Name = ?, ContactNumber = ?
+                                  WHERE WorkerID = ?""",
+                               (employeeRoleID, employeeName, employeeContactNumber, employeeID,))
+                self.db_connection.lookups.invalidate("Workers")
+                cursor.execute("""UPDATE Accounts
+                                  SET Email = ?, HashedPW = ?
+                                  WHERE WorkerID = ?""",
+                               (email, hashed, employeeID))
             return True
         except sqlite3.Error as e:
             logger.error(f"Update account error: {e}")
@@ -0,0 +1,305 @@
+# Database/BulkImport.py
+"""
+Streaming bulk import of products, vendors and purchase orders.
+
+Files are read one record at a time (CSV, JSON Lines, or a JSON array, which is
+decoded element by element), validated in chunks and written with executemany, one
+transaction per chunk. Records that cannot be parsed or fail validation are reported
+with their row number and skipped, so one bad row never aborts the file. If the rest
+of a file cannot be read, e.g. a JSON array cut short, the import stops there and
+reports it as a rejected row after the chunks already written. A single summary
+notification replaces the per-row ones sent by add_product / add_vendor / add_purchaseOrder.
+
+Expected columns:
+    Products:        ProductNo, ProductName, Description, Price, Vendor
+    Vendors:         Name, Email, ContactNumber
+    Purchase Orders: ProductNo, Quantity, Vendor, BatchNo
+Vendor is a vendor name, or a vendor ID.
+"""
+import csv
+import json
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from Database import Sequences
+from Database.Database import DatabaseConnection
+
+CHUNK_SIZE = 500
+READ_SIZE = 64 * 1024  # Characters of a .json file read at a time
+SUFFIXES = (".csv", ".jsonl", ".json")
+
+
+class RowError(NamedTuple):
+    row: int  # 1-based record number, excluding the CSV header
+    message: str
+
+
+class ImportResult(NamedTuple):
+    imported: int
+    errors: list  # [RowError, ...]
+
+
+def read_records(filepath: str) -> Iterator[dict | ValueError]:
+    """
+    Yields each record of a .csv, .jsonl or .json file as a dict with stripped string values. A record that
+    cannot be used, such as a malformed JSON line or an array element that is not an object, is yielded as
+    the ValueError describing it. Raises ValueError, after the records before it, if the rest of the file
+    cannot be read.
+    """
+    path = Path(filepath)
+    if path.suffix.lower() not in SUFFIXES:
+        raise ValueError(f"Unsupported import file: {path.name}")
+    return _records(path)
+
+
+def _records(path: Path) -> Iterator[dict | ValueError]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            records = csv.DictReader(f)
+        elif path.suffix.lower() == ".jsonl":
+            records = (_json_line(line) for line in f if line.strip())
+        else:
+            records = _json_array(f)
+
+        for record in records:
+            if isinstance(record, ValueError):
+                yield record
+            elif not isinstance(record, dict):
+                yield ValueError(f"Expected an object, got {type(record).__name__}")
+            else:
+                yield {str(key).strip(): "" if value is None else str(value).strip() for key, value in record.items()}
+
+
+def _json_line(line: str):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as err:
+        return ValueError(f"Invalid JSON: {err.msg}")
+
+
+def _json_array(f) -> Iterator:
+    """Yields the elements of the JSON array in f one at a time, reading READ_SIZE characters at a time."""
+    decoder, buffer, eof = json.JSONDecoder(), "", False
+
+    def read() -> None:
+        nonlocal buffer, eof
+        data = f.read(READ_SIZE)
+        eof = not data
+        buffer += data
+
+    def expect(characters: str) -> str:
+        """Drops leading whitespace and returns the next character, which must be one of characters."""
+        nonlocal buffer
+        while not buffer.lstrip() and not eof:
+            read()
+        buffer = buffer.lstrip()
+        if not buffer or buffer[0] not in characters:
+            raise ValueError(f"Expected {' or '.join(characters)} in the JSON array")
+        character, buffer = buffer[0], buffer[1:]
+        return character
+
+    expect("[")
+    while not buffer.lstrip() and not eof:
+        read()
+    if buffer.lstrip().startswith("]"):
+        return
+    while True:
+        buffer = buffer.lstrip()
+        try:
+            element, end = decoder.raw_decode(buffer)
+            complete = end < len(buffer) or eof  # A number at the end of the buffer may continue
+        except json.JSONDecodeError as err:
+            if eof:
+                raise ValueError(f"Invalid JSON: {err.msg}") from None
+            complete = False
+        if not complete:
+            read()
+            continue
+        buffer = buffer[end:]
+        yield element
+        if expect(",]") == "]":
+            return
+
+
+class BulkImporter:
+
+    def __init__(self, db_connection: DatabaseConnection = None, chunk_size: int = CHUNK_SIZE):
+        self.db_connection = db_connection or DatabaseConnection()
+        self.chunk_size = chunk_size
+
+    def import_vendors(self, filepath: str) -> ImportResult:
+        def validate(record: dict) -> tuple:
+            name, email, contact = record.get("Name", ""), record.get("Email", ""), record.get("ContactNumber", "")
+            if not name or re.search(r"[^a-zA-Z0-9_\s\-,.']", name):
+                raise ValueError("Invalid Vendor Name")
+            if not re.match(r"^[\w\-.]+@([\w-]+\.)+[\w-]{2,}$", email):
+                raise ValueError("Invalid Email Format")
+            if not re.match(r"^[\d]{10}$", contact):
+                raise ValueError("Invalid Contact Number (must be 10 digits)")
+            return name, email, contact
+
+        return self._run(filepath, "Vendors", validate, None, lambda cursor, rows: cursor.executemany(
+            "INSERT INTO Suppliers (Name, Email, ContactNumber) VALUES (?, ?, ?)", rows))
+
+    def import_products(self, filepath: str) -> ImportResult:
+        vendors = self._vendor_lookup()
+        seen = set()
+
+        def validate(record: dict) -> tuple:
+            productNo, name = record.get("ProductNo", ""), record.get("ProductName", "")
+            if not productNo or not name:
+                raise ValueError("ProductNo and ProductName are required")
+            if productNo in seen:
+                raise ValueError(f"Duplicate ProductNo {productNo}")
+            price = self._number(record.get("Price"), float, "Price")
+            vendorID = self._vendor(vendors, record.get("Vendor", ""))
+            seen.add(productNo)
+            return productNo, name, record.get("Description", ""), price, vendorID
+
+        def exclude_existing(cursor: sqlite3.Cursor, rows: list) -> dict:
+            cursor.execute(f"SELECT ProductNo FROM Products WHERE ProductNo IN ({', '.join('?' * len(rows))})",
+                           [row[0] for row in rows])
+            return {value[0]: f"ProductNo {value[0]} already exists" for value in cursor.fetchall()}
+
+        return self._run(filepath, "Products", validate, exclude_existing, lambda cursor, rows: cursor.executemany(
+            """INSERT INTO Products (ProductNo, ProductName, Description, Price, PreferredSupplierID)
+            VALUES (?, ?, ?, ?, ?)""", rows))
+
+    def import_purchaseOrders(self, filepath: str) -> ImportResult:
+        vendors = self._vendor_lookup()
+        cursor = self.db_connection.cursor
+        cursor.execute("SELECT ProductNo, ProductID FROM Products")
+        products = dict(cursor.fetchall())
+
+        def validate(record: dict) -> tuple:
+            productID = products.get(record.get("ProductNo", ""))
+            if productID is None:
+                raise ValueError(f"Unknown ProductNo {record.get('ProductNo', '')}")
+            quantity = self._number(record.get("Quantity"), int, "Quantity")
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            batchNo = record.get("BatchNo", "")
+            if not re.match(r"^BATCH-[\d]{6}-[A-Z]+$", batchNo):
+                raise ValueError(f"Invalid BatchNo {batchNo}")
+            return productID, quantity, self._vendor(vendors, record.get("Vendor", "")), batchNo
+
+        def write(cursor: sqlite3.Cursor, rows: list) -> None:
+            batchNumbers = sorted({row[3] for row in rows})
+            cursor.executemany("INSERT INTO Product_Batch (PBatchNumber) VALUES (?) ON CONFLICT (PBatchNumber) DO NOTHING",
+                               [(value,) for value in batchNumbers])
+            cursor.execute(f"""SELECT PBatchNumber, PBatchID FROM Product_Batch
+                WHERE PBatchNumber IN ({', '.join('?' * len(batchNumbers))})""", batchNumbers)
+            batches = dict(cursor.fetchall())
+            for batchNo in batchNumbers:
+                Sequences.claim(cursor, batchNo)
+
+            shipmentNos = Sequences.reserve(cursor, "SHIP", len(rows))
+            shipments = [(shipmentNo, productID, quantity, vendorID, date.today(), batches[batchNo])
+                         for shipmentNo, (productID, quantity, vendorID, batchNo) in zip(shipmentNos, rows)]
+            cursor.executemany("""INSERT INTO Shipments (ShipmentNo, ProductID, Quantity, SupplierID, ShipmentDate, PBatchID)
+                VALUES (?, ?, ?, ?, ?, ?)""", shipments)
+
+        return self._run(filepath, "Purchase Orders", validate, None, write)
+
+    def _run(self, filepath: str, label: str, validate, exclude, write) -> ImportResult:
+        """
+        Validates and writes the file chunk by chunk. `validate` turns a record into a row tuple or raises
+        ValueError, `exclude` optionally returns {row key: message} for rows already in the database,
+        and `write` inserts a chunk of rows with the given cursor.
+        """
+        imported, errors = 0, []
+        for chunk in self._chunks(read_records(filepath), errors):
+            rows = []
+            for number, record in chunk:
+                try:
+                    if isinstance(record, ValueError):
+                        raise record
+                    rows.append((number, validate(record)))
+                except ValueError as err:
+                    errors.append(RowError(number, str(err)))
+
+            if rows and exclude is not None:
+                existing = exclude(self.db_connection.cursor, [row for _, row in rows])
+                errors += [RowError(number, existing[row[0]]) for number, row in rows if row[0] in existing]
+                rows = [(number, row) for number, row in rows if row[0] not in existing]
+
+            if rows:
+                imported += self._write_chunk(rows, write, errors)
+
+        errors.sort()
+        self.db_connection.logger.success("", event="Bulk Import Completed", type="notification",
+                                          placeholder=f"{imported} {label.lower()}")
+        self.db_connection.logger.info(f"Bulk Import | {label}: {imported} imported, {len(errors)} rejected",
+                                       type="report", key="User Activities")
+        return ImportResult(imported, errors)
+
+    def _chunks(self, records: Iterator, errors: list) -> Iterator[list]:
+        """
+        Yields [(row number, record), ...] chunks of chunk_size. If the rest of the file cannot be read,
+        that is added to errors and the records read before it are still yielded.
+        """
+        chunk, number = [], 0
+        try:
+            for number, record in enumerate(records, start=1):
+                chunk.append((number, record))
+                if len(chunk) == self.chunk_size:
+                    yield chunk
+                    chunk = []
+        except (ValueError, csv.Error) as err:
+            errors.append(RowError(number + 1, f"The rest of the file could not be read: {err}"))
+        if chunk:
+            yield chunk
+
+    def _write_chunk(self, rows: list, write, errors: list) -> int:
+        """
+        Writes a chunk in one transaction, nested as a savepoint if the caller already has one open.
+        If the database rejects the chunk, retries it row by row to isolate the bad rows.
+        """
+        cursor = self.db_connection.cursor
+        try:
+            with self.db_connection.transaction():
+                write(cursor, [row for _, row in rows])
+            return len(rows)
+        except sqlite3.Error:
+            pass
+
+        written = 0
+        with self.db_connection.transaction():
+            for number, row in rows:
+                try:
+                    with self.db_connection.transaction():
+                        write(cursor, [row])
+                    written += 1
+                except sqlite3.Error as err:
+                    errors.append(RowError(number, str(err)))
+        return written
+
+    def _vendor_lookup(self) -> dict:
+        """Returns {vendor name or ID: SupplierID}"""
+        cursor = self.db_connection.cursor
+        cursor.execute("SELECT SupplierID, Name FROM Suppliers")
+        lookup = {}
+        for supplierID, name in cursor.fetchall():
+            lookup.setdefault(name, supplierID)
+            lookup[str(supplierID)] = supplierID
+        return lookup
+
+    @staticmethod
+    def _vendor(vendors: dict, vendor: str) -> int:
+        try:
+            return vendors[vendor]
+        except KeyError:
+            raise ValueError(f"Unknown Vendor {vendor}")
+
+    @staticmethod
+    def _number(value: str, kind: type, field: str):
+        try:
+            number = kind(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {field} {value}")
+        if number < 0:
+            raise ValueError(f"{field} cannot be negative")
+        return number
@@ -0,0 +1,95 @@
+# Database/ConnectionPool.py
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Applied once to the single writer connection. WAL lets readers run while a write is in progress,
+# and synchronous=NORMAL is durable in WAL mode while skipping an fsync per commit.
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};",
+    f"PRAGMA mmap_size = {MMAP_SIZE};",
+    "PRAGMA foreign_keys = ON;",
+)
+
+READER_PRAGMAS = (
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};",
+    f"PRAGMA mmap_size = {MMAP_SIZE};",
+    "PRAGMA query_only = ON;",
+)
+
+
+def configure_writer(connection: sqlite3.Connection) -> None:
+    for pragma in WRITER_PRAGMAS:
+        connection.execute(pragma)
+
+
+class ReadConnectionPool:
+    """
+    A small pool of read-only connections to the database file.
+    Connections are opened lazily, up to `size`, and handed to one thread at a time.
+    """
+
+    def __init__(self, db_filepath: str, size: int = 4, timeout: float = BUSY_TIMEOUT_MS / 1000):
+        self.uri = f"{Path(db_filepath).absolute().as_uri()}?mode=ro"
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self.trace_callback = None  # Installed on each connection as it is opened, see Database/Profiler.py
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        for pragma in READER_PRAGMAS:
+            connection.execute(pragma)
+        if self.trace_callback is not None:
+            connection.set_trace_callback(self.trace_callback)
+        return connection
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._open()
+                except sqlite3.Error:
+                    self._opened -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No read connection free after {self.timeout} seconds") from None
+
+    @contextmanager
+    def connection(self):
+        """Borrows a read-only connection for the duration of the with-block."""
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Closes the idle connections. Borrowed ones stay counted and are reused once they are handed back."""
+        closed = 0
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            closed += 1
+        with self._lock:
+            self._opened -= closed
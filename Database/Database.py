@@ -1,13 +1,23 @@
 import re
 import sqlite3
 import os
-from datetime import date, datetime
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
 from loguru import logger
 import json
-from ttkbootstrap.toast import ToastNotification
 
 from configuration import Configuration
 from utils_otp import now, MAX_ATTEMPTS
+from Database.Migrations import migrate, MOVEMENT_LEDGER_VERSION, MOVEMENT_LOG_REIMPORT_VERSION, \
+    USER_ACTIVITIES_VERSION, NOTIFICATION_DISMISSALS_VERSION, USER_PREFERENCES_VERSION
+from Database.ConnectionPool import ReadConnectionPool, configure_writer, BUSY_TIMEOUT_MS
+from Database.LookupCache import LookupCache
+from Database.NotificationDispatcher import NotificationDispatcher, ROLE_RANKS
+from Database.Retention import NotificationRetention, RetentionPolicy, enable_incremental_vacuum
+from Database import Profiler, Sequences
 
 
 
@@ -26,20 +36,161 @@ def singleton(cls):
     return wrapper
 
 
+class DashboardSnapshot(NamedTuple):
+    """Every value shown on the dashboard, computed in one aggregate pass."""
+    sales_orders_created: int = 0
+    sales_orders_pending: int = 0
+    sales_orders_delivered: int = 0
+    stock_sold: int = 0
+    stock_quantity: int = 0
+    shipment_quantity: int = 0
+    remaining_tasks: int = 0
+    low_stock_items: int = 0
+    product_categories: int = 0
+    product_types: int = 0
+    out_of_stock_items: int = 0
+    products_in_stock: int = 0
+    purchase_orders_created: int = 0
+    purchase_orders_in_transit: int = 0
+    purchase_orders_received: int = 0
+    stock_purchased: int = 0
+    top_selling: tuple = ()  # ((ProductNo, ProductName, QuantitySold), ...) for the three best sellers
+
+
+PAGE_SIZE = 200
+
+# Sort keys accepted by the paginated table queries, mapped to NULL-free SQL expressions.
+# Each table's row ID is appended as a tie-breaker so the keyset is always unique. Every key is
+# a column or expression of the table the row ID belongs to, indexed by migration 13, so a page
+# is one index range scan however deep it is. Sales order lines are grouped and carry the row ID
+# of Sales_Inventory, so no Sales column can be served by an index and they only sort by ID.
+INVENTORY_SORT_KEYS = {
+    "id": None,
+    "quantity": "COALESCE(i.StockQuantity, 0)",
+}
+SALES_ORDER_SORT_KEYS = {
+    "id": None,
+}
+PURCHASE_ORDER_SORT_KEYS = {
+    "id": None,
+    "purchase": "s.ShipmentNo",
+    "date": "s.ShipmentDate",
+    "status": "s.Status",
+}
+
+# Text columns matched by the `search` argument of the paginated table queries
+INVENTORY_SEARCH_COLUMNS = ("p.ProductNo", "p.ProductName", "l.LocationName", "b.PBatchNumber")
+SALES_ORDER_SEARCH_COLUMNS = ("s.SaleNo", "p.ProductNo", "p.ProductName", "s.Status")
+PURCHASE_ORDER_SEARCH_COLUMNS = ("s.ShipmentNo", "p.ProductName", "v.Name", "b.PBatchNumber", "s.Status")
+
+
+class DeliveryLine(NamedTuple):
+    """One product batch moved from Output to Customer by a delivery."""
+    product_id: int
+    batch_id: int
+    quantity: int
+    product_name: str
+    batch_number: str
+
+
+class Delivery(NamedTuple):
+    """Result of posting a sales order delivery."""
+    lines: list  # [DeliveryLine, ...]
+    low_stock: list  # [(ProductName, Quantity left), ...] for delivered products at 40 units or fewer
+
+
+class Movement(NamedTuple):
+    """One Inventory_Movements row. from_location is None for stock received from a vendor."""
+    product_id: int
+    batch_id: int
+    from_location: int | None
+    to_location: int
+    quantity: int
+    shipment_id: int = None
+    sale_id: int = None
+
+
+# Shared SELECT for the movement reports: [Worker, Product, Date, Batch No., From, To, Quantity, Product Name]
+MOVEMENT_COLUMNS = """SELECT COALESCE(w.WorkerID || ' - ' || w.Name, m.WorkerID), p.ProductNo || ' - ' || p.ProductName,
+    date(m.Timestamp, 'unixepoch', 'localtime'), pb.PBatchNumber, COALESCE(lf.LocationName, 'Vendor'), lt.LocationName,
+    m.Quantity, p.ProductName
+    FROM Inventory_Movements m LEFT JOIN Products p ON m.ProductID = p.ProductID
+    LEFT JOIN Product_Batch pb ON m.PBatchID = pb.PBatchID
+    LEFT JOIN Workers w ON m.WorkerID = w.WorkerID
+    LEFT JOIN Locations lf ON m.FromLocationID = lf.LocationID
+    LEFT JOIN Locations lt ON m.ToLocationID = lt.LocationID"""
+
+
+class TraceStep(NamedTuple):
+    """One movement of a batch trace. depth counts the moves since the stock entered the warehouse."""
+    depth: int
+    date: str
+    worker: str  # "Employee ID - Employee Name"
+    product: str  # "Product No - Product Name"
+    batch_number: str
+    source: str
+    destination: str
+    quantity: int
+    reference: str | None  # ShipmentNo for receipts, SaleNo for deliveries
+
+
+class _Rollback(Exception):
+    """Raised inside DatabaseConnection.transaction() to roll the unit of work back without an error."""
+
+
+class Page(NamedTuple):
+    """One page of a keyset-paginated table query."""
+    rows: list
+    cursor: tuple = None  # Pass as `after` to fetch the next page; None once the last page is reached
+
+
+def reads(method):
+    """
+    Runs a query method on a pooled read-only connection, so long reports don't hold up other reads.
+    While the writer has an open transaction the query stays on the writer to see its uncommitted rows.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self._local, "cursor", None) is not None or self.connection.in_transaction:
+            return method(self, *args, **kwargs)
+        with self.read_pool.connection() as connection:
+            self._local.cursor = connection.cursor()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._local.cursor.close()
+                self._local.cursor = None
+
+    return wrapper
+
+
+def writes(method):
+    """
+    Runs a write method as one unit of work: committed when it returns, rolled back when it returns False
+    or raises. Called inside db.transaction() it becomes a savepoint of the outer transaction instead,
+    so composite workflows commit once.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = None
+        with self.transaction():
+            result = method(self, *args, **kwargs)
+            if result is False:
+                raise _Rollback
+        return result
+
+    return wrapper
+
+
 @singleton
 class DatabaseConnection:
     # ---- RBAC helpers -------------------------------------------------
     def _role_of(self, employee_id: int) -> str:
         """Return the role name for a worker id, or '' if not found."""
         try:
-            self.cursor.execute("""
-                SELECT r.RoleName
-                FROM Workers w
-                JOIN Roles r ON w.RoleID = r.RoleID
-                WHERE w.WorkerID = ?
-            """, (int(employee_id),))
-            row = self.cursor.fetchone()
-            return row[0] if row else ""
+            return self.lookups.get("worker_roles", int(employee_id), "")
         except Exception:
             return ""
 
@@ -67,42 +218,106 @@ class DatabaseConnection:
         db_filepath = self.config.getDatabaseFile()
         #print(f"DatabaseConnection Constructor-> Database File Path\n{db_filepath}")
 
+        # Single writer connection; query_* methods read through self.read_pool (see @reads)
+        self._local = threading.local()
+        self._tx_depth = 0
         if not os.path.exists(db_filepath):
-            self.connection = sqlite3.connect(db_filepath)
-            self.cursor = self.connection.cursor()
+            self.connection = sqlite3.connect(db_filepath, timeout=BUSY_TIMEOUT_MS / 1000)
+            self._cursor = self.connection.cursor()
             self._create_tables()
             self.connection.commit()
 
         else:
-            self.connection = sqlite3.connect(db_filepath)
-            self.cursor = self.connection.cursor()
+            self.connection = sqlite3.connect(db_filepath, timeout=BUSY_TIMEOUT_MS / 1000)
+            self._cursor = self.connection.cursor()
 
-        self.cursor.execute("PRAGMA foreign_keys = ON;")
+        configure_writer(self.connection)
         self.connection.commit()
-
+        applied = migrate(self.connection)
+        enable_incremental_vacuum(self.connection)  # Once, before the UI or any background job opens the file
+        self.lookups = LookupCache(self.connection)
+        self.read_pool = ReadConnectionPool(db_filepath)
+        self.profiler = Profiler.install(self)
+
+        self.notifications = NotificationDispatcher(db_filepath,
+                                                    f"{self.config.repo_file_path}/Database/Notifications.json")
         logger.add(f"{self.config.getLogFile()}", retention="3 months",
                    filter=self.log_notification_filter,
                    format="{time:YYYY-MM-DD HH:mm:ss} | {extra[event]} Event | Employee ID: {extra[id]} | {level}")
         logger.add(f"{self.config.getLogFile()}", retention="3 months",
                    filter=self.log_report_filter,
                    format="""{time:YYYY-MM-DD HH:mm:ss} | {extra[key]} Report | Employee ID: {extra[id]} | {message} | {level}""")
+        logger.add(self._record_user_activity, filter=self.log_user_activity_filter, format="{message}")
         self.logger = logger.bind(id='1', placeholder="", type="notification")
         self.employeeID = 1
+        for suffix in ("", "-wal", "-shm"):  # Left behind by the log index that earlier versions kept
+            if os.path.exists(f"{self.config.getLogFile()}.idx{suffix}"):
+                os.remove(f"{self.config.getLogFile()}.idx{suffix}")
+        self.retention = NotificationRetention(db_filepath, self.config.getArchiveFile(),
+                                               RetentionPolicy.from_config(self.config.getNotificationRetention()))
+        self.retention.start()
 
-<<<<<<< HEAD
-=======
         # === ensure OTP table exists ===
         self._ensure_otp_table()
 
+        if MOVEMENT_LEDGER_VERSION in applied or MOVEMENT_LOG_REIMPORT_VERSION in applied:
+            self._import_movement_log()
+        if USER_ACTIVITIES_VERSION in applied:
+            self._import_user_activity_log()
+        if NOTIFICATION_DISMISSALS_VERSION in applied:
+            self._import_notification_exclusions()
+        if USER_PREFERENCES_VERSION in applied:
+            self._import_user_preferences()
 
->>>>>>> dfcd0630c26e219a7187e71cd49a3531ad29663d
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.retention.close()
+        self.notifications.close()
+        self.read_pool.close()
         if self.connection:
             self.connection.close()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work spanning several write methods, which join it instead of committing on their own.
+        Commits once when the with-block exits, and rolls everything back if it raises. Nested blocks,
+        or a block opened while a transaction is already in progress, become savepoints.
+        """
+        savepoint = None
+        if self._tx_depth or self.connection.in_transaction:
+            savepoint = f"unit_{self._tx_depth}"
+            self._cursor.execute(f"SAVEPOINT {savepoint}")
+        else:
+            self._cursor.execute("BEGIN IMMEDIATE")
+
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException as err:
+            self._tx_depth -= 1
+            if savepoint is None:
+                self.connection.rollback()
+            else:
+                self._cursor.execute(f"ROLLBACK TO {savepoint}")
+                self._cursor.execute(f"RELEASE {savepoint}")
+            self.lookups.clear()  # Maps may hold rows that were just rolled back
+            if not isinstance(err, _Rollback):
+                raise
+        else:
+            self._tx_depth -= 1
+            if savepoint is None:
+                self.connection.commit()
+            else:
+                self._cursor.execute(f"RELEASE {savepoint}")
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Pooled read-only cursor while a @reads method runs on this thread, otherwise the writer cursor."""
+        return getattr(self._local, "cursor", None) or self._cursor
+
     def log_notification_filter(self, record):
         if record["extra"]["type"] == "notification":
             self.create_notification(record["extra"]["event"], record["extra"]["placeholder"])
@@ -118,6 +333,21 @@ class DatabaseConnection:
         else:
             return False
 
+    def log_user_activity_filter(self, record):
+        return record["extra"].get("type") == "report" and record["extra"].get("key") == "User Activities"
+
+    def _record_user_activity(self, message):
+        """Log sink: stores each "Activity | Remark" User Activities line in the User_Activities table."""
+        record = message.record
+        activity, _, remark = record["message"].partition(" | ")
+        try:
+            with self.transaction():
+                self._cursor.execute("""INSERT INTO User_Activities (Timestamp, WorkerID, Activity, Remark)
+                    VALUES (?, ?, ?, ?)""", (int(record["time"].timestamp()), int(record["extra"]["id"]),
+                                             activity.strip(), remark.strip()))
+        except (sqlite3.Error, ValueError) as err:
+            print(f"Error: {err}")
+
     def log_employee(self, employee_id):
         """
         1. Create a logger, and log the employee ID when login occurs
@@ -130,22 +360,27 @@ class DatabaseConnection:
         self.logger.success(f"Successfully authenticated (Employee ID: {employee_id})", event="Authentication",
                             placeholder="xxx", type="notification")
 
-    def query_product_movement_report(self):
-        pattern = r"(?P<time>\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} \| " \
-                  r"Product Movement Report \| Employee ID: (?P<employee_id>[0-9]+) \| " \
-                  r"(?P<msg>[\w\s\|-]+) \| INFO"
-        results = []
-        for e in logger.parse(f"{self.config.getLogFile()}", pattern=pattern):
-            results.append([e["time"]] + e["msg"].split(' | ') + ["Done"])
-        return results
+    @reads
+    def query_product_movement_report(self, start: datetime = None, end: datetime = None) -> list[list]:
+        """Returns: [Date, Product, Batch No., From, To, Quantity, "Done"], oldest first, within [start, end) if given"""
+        try:
+            self.cursor.execute(f"""{MOVEMENT_COLUMNS}
+                WHERE m.Timestamp >= ? AND m.Timestamp < ? ORDER BY m.Timestamp, m.MovementID""",
+                                (int(start.timestamp()) if start else 0, int(end.timestamp()) if end else 2 ** 62))
+            return [[value[2], value[7], *value[3:7], "Done"] for value in self.cursor.fetchall()]
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
 
+    @reads
     def query_stock_level_report(self) -> list[list[str]]:
         """Returns: ["Product", "Unit Cost", "Total Value", "On Hand", "Free to Use", "Incoming", "Outgoing"]"""
         try:
             self.cursor.execute("""
-            WITH AvailableStock AS (SELECT p.ProductID,
-            COALESCE(SUM(CASE WHEN i.LocationID != 5 THEN i.StockQuantity ELSE 0 END), 0) AS TotalStock
-            FROM Products p LEFT JOIN Inventory i ON p.ProductID = i.ProductID GROUP BY p.ProductID),
+            WITH AvailableStock AS (SELECT p.ProductID, COALESCE(SUM(ss.Quantity), 0) AS TotalStock
+            FROM Products p LEFT JOIN Stock_Summary ss ON p.ProductID = ss.ProductID AND ss.LocationID != 5
+            GROUP BY p.ProductID),
             
             UndeliveredSales AS (SELECT p.ProductID,
             SUM(CASE WHEN ss.Status != 'Delivered' THEN si.QuantitySold ELSE 0 END) AS UndeliveredQuantity
@@ -156,8 +391,7 @@ class DatabaseConnection:
             av.TotalStock - us.UndeliveredQuantity,
             COALESCE(SUM(CASE WHEN s.Status != 'Received' THEN s.Quantity ELSE 0 END), 0), us.UndeliveredQuantity
             
-            FROM Products p LEFT JOIN Inventory i ON p.ProductID = i.ProductID
-            LEFT JOIN Shipments s ON p.ProductID = s.ProductID
+            FROM Products p LEFT JOIN Shipments s ON p.ProductID = s.ProductID
             LEFT JOIN AvailableStock av ON p.ProductID = av.ProductID
             LEFT JOIN UndeliveredSales us ON p.ProductID = us.ProductID
             GROUP BY p.ProductID
@@ -171,6 +405,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_employee_report(self, employee_id: int | str):
         """Returns: [Employee ID - Employee Name, Role Name, Email, Contact Number,
         Total Tasks Assigned, Total Tasks Completed, Total Tasks Overdue]"""
@@ -191,69 +426,118 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
-    def query_traceability_report(self, batch_no: str, product_name: str = None) -> list[str]:
+    @reads
+    def query_traceability_report(self, batch_no: str, product_name: str = None) -> list[list]:
         """Returns: ["Employee ID - Employee Name", "Product No - Product Name", "Date", "Batch No.", "From", "To",
-        Quantity]"""
-        pattern = r"(?P<time>\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} \| " \
-                  r"Product Movement Report \| Employee ID: (?P<employee_id>[0-9]+) \| " \
-                  r"(?P<msg>[\w\s\|-]+) \| INFO"
-        results = []
-        for e in logger.parse(f"{self.config.getLogFile()}", pattern=pattern):
-            data = [e["employee_id"]] + e["msg"].split(' | ')
-            if data[2] == batch_no and data[1] == product_name:
-                data.insert(2, e["time"])
-                results.append(data)
-        try:
-            self.cursor.execute("""SELECT w.WorkerID || ' - ' || w.Name FROM Workers w""")
-            workers = [value[0] for value in self.cursor.fetchall()]
-            self.cursor.execute("""SELECT p.ProductNo || ' - ' || p.ProductName FROM Products p""")
-            products = [value[0] for value in self.cursor.fetchall()]
-            for i, result in enumerate(results):
-                result[0] = [value for value in workers if value.split(' - ')[0] == result[0]][0]
-                result[1] = [value for value in products if value.split(' - ')[1] == result[1]][0]
-            return results
+        Quantity], for every product in the batch unless product_name is given"""
+        try:
+            self.cursor.execute(f"""{MOVEMENT_COLUMNS}
+                WHERE m.PBatchID = (SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?1)
+                AND (?2 IS NULL OR p.ProductName = ?2) ORDER BY m.Timestamp, m.MovementID""", (batch_no, product_name))
+            return [list(value[:7]) for value in self.cursor.fetchall()]
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
+
+    @reads
+    def query_batch_trace(self, batch_no: str, product_name: str = None) -> list[TraceStep]:
+        """
+        Follows a batch from its inbound shipments through every internal move to the sales orders it was
+        delivered on. Each move is linked to the earlier moves of the same product and batch into the location
+        it leaves from; its depth is the fewest such links back to a move with none. The ledger rows are read
+        with one indexed query, and since links only point to earlier moves, one pass in MovementID order
+        gives every depth. Covers every product in the batch unless product_name is given.
+        """
+        try:
+            self.cursor.execute("""
+            SELECT m.ProductID, m.FromLocationID, m.ToLocationID, date(m.Timestamp, 'unixepoch', 'localtime'),
+            COALESCE(w.WorkerID || ' - ' || w.Name, m.WorkerID), p.ProductNo || ' - ' || p.ProductName, pb.PBatchNumber,
+            COALESCE(lf.LocationName, 'Vendor'), lt.LocationName, m.Quantity, COALESCE(sh.ShipmentNo, sa.SaleNo),
+            m.Timestamp
+            FROM Inventory_Movements m
+            LEFT JOIN Products p ON m.ProductID = p.ProductID
+            LEFT JOIN Product_Batch pb ON m.PBatchID = pb.PBatchID
+            LEFT JOIN Workers w ON m.WorkerID = w.WorkerID
+            LEFT JOIN Locations lf ON m.FromLocationID = lf.LocationID
+            LEFT JOIN Locations lt ON m.ToLocationID = lt.LocationID
+            LEFT JOIN Shipments sh ON m.ShipmentID = sh.ShipmentID
+            LEFT JOIN Sales sa ON m.SaleID = sa.SaleID
+            WHERE m.PBatchID = (SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?1)
+            AND (?2 IS NULL OR m.ProductID IN (SELECT ProductID FROM Products WHERE ProductName = ?2))
+            ORDER BY m.MovementID
+            """, (batch_no, product_name))
+
+            steps, depths = [], {}  # (ProductID, LocationID): fewest links of a move into it so far
+            for productID, source, destination, *values, timestamp in self.cursor.fetchall():
+                previous = depths.get((productID, source))
+                depth = 0 if previous is None else previous + 1
+                if depth < depths.get((productID, destination), depth + 1):
+                    depths[productID, destination] = depth
+                steps.append((timestamp, TraceStep(depth, *values)))
+            return [step for _, step in sorted(steps, key=lambda value: value[0])]
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_user_activities_report(self) -> list[list[str]]:
-        """Returns: [Date, Time, User, Activity, Remark]"""
-        pattern = r"(?P<date>\d{4}-\d{2}-\d{2}) (?P<time>\d{2}:\d{2}:\d{2}) \| " \
-                  r"User Activities Report \| Employee ID: (?P<employee_id>[0-9]+) \| " \
-                  r"(?P<msg>[\w\s\|-]+) \| INFO"
-        results = []
-        self.cursor.execute("""SELECT w.WorkerID || ' - ' || w.Name FROM Workers w""")
-        worker_names = [value[0] for value in self.cursor.fetchall()]
-        for e in logger.parse(f"{self.config.getLogFile()}", pattern=pattern):
-            name = [value.split(' - ')[1] for value in worker_names if value.split(' - ')[0] == e["employee_id"]][0]
-            time = datetime.strptime(e["time"], "%H:%M:%S").strftime("%I:%M:%S %p")
-            results.append([e["date"], time, name, *e["msg"].split(' | ')])
-        return results
+        """Returns: [Date, Time, User, Activity, Remark] for every recorded activity, newest first"""
+        return self.query_user_activities(limit=-1)
 
-    def create_notification(self, notification_key: str, placeholder: str = None):
-        """Creates a new notification. Placeholder is inserted if necessary."""
-        with open(f"{self.config.repo_file_path}/Database/Notifications.json", "r") as f:
-            try:
-                data = json.load(f)[notification_key]
-            except KeyError:
-                return
+    @reads
+    def query_user_activities(self, start: date = None, end: date = None, worker_id: int = None, activity: str = None,
+                              limit: int = PAGE_SIZE, offset: int = 0) -> list[list[str]]:
+        """
+        Returns: [Date, Time, User, Activity, Remark], newest first. start and end are inclusive dates;
+        every filter is applied in SQL on an indexed column, and limit=-1 returns all matching rows.
+        """
+        try:
+            self.cursor.execute("""SELECT a.Timestamp, COALESCE(w.Name, a.WorkerID), a.Activity, a.Remark
+                FROM User_Activities a LEFT JOIN Workers w ON a.WorkerID = w.WorkerID
+                WHERE a.Timestamp >= :start AND a.Timestamp < :end AND (:worker IS NULL OR a.WorkerID = :worker)
+                AND (:activity IS NULL OR a.Activity = :activity)
+                ORDER BY a.Timestamp DESC, a.ActivityID DESC LIMIT :limit OFFSET :offset""",
+                                {"start": int(datetime.combine(start, datetime.min.time()).timestamp()) if start else 0,
+                                 "end": int(datetime.combine(end + timedelta(days=1), datetime.min.time()).timestamp())
+                                 if end else 2 ** 62,
+                                 "worker": worker_id, "activity": activity, "limit": limit, "offset": offset})
+            results = []
+            for value in self.cursor.fetchall():
+                timestamp = datetime.fromtimestamp(value[0])
+                results.append([timestamp.strftime("%Y-%m-%d"), timestamp.strftime("%I:%M:%S %p"), *value[1:]])
+            return results
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
 
-        if placeholder is not None:
-            data["Message"] = data["Message"].format(placeholder)
+    @reads
+    def query_user_activity_names(self) -> list[str]:
+        """Returns: every distinct Activity recorded, in alphabetical order"""
+        try:
+            self.cursor.execute("SELECT DISTINCT Activity FROM User_Activities ORDER BY Activity")
+            return [row[0] for row in self.cursor.fetchall()]
 
-        self.add_notification(data["Access"], data["Message"])
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
 
-        dictionary = {"Worker": 3, "Supervisor": 2, "Administrator": 1}
-        if dictionary[self.query_employee(self.employeeID)[1]] <= dictionary[(data["Access"])]:
-            ToastNotification(title=data["Title"], message=data["Message"], duration=500).show_toast()
+    def create_notification(self, notification_key: str, placeholder: str = None):
+        """Queues a new notification for the dispatcher thread. Placeholder is inserted if necessary."""
+        if notification_key not in self.notifications.templates:
+            return
+        self.notifications.submit(notification_key, placeholder, ROLE_RANKS.get(self._role_of(self.employeeID), 4))
 
+    @reads
     def query_accounts_table(self) -> tuple:
         self.cursor.execute("""SELECT w.WorkerID, w.Name, r.RoleName, a.Email, w.ContactNumber
                 FROM Workers w INNER JOIN Roles r ON w.RoleID=r.RoleID
                 INNER JOIN Accounts a ON w.WorkerID=a.WorkerID """)
         return tuple(self.cursor.fetchall())
 
+    @reads
     def query_employee(self, employeeID: int) -> tuple:
         """Returns: [EmployeeName: str, RoleName: str]"""
         self.cursor.execute("""SELECT w.Name, r.RoleName, a.Email 
@@ -263,6 +547,7 @@ class DatabaseConnection:
                             (employeeID,))
         return self.cursor.fetchone()
 
+    @reads
     def query_employee_login(self, email: str) -> int:
         """Returns employee ID"""
         self.cursor.execute("""SELECT w.WorkerID FROM Workers w
@@ -270,6 +555,7 @@ class DatabaseConnection:
 
         return self.cursor.fetchone()[0]
 
+    @reads
     def query_worker(self) -> list[str]:
         """Returns: ['WorkerID - Name', ...] (all roles)"""
         try:
@@ -282,31 +568,75 @@ class DatabaseConnection:
         except Exception:
             return []
 
-    def query_notification(self, role: str) -> list:
+    @reads
+    def query_notification(self, role: str, limit: int = -1, before_id: int = None, after_id: int = 0,
+                           employeeID: int = None) -> list:
+        """
+        Returns: [NotificationID, TimeStamp, Description] visible to role, newest first, leaving out the ones
+        employeeID has dismissed. before_id pages back from the oldest row already shown; after_id returns
+        only rows newer than it.
+        """
         try:
-            self.cursor.execute("""SELECT RoleID From Roles WHERE RoleName = ?""", (role,))
-            roleID = self.cursor.fetchone()[0]
-            notifications = []
+            self.cursor.execute("""SELECT n.NotificationID, n.TimeStamp, n.NotificationDesc FROM Notification n
+                WHERE n.RoleID >= (SELECT RoleID FROM Roles WHERE RoleName = ?)
+                AND n.NotificationID < ? AND n.NotificationID > ?
+                AND NOT EXISTS (SELECT 1 FROM Notification_Dismissals d
+                WHERE d.WorkerID = ? AND d.NotificationID = n.NotificationID)
+                ORDER BY n.NotificationID DESC LIMIT ?""",
+                                (role, before_id if before_id is not None else 2 ** 63 - 1, after_id, employeeID,
+                                 limit))
+            return self.cursor.fetchall()
 
-            for index in range(3, roleID - 1, -1):
-                self.cursor.execute("""SELECT NotificationID, TimeStamp, NotificationDesc FROM Notification 
-                                    WHERE RoleID = ?""", (index,))
-                notifications += self.cursor.fetchall()
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
 
-            notifications = sorted(notifications, key=lambda row: row[1], reverse=True)
-            return notifications
+    @reads
+    def query_notification_cursor(self, employeeID: int) -> int:
+        """Returns the last NotificationID the employee has seen, or 0"""
+        try:
+            self.cursor.execute("SELECT LastSeenID FROM Notification_Cursors WHERE WorkerID = ?", (employeeID,))
+            row = self.cursor.fetchone()
+            return row[0] if row else 0
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
-            return []
+            return 0
 
+    @reads
+    def query_unread_notification_count(self, role: str, employeeID: int) -> int:
+        """Returns the number of notifications visible to role that are newer than the employee's cursor"""
+        try:
+            self.cursor.execute("""SELECT COUNT(*) FROM Notification n
+                WHERE n.RoleID >= (SELECT RoleID FROM Roles WHERE RoleName = ?1)
+                AND n.NotificationID > COALESCE((SELECT LastSeenID FROM Notification_Cursors WHERE WorkerID = ?2), 0)
+                AND NOT EXISTS (SELECT 1 FROM Notification_Dismissals d
+                WHERE d.WorkerID = ?2 AND d.NotificationID = n.NotificationID)""", (role, employeeID))
+            return self.cursor.fetchone()[0]
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return 0
+
+    @writes
+    def mark_notifications_seen(self, employeeID: int, notificationID: int) -> bool:
+        """Moves the employee's cursor forward to notificationID. It never moves back."""
+        try:
+            self.cursor.execute("""INSERT INTO Notification_Cursors (WorkerID, LastSeenID) VALUES (?, ?)
+                ON CONFLICT (WorkerID) DO UPDATE SET LastSeenID = MAX(LastSeenID, excluded.LastSeenID)""",
+                                (employeeID, notificationID))
+            return True
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return False
+
+    @writes
     def add_notification(self, role: str, message: str) -> int:
         try:
-            self.cursor.execute("""SELECT RoleID From Roles WHERE RoleName = ?""", (role,))
-            roleID = self.cursor.fetchone()[0]
+            roleID = self.lookups.get("roles", role)
             self.cursor.execute("""INSERT INTO Notification (RoleID, Timestamp, NotificationDesc)
                 VALUES (?, ?, ?)""", (roleID, datetime.now(), message,))
-            self.connection.commit()
 
             return self.cursor.lastrowid
 
@@ -314,32 +644,81 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return -1
 
+    @reads
+    def query_preferences(self, employeeID: int) -> tuple | None:
+        """Returns: (profile_picture, theme_name), or None if the employee has none stored"""
+        try:
+            self.cursor.execute("SELECT ProfilePicture, ThemeName FROM User_Preferences WHERE WorkerID = ?",
+                                (employeeID,))
+            return self.cursor.fetchone()
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return None
+
+    @writes
+    def write_preferences(self, employeeID: int, profile_picture: str = None, theme_name: str = None) -> bool:
+        """
+        Stores the given preferences and keeps the rest; a new row starts from user_1a and litera.
+        Returns False, writing nothing, if there is no such worker.
+        """
+        try:
+            self.cursor.execute("""INSERT INTO User_Preferences (WorkerID, ProfilePicture, ThemeName)
+                SELECT ?1, COALESCE(?2, 'user_1a'), COALESCE(?3, 'litera')
+                WHERE EXISTS (SELECT 1 FROM Workers WHERE WorkerID = ?1)
+                ON CONFLICT (WorkerID) DO UPDATE SET ProfilePicture = COALESCE(?2, ProfilePicture),
+                ThemeName = COALESCE(?3, ThemeName)""", (employeeID, profile_picture, theme_name))
+            return self.cursor.rowcount > 0
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return False
+
+    @writes
+    def delete_preferences(self, employeeID: int) -> bool:
+        try:
+            self.cursor.execute("DELETE FROM User_Preferences WHERE WorkerID = ?", (employeeID,))
+            return self.cursor.rowcount > 0
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return False
+
+    @writes
+    def dismiss_notification(self, employeeID: int, notificationID: int) -> bool:
+        """Hides a notification from one employee's feed."""
+        try:
+            self.cursor.execute("""INSERT OR IGNORE INTO Notification_Dismissals (WorkerID, NotificationID)
+                VALUES (?, ?)""", (employeeID, notificationID))
+            return True
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return False
+
+    @writes
     def delete_notification(self, notificationID: int) -> bool:
         try:
             self.cursor.execute("DELETE FROM Notification WHERE NotificationID = ?", (notificationID,))
-            self.connection.commit()
             return True
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_productBatch_today(self) -> list:
         try:
-            values = self.cursor.execute("SELECT PBatchNumber FROM Product_Batch")
-            latest = [value[0] for value in values if value[0].split('-')[1] == date.today().strftime("%y%m%d")]
-            #print(latest)
-            self.cursor.execute("SELECT PBatchNumber FROM Product_Batch ORDER BY PBatchID DESC LIMIT 1")
-            try:
-                latest += [self._generateID(self.cursor.fetchone()[0])]
-            except TypeError:
-                latest += [f"BATCH-{date.today().strftime('%y%m%d')}-A"]
-            return latest
+            self.cursor.execute("SELECT PBatchNumber FROM Product_Batch WHERE BatchDate = ? ORDER BY PBatchID",
+                                (date.today().isoformat(),))
+            latest = [value[0] for value in self.cursor.fetchall()]
+            return latest + [Sequences.peek(self.cursor, "BATCH")]
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_all_product_nos(self) -> list:
         """Returns a list of all product batch no."""
         try:
@@ -349,6 +728,7 @@ class DatabaseConnection:
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return []
+    @reads
     def query_productID(self, productName: str) -> str:
         try:
             self.cursor.execute("SELECT ProductID FROM Products WHERE ProductName = ?", (productName,))
@@ -358,6 +738,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return ""
 
+    @reads
     def query_productDescription(self, productID: int) -> str:
         try:
             self.cursor.execute("SELECT Description FROM Products WHERE ProductID = ?", (productID,))
@@ -367,46 +748,53 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return ""
 
-    def add_productBatch(self, batchnumber: str) -> bool:
+    @writes
+    def add_productBatch(self, batchnumber: str, expiryDate: str = None) -> bool:
+        """expiryDate (YYYY-MM-DD) is optional; batches that have one are allocated first-expired-first-out."""
         try:
-            self.cursor.execute("INSERT INTO Product_Batch (PBatchNumber) VALUES (?)", (batchnumber,))
-            self.connection.commit()
-            self.logger.info(f"Create Product Batch No. | {batchnumber}", type="report", key="User Activities")
+            batchID, created = self._productBatch_id(batchnumber)
+            if expiryDate is not None:
+                self.cursor.execute("UPDATE Product_Batch SET ExpiryDate = ? WHERE PBatchID = ?", (expiryDate, batchID))
+            if created:
+                self.logger.info(f"Create Product Batch No. | {batchnumber}", type="report", key="User Activities")
             return True
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
+    def _productBatch_id(self, batchNumber: str) -> tuple[int, bool]:
+        """Returns (PBatchID, created) for a batch number, creating the batch if it does not exist yet."""
+        self.cursor.execute("""INSERT INTO Product_Batch (PBatchNumber) VALUES (?)
+            ON CONFLICT (PBatchNumber) DO NOTHING RETURNING PBatchID""", (batchNumber,))
+        row = self.cursor.fetchone()
+        if row is None:  # The batch already exists
+            self.cursor.execute("SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?", (batchNumber,))
+            return self.cursor.fetchone()[0], False
+
+        Sequences.claim(self.cursor, batchNumber)
+        self.lookups.set("batches", batchNumber, row[0], written="Product_Batch")
+        self.lookups.set("batch_numbers", row[0], batchNumber)
+        return row[0], True
+
+    @reads
     def query_product_table(self) -> list:
         """Returns: [ProductNo, Name, Description, Unit Price, Quantity, Preferred Vendor]"""
         try:
-            self.cursor.execute("""SELECT ProductID, SUM(StockQuantity) 
-            FROM Inventory WHERE LocationID != 5 GROUP BY ProductID ORDER BY ProductID""")
-            quantityDict = {}
-            for row in self.cursor.fetchall():
-                quantityDict[row[0]] = row[1]
             self.cursor.execute("""
-            SELECT p.ProductNo, p.ProductName, p.Description, p.Price, s.Name
+            SELECT p.ProductNo, p.ProductName, p.Description, p.Price,
+            (SELECT COALESCE(SUM(Quantity), 0) FROM Stock_Summary WHERE ProductID = p.ProductID AND LocationID != 5),
+            s.Name
             FROM Products p LEFT JOIN Suppliers s ON p.PreferredSupplierID = s.SupplierID
             ORDER BY p.ProductID
             """)
-            queryList = self.cursor.fetchall()
-            returnList = []
-            for index, row in enumerate(queryList):
-                try:
-                    qty = [quantityDict[index + 1]]
-                except:
-                    qty = [0]
-                tempList = list(row)[:4] + qty + list(row)[4:]
-                returnList += [tempList]
-            return returnList
-
+            return [list(value) for value in self.cursor.fetchall()]
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_product(self) -> list:
         """Returns: [ProductID, ProductName, Description]"""
         try:
@@ -416,40 +804,89 @@ class DatabaseConnection:
         except sqlite3.Error:
             return []
 
+    @reads
+    def query_dashboard_snapshot(self) -> DashboardSnapshot:
+        """Returns every dashboard widget value from a single statement."""
+        try:
+            self.cursor.execute("""
+            WITH SalesCounts AS (SELECT COUNT(*) AS Created,
+            COUNT(CASE WHEN Status = 'Not Delivered' THEN 1 END) AS Pending,
+            COUNT(CASE WHEN Status = 'Delivered' THEN 1 END) AS Delivered FROM Sales),
+
+            DeliveredLines AS (SELECT i.ProductID, SUM(i.QuantitySold) AS Quantity
+            FROM Sales_Inventory i INNER JOIN Sales s ON i.SaleID = s.SaleID
+            WHERE s.Status = 'Delivered' GROUP BY i.ProductID),
+
+            TopSelling AS (SELECT p.ProductNo, p.ProductName, d.Quantity
+            FROM DeliveredLines d INNER JOIN Products p ON d.ProductID = p.ProductID
+            ORDER BY d.Quantity DESC LIMIT 3),
+
+            ProductStock AS (SELECT ProductID, SUM(Quantity) AS Quantity
+            FROM Stock_Summary WHERE LocationID != 5 GROUP BY ProductID),
+
+            ProductCounts AS (SELECT COUNT(*) AS Types,
+            COUNT(DISTINCT substr(ProductNo, 1, instr(ProductNo || '-', '-') - 1)) AS Categories FROM Products),
+
+            ShipmentCounts AS (SELECT COUNT(*) AS Created,
+            COUNT(CASE WHEN Status = 'In Transit' THEN 1 END) AS InTransit,
+            COUNT(CASE WHEN Status = 'Received' THEN 1 END) AS Received,
+            COALESCE(SUM(CASE WHEN Status = 'Received' THEN Quantity END), 0) AS Purchased,
+            COALESCE(SUM(CASE WHEN Status != 'Received' THEN Quantity END), 0) AS Incoming FROM Shipments)
+
+            SELECT sc.Created, sc.Pending, sc.Delivered,
+            (SELECT COALESCE(SUM(Quantity), 0) FROM DeliveredLines),
+            (SELECT COALESCE(SUM(Quantity), 0) FROM ProductStock),
+            sh.Incoming,
+            (SELECT COUNT(*) FROM Tasks WHERE TaskStatus != 'Completed'),
+            (SELECT COUNT(*) FROM ProductStock WHERE Quantity < 25),
+            pc.Categories, pc.Types,
+            (SELECT COUNT(*) FROM ProductStock WHERE Quantity = 0),
+            (SELECT COUNT(*) FROM ProductStock),
+            sh.Created, sh.InTransit, sh.Received, sh.Purchased,
+            (SELECT json_group_array(json_array(ProductNo, ProductName, Quantity)) FROM TopSelling)
+            FROM SalesCounts sc, ProductCounts pc, ShipmentCounts sh
+            """)
+            row = self.cursor.fetchone()
+            return DashboardSnapshot(*row[:-1], top_selling=tuple(tuple(value) for value in json.loads(row[-1])))
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return DashboardSnapshot()
+
+    @reads
     def query_product_dashboard(self) -> list[str]:
         """Returns parameters for the dashboard product details frame widget."""
         try:
             result = []
-            self.cursor.execute("""SELECT ProductID, COALESCE(SUM(StockQuantity), 0) 
-            FROM Inventory WHERE LocationID !=5 GROUP BY ProductID""")
-            result.append(len([value for value in self.cursor.fetchall() if int(value[1]) < 25]))
-            # print(result)
+            self.cursor.execute("""WITH ProductStock AS (SELECT SUM(Quantity) AS Quantity
+            FROM Stock_Summary WHERE LocationID != 5 GROUP BY ProductID)
+            SELECT COUNT(CASE WHEN Quantity < 25 THEN 1 END), COUNT(CASE WHEN Quantity = 0 THEN 1 END)
+            FROM ProductStock""")
+            lowStock, outOfStock = self.cursor.fetchone()
+            result.append(lowStock)
             self.cursor.execute("""SELECT ProductNo FROM Products""")
             temp = []
             for value in self.cursor.fetchall():
                 if value[0].split('-')[0] not in temp:
                     temp.append(value[0].split('-')[0])
             result.append(len(temp))
-            # print(result)
             self.cursor.execute("""SELECT COUNT(ProductID) FROM Products""")
             result.append(self.cursor.fetchone()[0])
-            # print(result)
-            self.cursor.execute("""SELECT ProductID, COALESCE(SUM(StockQuantity), 0) 
-            FROM Inventory WHERE LocationID !=5 GROUP BY ProductID""")
-            result.append(len([value for value in self.cursor.fetchall() if int(value[1]) == 0]))
+            result.append(outOfStock)
             return result
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return ['0', '0', '0', '0']
 
+    @reads
     def query_product_meter(self) -> list:
         """Returns parameters for the dashboard meter widget. [Product Types, Product Types in Inventory]"""
         try:
             results = []
             self.cursor.execute("SELECT COALESCE(COUNT(ProductID), 0) FROM Products")
             results.append(int(self.cursor.fetchone()[0]))
-            self.cursor.execute("""SELECT COALESCE(COUNT(DISTINCT ProductID), 0) FROM Inventory WHERE LocationID!=5
+            self.cursor.execute("""SELECT COALESCE(COUNT(DISTINCT ProductID), 0) FROM Stock_Summary WHERE LocationID!=5
             """)
             try:
                 results.append(int(self.cursor.fetchone()[0]))
@@ -461,6 +898,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return [0, 0]
 
+    @reads
     def query_product_popular(self) -> list:
         """Returns parameters for the dashboard top selling items frame widget."""
         try:  # Add Quantity Sold
@@ -478,6 +916,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @writes
     def add_product(self, product_no: str, product_name: str, description: str, price: float,
                     preferred_supplier_id: int) -> bool:
         try:
@@ -485,12 +924,12 @@ class DatabaseConnection:
                 INSERT INTO Products (ProductNo, ProductName, Description, Price, PreferredSupplierID)
                 VALUES (?, ?, ?, ?, ?)
                 """, (product_no, product_name, description, price, preferred_supplier_id))
-            self.connection.commit()
             self.logger.success("", event="New Product Added", placeholder=product_name, type="notification")
             self.logger.warning("", event="Out of Stock Alert", placeholder=product_name, type="notification")
-            self.cursor.execute("""SELECT Name FROM Suppliers WHERE SupplierID = ?""", (preferred_supplier_id,))
+            self.lookups.invalidate("Products")
             self.logger.info(
-                f"Create New Product | {product_no} - {product_name} (RM{price}) [{self.cursor.fetchone()[0]}]",
+                f"Create New Product | {product_no} - {product_name} (RM{price}) "
+                f"[{self.lookups.get('suppliers', preferred_supplier_id)}]",
                 type="report", key="User Activities")
             return True
 
@@ -498,21 +937,20 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_product(self, product_no: str, product_name: str, description: str, price: float,
                        preferred_supplier_id: int) -> bool:
         try:
             self.cursor.execute("""SELECT ProductName, Description, Price, PreferredSupplierID FROM Products 
             WHERE ProductNo = ?""", (product_no,))
             old_values = [value for value in self.cursor.fetchone()]
-            self.cursor.execute("""SELECT Name FROM Suppliers WHERE SupplierID = ?""", (old_values[3],))
-            old_values[3] = self.cursor.fetchone()[0]
+            old_values[3] = self.lookups.get("suppliers", old_values[3])
             self.cursor.execute("""
             UPDATE Products SET ProductName = ?, Description = ?, Price = ?, PreferredSupplierID = ? WHERE ProductNo = ?
             """, (product_name, description, price, preferred_supplier_id, product_no,))
-            self.connection.commit()
+            self.lookups.invalidate("Products")
 
-            self.cursor.execute("""SELECT Name FROM Suppliers WHERE SupplierID = ?""", (preferred_supplier_id,))
-            new_supplier_name = self.cursor.fetchone()[0]
+            new_supplier_name = self.lookups.get("suppliers", preferred_supplier_id)
             variables = [("Product Name", product_name), ("Product Description", description), ("Price", price),
                          ("Preferred Supplier", new_supplier_name)]
 
@@ -528,12 +966,13 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_product(self, product_no: str) -> bool:
         try:
             self.cursor.execute("SELECT ProductName FROM Products WHERE ProductNo = ?", (product_no,))
             name = self.cursor.fetchone()[0]
             self.cursor.execute("DELETE FROM Products WHERE ProductNo = ?", (product_no,))
-            self.connection.commit()
+            self.lookups.invalidate("Products")
             self.logger.info(
                 f"Delete Product | {product_no} - {name}", type="report", key="User Activities")
             return True
@@ -542,6 +981,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_inventory_table(self) -> list:
         """Returns: [InventoryID: int, ProductNo:str, Name: str, Description: str, Quantity, int, Location: str, BatchID: str]"""
         try:
@@ -558,6 +998,19 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
+    def query_inventory_page(self, after: tuple = None, page_size: int = PAGE_SIZE, sort_key: str = "id",
+                             descending: bool = False, search: str = None) -> Page:
+        """Keyset-paginated query_inventory_table. Sort keys: id, quantity. `search` keeps the rows containing it in a text column"""
+        return self._query_page("""
+            SELECT i.InventoryID, p.ProductNo, p.ProductName, p.Description, i.StockQuantity, l.LocationName, b.PBatchNumber
+            FROM Inventory i LEFT JOIN Products p ON i.ProductID = p.ProductID
+            LEFT JOIN Locations l ON i.LocationID = l.LocationID
+            LEFT JOIN Product_Batch b ON i.PBatchID = b.PBatchID""", "i.InventoryID", INVENTORY_SORT_KEYS,
+                                after, page_size, sort_key, descending, INVENTORY_SEARCH_COLUMNS, search,
+                                where="i.StockQuantity IS NOT 0")
+
+    @reads
     def query_inventory_updatable(self) -> dict:
         """Returns: {'ProductNo - ProductName' : 'Description' }"""
         try:
@@ -573,6 +1026,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return {}
 
+    @reads
     def query_inventory_location(self, productNo: str) -> list:
         """Returns: 'Location ID - Location Name (Quantity Remaining)'"""
         try:
@@ -591,6 +1045,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_inventory_productBatch(self, productNo: str, locationID: int) -> list:
         try:
             self.cursor.execute("""SELECT b.PBatchNumber, i.StockQuantity
@@ -604,6 +1059,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_productBatchNo(self) -> list[str]:
         """Returns a list of all Product Batch Numbers in Inventory [PBatchNo - ProductName]"""
         try:
@@ -619,6 +1075,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_inventory_quantity(self, productNo: str, locationID: int, batchNo: str) -> int:
         try:
             self.cursor.execute(
@@ -633,16 +1090,18 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return 0
 
+    @reads
     def query_stock_quantity(self) -> int:
         """Returns total quantity of stock in inventory"""
         try:
-            self.cursor.execute("""SELECT COALESCE(SUM(StockQuantity), 0) FROM Inventory WHERE LocationID != 5""")
+            self.cursor.execute("""SELECT COALESCE(SUM(Quantity), 0) FROM Stock_Summary WHERE LocationID != 5""")
             return self.cursor.fetchone()[0]
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return 0
 
+    @reads
     def query_shipment_quantity(self) -> int:
         """Returns total quantity of stock in shipments"""
         try:
@@ -653,29 +1112,23 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return 0
 
+    @writes
     def receive_inventory(self, shipmentNo: str, employee_id: int | None = None) -> bool:
                 try:
                     self._require_role(employee_id, ("Worker", "Supervisor", "Administrator"))
 
-                    self.cursor.execute("SELECT ProductID, Quantity, PBatchID FROM Shipments WHERE ShipmentNo = ?",
-                                        (shipmentNo,))
-                    productID, quantity, batchID = self.cursor.fetchone()
+                    self.cursor.execute("""SELECT ProductID, Quantity, PBatchID, ShipmentID FROM Shipments
+                                        WHERE ShipmentNo = ?""", (shipmentNo,))
+                    productID, quantity, batchID, shipmentID = self.cursor.fetchone()
 
                     self.cursor.execute("""
                         INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID)
                         VALUES (?, ?, ?, ?)
                     """, (productID, quantity, 1, batchID,))
                     self.cursor.execute("UPDATE Shipments SET Status = ? WHERE ShipmentNo = ?", ("Received", shipmentNo,))
-                    self.connection.commit()
 
-                    self.cursor.execute("SELECT ProductName FROM Products WHERE ProductID = ?", (productID,))
-                    name = self.cursor.fetchone()[0]
-                    self.cursor.execute("SELECT PBatchNumber FROM Product_Batch WHERE PBatchID = ?", (batchID,))
-                    batchNumber = self.cursor.fetchone()[0]
-
-                    if hasattr(self, 'logger'):
-                        self.logger.info(f"{name} | {batchNumber} | Vendor | Input | {quantity}",
-                                        type="report", key="Product Movement Report")
+                    self._record_movements([Movement(productID, int(batchID), None, 1, quantity, shipment_id=shipmentID)],
+                                           employee_id)
                     self._log_user_activity(employee_id, f"Receive Inventory | Shipment No: {shipmentNo}")
                     return True
 
@@ -686,16 +1139,16 @@ class DatabaseConnection:
                     print(f"Error: {err}")
                     return False
 
+    @writes
     def update_inventory(self, productNo: str, batchNumber: str, srcLocationID: int, desLocationID: int,
                          quantity: int, employee_id: int | None = None) -> bool:
         try:
             self._require_role(employee_id, ("Worker", "Supervisor", "Administrator"))
 
-            self.cursor.execute("SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?", (batchNumber,))
-            batchID = self.cursor.fetchone()[0]
-
-            self.cursor.execute("SELECT ProductID FROM Products WHERE ProductNo = ?", (productNo,))
-            productID = self.cursor.fetchone()[0]
+            batchID = self.lookups.get("batches", batchNumber)
+            productID = self.lookups.get("products", productNo)
+            if batchID is None or productID is None:
+                raise ValueError(f"Unknown product {productNo} or batch {batchNumber}")
 
             srcQuantity = self.cursor.execute("""
                 SELECT StockQuantity FROM Inventory WHERE ProductID = ? AND PBatchID = ? AND LocationID = ?
@@ -725,20 +1178,15 @@ class DatabaseConnection:
                     VALUES (?, ?, ?, ?)
                 """, (productID, quantity, desLocationID, batchID,))
 
-            self.connection.commit()
-
-            self.cursor.execute("""SELECT ProductName FROM Products WHERE ProductNo = ?""", (productNo,))
-            name = self.cursor.fetchone()[0]
-            self.cursor.execute("""SELECT LocationName FROM Locations WHERE LocationID = ? OR LocationID = ?""",
-                                (srcLocationID, desLocationID,))
-            locations = self.cursor.fetchall()
 
-            if hasattr(self, 'logger'):
-                self.logger.info(f"{name} | {batchNumber} | {locations[0][0]} | {locations[1][0]} | {quantity}",
-                                 type="report", key="Product Movement Report")
+            name = self.lookups.get("product_names", productNo)
+            source = self.lookups.get("locations", int(srcLocationID))
+            destination = self.lookups.get("locations", int(desLocationID))
+            self._record_movements([Movement(productID, batchID, int(srcLocationID), int(desLocationID), int(quantity))],
+                                   employee_id)
             self._log_user_activity(
                 employee_id,
-                f"Update Inventory | Moved {quantity} units of {name} from {locations[0][0]} to {locations[1][0]}"
+                f"Update Inventory | Moved {quantity} units of {name} from {source} to {destination}"
             )
             return True
 
@@ -749,6 +1197,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_inventory(self, inventoryID: int, employee_id: int | None = None) -> bool:
         try:
             self._require_role(employee_id, ("Supervisor", "Administrator"))
@@ -761,7 +1210,6 @@ class DatabaseConnection:
             old_values = self.cursor.fetchone()
 
             self.cursor.execute("DELETE FROM Inventory WHERE InventoryID = ?", (inventoryID,))
-            self.connection.commit()
 
             if old_values:
                 self._log_user_activity(
@@ -777,11 +1225,13 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_vendor_all(self) -> list:
         """Returns: [(VendorNo: str, VendorName: str, Email: str, ContactNumber: str),]"""
         self.cursor.execute("SELECT * FROM Suppliers")
         return self.cursor.fetchall()
 
+    @reads
     def query_preferred_vendor(self, productID) -> str:
         try:
             self.cursor.execute("""SELECT s.SupplierID, s.Name FROM Suppliers s INNER JOIN Products p 
@@ -794,16 +1244,18 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return ""
 
+    @reads
     def query_vendor(self) -> list:
         """Returns: [(VendorID: int, VendorName: str),]"""
         self.cursor.execute("SELECT SupplierID, Name FROM Suppliers")
         return self.cursor.fetchall()
 
+    @writes
     def add_vendor(self, name: str, email: str, contact_number: str) -> bool:
         try:
             self.cursor.execute("INSERT INTO Suppliers (Name, ContactNumber, Email) VALUES (?, ?, ?)",
                                 (name, contact_number, email))
-            self.connection.commit()
+            self.lookups.invalidate("Suppliers")
             self.logger.success("", event="New Vendor Created", type="notification")
             self.logger.info(f"Create Vendor | {name}", type="report", key="User Activities")
             return True
@@ -812,6 +1264,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_vendor(self, supplier_id: int, name: str, contact_number: str, email: str) -> bool:
         try:
             self.cursor.execute("""SELECT Name, ContactNumber, Email FROM Suppliers WHERE SupplierID = ?""",
@@ -820,7 +1273,7 @@ class DatabaseConnection:
 
             self.cursor.execute("UPDATE Suppliers SET Name = ?, ContactNumber = ?, Email = ? WHERE SupplierID = ?",
                                 (name, contact_number, email, supplier_id))
-            self.connection.commit()
+            self.lookups.invalidate("Suppliers")
 
             for i, e in enumerate((("Name", name), ("Contact Number", contact_number), ("Email", email))):
                 if str(old_values[i]) != e[1]:
@@ -832,12 +1285,13 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_vendor(self, supplier_id: int) -> bool:
         try:
             self.cursor.execute("SELECT Name FROM Suppliers WHERE SupplierID = ?", (supplier_id,))
             name = self.cursor.fetchone()[0]
             self.cursor.execute("DELETE FROM Suppliers WHERE SupplierID = ?", (supplier_id,))
-            self.connection.commit()
+            self.lookups.invalidate("Suppliers")
 
             self.logger.info(f"Create Vendor | {name}", type="report", key="User Activities")
             return True
@@ -846,6 +1300,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_task_table(self) -> list:
         self.cursor.execute("""
             SELECT TaskID, COALESCE(Task_Batch.TBatchNo, 'Not Assigned'), COALESCE(Workers.Name, 'Not Assigned'), 
@@ -855,6 +1310,7 @@ class DatabaseConnection:
         """)
         return self.cursor.fetchall()
 
+    @reads
     def query_task_updatable(self) -> list[str]:
         """Returns: [Task ID - Task Description, Assigned Employee, Progress, ETA] where Status is not 'Completed'"""
         self.cursor.execute('''SELECT TaskID || ' - ' || TaskDesc, COALESCE(Task_Batch.TBatchNo, 'Not Assigned'), 
@@ -864,6 +1320,7 @@ class DatabaseConnection:
                 WHERE TaskStatus != "Completed"''')
         return self.cursor.fetchall()
 
+    @writes
     def add_task(self, description: str, eta: str, worker_id: int, batch_id: int = None) -> bool:
         try:
             if re.match(r'\d+', str(worker_id)) is not None:
@@ -875,7 +1332,6 @@ class DatabaseConnection:
                 self.cursor.execute("""
                     INSERT INTO Tasks (TaskDesc, ETA, TaskStatus, TBatchID)
                     VALUES (?, ?, 'Not Started', ?)""", (description, eta, batch_id))
-            self.connection.commit()
             self.logger.info(f"Create Task | {description}", type="report", key="User Activities")
             return True
 
@@ -883,6 +1339,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_task(self, task_id: int, description: str, worker_id: int, progress: str, eta: str,
                     batch_no: str = None) -> bool:
         try:
@@ -919,19 +1376,18 @@ class DatabaseConnection:
                     if old_values[i] != e[1]:
                         self.logger.info(f"Update Task | {e[0]}: {old_values[i]} -> {e[1]}", type="report",
                                          key="User Activities")
-            self.connection.commit()
             return True
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_task(self, task_id: int) -> bool:
         try:
             self.cursor.execute("SELECT TaskDesc FROM Tasks WHERE TaskID = ?", (task_id,))
             desc = self.cursor.fetchone()[0]
             self.cursor.execute("DELETE FROM Tasks WHERE TaskID = ?", (task_id,))
-            self.connection.commit()
             self.logger.info(f"Delete Task | {desc}", type="report", key="User Activities")
             return True
 
@@ -939,6 +1395,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_taskBatch(self) -> list[str]:
         """Returns: [Task Batch - Task Description]"""
         try:
@@ -947,6 +1404,7 @@ class DatabaseConnection:
         except sqlite3.Error:
             return []
 
+    @writes
     def add_taskBatch(self, batchDesc: str, batchNo: str, taskIDs: list) -> bool:
         try:
             self.cursor.execute("INSERT INTO Task_Batch (TBatchNo, TBatchDesc) VALUES (?, ?)", (batchNo, batchDesc,))
@@ -958,12 +1416,12 @@ class DatabaseConnection:
                     SET TBatchID = ?
                     WHERE TaskID = ?
                 """, (batchID, i,))
-            self.connection.commit()
             return True
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_taskBatch(self, batchNo: str, batchDesc: str = "", taskIDs: list = [], employeeID: int = 0) -> bool:
         try:
             self.cursor.execute("""SELECT TBatchID FROM Task_Batch WHERE TBatchNo = ?""", (batchNo,))
@@ -979,7 +1437,6 @@ class DatabaseConnection:
             if employeeID != 0:
                 self.cursor.execute("UPDATE Tasks SET WorkerID = ? WHERE TBatchID =?", (employeeID, batchID))
 
-            self.connection.commit()
             return True
 
         except TypeError:
@@ -990,17 +1447,18 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_taskBatch(self, batchID: int) -> bool:
         try:
             self.cursor.execute("""UPDATE Tasks SET TBatchID = NULL WHERE TBatchID = ?""", (batchID,))
             self.cursor.execute("""DELETE FROM Task_Batch WHERE TBatchID = ?""", (batchID,))
-            self.connection.commit()
             return True
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_purchaseOrder_dashboard(self) -> list[int]:
         """Returns parameters for the dashboard purchase activity frame widget."""
         try:
@@ -1019,6 +1477,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return [0, 0, 0, 0]
 
+    @reads
     def query_purchaseOrder_receivables(self) -> list:
         """Returns: [ShipmentNo, ProductNo, ProductName, ProductDesc, Quantity, VendorId - VendorName]"""
         try:
@@ -1036,6 +1495,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_purchaseOrder(self):
         """Returns: [Purchase No: str, Product Name: str, Quantity: int, Batch Number: str, Vendor Name: str, Date: str, Status: str]"""
         try:
@@ -1052,25 +1512,27 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
+    def query_purchaseOrder_page(self, after: tuple = None, page_size: int = PAGE_SIZE, sort_key: str = "id",
+                                 descending: bool = False, search: str = None) -> Page:
+        """Keyset-paginated query_purchaseOrder. Sort keys: id, purchase, date, status. `search` keeps the rows containing it in a text column"""
+        return self._query_page("""
+            SELECT s.ShipmentNo, p.ProductName, s.Quantity, b.PBatchNumber, v.Name, s.ShipmentDate, s.Status
+            FROM Shipments s
+            LEFT JOIN Products p ON s.ProductID = p.ProductID
+            LEFT JOIN Suppliers v ON s.SupplierID = v.SupplierID
+            LEFT JOIN Product_Batch b ON s.PBatchID = b.PBatchID""", "s.ShipmentID", PURCHASE_ORDER_SORT_KEYS,
+                                after, page_size, sort_key, descending, PURCHASE_ORDER_SEARCH_COLUMNS, search)
+
+    @writes
     def add_purchaseOrder(self, productID: int, quantity: int, vendorID: int, batchNo: str) -> bool:
         try:
-            try:
-                self.cursor.execute("SELECT ShipmentNo FROM Shipments ORDER BY ShipmentID Desc LIMIT 1")
-                shipmentID = self._generateID(self.cursor.fetchone()[0])
-            except:
-                shipmentID = self._generateID("SHIP-000000-A")
             if re.match("^BATCH-[\d]{6}-[A-Z]+$", batchNo):
-                self.cursor.execute("SELECT PBatchNumber FROM Product_Batch")
-                if batchNo not in [value[0] for value in self.cursor.fetchall()]:
-                    self.cursor.execute("INSERT INTO Product_Batch (PBatchNumber) VALUES (?)", (batchNo,))
-                    batchID = self.cursor.lastrowid
-                else:
-                    self.cursor.execute("SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?", (batchNo,))
-                    batchID = self.cursor.fetchone()[0]
+                shipmentID = Sequences.reserve(self.cursor, "SHIP")[0]
+                batchID = self._productBatch_id(batchNo)[0]
                 self.cursor.execute("""INSERT INTO Shipments (ShipmentNo, ProductID, Quantity, SupplierID, ShipmentDate, PBatchID)
                                 VALUES (?, ?, ?, ?, ?, ?)""",
                                     (shipmentID, productID, quantity, vendorID, date.today(), batchID,))
-                self.connection.commit()
 
                 self.logger.success("", event="New Purchase Order Created", type="notification")
                 self.logger.info(f"Add Purchase Order | {shipmentID}", type="report", key="User Activities")
@@ -1082,6 +1544,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_purchaseOrder(self, shipmentNo: str, productID: int, quantity: int, vendorID: int, Status: str) -> bool:
         try:
             self.cursor.execute("""SELECT p.ProductName, s.Quantity, v.Name, s.Status
@@ -1094,12 +1557,9 @@ class DatabaseConnection:
                 UPDATE Shipments SET ProductID = ?, Quantity = ?, SupplierID = ?, Status = ?
                 WHERE ShipmentNo = ?
             """, (productID, quantity, vendorID, Status, shipmentNo))
-            self.connection.commit()
 
-            self.cursor.execute("""SELECT ProductName FROM Products WHERE ProductID = ?""", (productID,))
-            name = self.cursor.fetchone()[0]
-            self.cursor.execute("""SELECT Name FROM Suppliers WHERE SupplierID = ?""", (vendorID,))
-            vendor_name = self.cursor.fetchone()[0]
+            name = self.lookups.get("product_names", self.lookups.get("product_nos", productID))
+            vendor_name = self.lookups.get("suppliers", vendorID)
 
             for i, e in enumerate(
                     (("Product Name", name), ("Quantity", quantity), ("Vendor", vendor_name), ("Status", Status))):
@@ -1112,6 +1572,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def delete_purchaseOrder(self, purchaseOrderNo: str) -> bool:
         try:
             self.cursor.execute("DELETE FROM Shipments WHERE ShipmentNo = ?", (purchaseOrderNo,))
@@ -1122,6 +1583,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @reads
     def query_stock_sold(self) -> int:
         """Returns quantity of stock sold"""
         try:
@@ -1134,6 +1596,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return 0
 
+    @reads
     def query_SalesOrder(self) -> list:
         """Returns all SaleNo IDs"""
         try:
@@ -1144,6 +1607,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_newSalesOrder(self) -> list:
         """Returns all unvalidated SaleNo IDs"""
         try:
@@ -1154,6 +1618,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_updatableSalesOrder(self) -> list:
         """Returns all undelivered SaleNo IDs"""
         try:
@@ -1164,6 +1629,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_salesOrder_delivered(self) -> list:
         """Returns all delivered SaleNo IDs"""
         try:
@@ -1174,6 +1640,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_salesOrder_validatable(self) -> list[str]:
         """Returns: [SaleNo, Date, Total Price, Status]"""
         try:
@@ -1189,6 +1656,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_salesOrder_table(self) -> list:
         """Returns nested list: ["SaleNo", "ProductSold", "Quantity", "BatchNo", "Date", "Status"]"""
         try:
@@ -1206,6 +1674,20 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
+    def query_salesOrder_page(self, after: tuple = None, page_size: int = PAGE_SIZE, sort_key: str = "id",
+                              descending: bool = False, search: str = None) -> Page:
+        """Keyset-paginated query_salesOrder_table. Sort keys: id. `search` keeps the rows containing it in a text column"""
+        return self._query_page("""
+            SELECT s.SaleNo, p.ProductNo || ' ' || p.ProductName, i.QuantitySold || ' (' || COALESCE(SUM(b.QuantityTaken), 0) || ' Assigned)', COALESCE(GROUP_CONCAT(pb.PBatchNumber), 'Not Assigned'), s.Date, s.Status
+            FROM Sales s INNER JOIN Sales_Inventory i ON s.SaleID = i.SaleID
+            LEFT JOIN Products p ON i.ProductID = p.ProductID
+            LEFT JOIN Sales_Inventory_Batch b ON i.SalesInventoryID = b.SalesInventoryID
+            LEFT JOIN Product_Batch pb ON b.PBatchID = pb.PBatchID""", "i.SalesInventoryID", SALES_ORDER_SORT_KEYS,
+                                after, page_size, sort_key, descending, SALES_ORDER_SEARCH_COLUMNS, search,
+                                group_by="i.SalesInventoryID")
+
+    @reads
     def query_saleDetails_table(self, saleNo: str) -> list[list[str]]:
         """Returns: [Product Name, Batch No, Unit Price, Quantity, Total Price]"""
         try:
@@ -1227,6 +1709,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_salesorder_product(self, saleNo: str) -> list[str]:
         """
         Returns products to be sold and quantity to be delivered for a Sale No.
@@ -1248,53 +1731,37 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return 0
 
+    @reads
     def query_salesOrder_productBatch(self, productNo: str) -> list[str]:
         """Returns [Product Batch No.] ([Units Left]) that has not been assigned in the warehouse."""
         try:
-            self.cursor.execute("""SELECT pb.PBatchNumber, SUM(i.StockQuantity)
-                FROM Inventory i INNER JOIN Products p ON i.ProductID = p.ProductID
-                INNER JOIN Product_Batch pb ON i.PBatchID = pb.PBatchID
-                WHERE p.ProductNo = ? AND i.LocationID != 5
-                GROUP BY pb.PBatchNumber
+            self.cursor.execute("""SELECT pb.PBatchNumber, a.Available
+                FROM Batch_Availability a INNER JOIN Product_Batch pb ON a.PBatchID = pb.PBatchID
+                WHERE a.ProductNo = ? ORDER BY pb.PBatchNumber
             """, (productNo,))
-            results = [list(value) for value in self.cursor.fetchall()]
-            for value in results:
-                self.cursor.execute("""SELECT SUM(i.QuantityTaken) 
-                    FROM Sales_Inventory_Batch i INNER JOIN Sales_Inventory s ON i.SalesInventoryID = s.SalesInventoryID
-                    LEFT JOIN Product_Batch b ON i.PBatchID = b.PBatchID
-                    WHERE PBatchNumber = ? GROUP BY s.ProductID""", (value[0],))
-                try:
-                    qty = self.cursor.fetchone()[0]
-                    value[1] = int(value[1]) - int(qty)
-                except TypeError as Err:
-                    print(f"Type Error aaaAaaaAaaa\n{Err}")
-            results = [f"{value[0]} ({value[1]} units left in warehouse)" for value in results]
-            return results
+            return [f"{value[0]} ({value[1]} units left in warehouse)" for value in self.cursor.fetchall()]
 
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return []
 
+    @reads
     def query_salesOrder_quantity(self, productID: int) -> int:
         """Returns products available to be sold in the warehouse, and products at output."""
         try:
             self.cursor.execute(
-                """SELECT SUM(StockQuantity) FROM Inventory WHERE ProductID = ? AND LocationID != 5 GROUP BY ProductID """,
+                """SELECT SUM(Quantity) FROM Stock_Summary WHERE ProductID = ? AND LocationID != 5 GROUP BY ProductID""",
                 (productID,))
             return self.cursor.fetchone()[0]
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return 0
 
+    @writes
     def create_salesOrder(self) -> bool:
         try:
-            try:
-                self.cursor.execute("SELECT SaleNo FROM Sales ORDER BY SaleID Desc LIMIT 1")
-                saleNo = self._generateID(self.cursor.fetchone()[0])
-            except:
-                saleNo = self._generateID("SALE-000000-A")
+            saleNo = Sequences.reserve(self.cursor, "SALE")[0]
             self.cursor.execute("INSERT INTO Sales (SaleNo, Date) VALUES (?, ?)", (saleNo, date.today(),))
-            self.connection.commit()
             self.logger.success("", event="New Sales Order Created", type="notification")
             self.logger.info(f"Create Sales Order | {saleNo}", type="report", key="User Activities")
             return True
@@ -1303,6 +1770,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def add_salesOrder(self, saleNo: str, productID: str, quantity: int) -> bool:
         """
         1. Check if there's a salesInventory
@@ -1321,7 +1789,6 @@ class DatabaseConnection:
                 self.cursor.execute(
                     """UPDATE Sales_Inventory SET QuantitySold = QuantitySold + ? WHERE SaleID = ? AND ProductID = ?""",
                     (quantity, saleID, productID,))
-            self.connection.commit()
 
             self.cursor.execute("""SELECT ProductName FROM Products WHERE ProductID = ?""", (productID,))
             name = self.cursor.fetchone()[0]
@@ -1333,6 +1800,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_salesOrder(self, saleNo: str, productNo: str, batchNo: str, quantity: int) -> bool:
         try:
             self.cursor.execute("""SELECT i.SalesInventoryID 
@@ -1342,22 +1810,20 @@ class DatabaseConnection:
             """, (saleNo, productNo))
             salesInventoryID = self.cursor.fetchone()[0]
 
-            self.cursor.execute("""SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?""", (batchNo,))
-            batchID = self.cursor.fetchone()[0]
-
-            self.cursor.execute("""SELECT ProductName FROM Products WHERE ProductNo = ?""", (productNo,))
-            name = self.cursor.fetchone()[0]
+            batchID = self.lookups.get("batches", batchNo)
+            if batchID is None:
+                raise sqlite3.Error(f"Unknown batch {batchNo}")
+            name = self.lookups.get("product_names", productNo)
 
             self.cursor.execute("""SELECT SalesInventoryBatchID FROM Sales_Inventory_Batch
                 WHERE SalesInventoryID = ? AND PBatchID = ?""", (salesInventoryID, batchID))
             try:
-                _ = self.cursor.fetchone()[0]
-                self.cursor.execute("""UPDATE Sales_Inventory_Batch SET QuantityTaken = (QuantityTaken+?)""",
-                                    (quantity,))
+                salesInventoryBatchID = self.cursor.fetchone()[0]
+                self.cursor.execute("""UPDATE Sales_Inventory_Batch SET QuantityTaken = (QuantityTaken+?)
+                    WHERE SalesInventoryBatchID = ?""", (quantity, salesInventoryBatchID,))
             except:
                 self.cursor.execute("""INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken)
                     VALUES (?, ?, ?)""", (salesInventoryID, batchID, quantity,))
-            self.connection.commit()
             self.logger.info(f"Update Sales Order | Assigned {quantity} {name} from {batchNo} to {saleNo}",
                              type="report", key="User Activities")
             return True
@@ -1366,6 +1832,7 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def validate_salesOrder(self, saleDetails: str) -> bool:
         try:
             if saleDetails.split('(')[1] == "Not Paid)":
@@ -1380,7 +1847,6 @@ class DatabaseConnection:
                         return False
             self.cursor.execute("UPDATE Sales SET STATUS = ? WHERE SaleNo = ?",
                                 (newStatus, saleDetails.split(' (')[0],))
-            self.connection.commit()
             self.logger.info(f"Validate Sales Order | Validated Payment for {saleDetails.split(' (')[0]}",
                              type="report", key="User Activities")
             return True
@@ -1389,103 +1855,106 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def update_salesOrder_delivery(self, saleNo: str) -> bool:
-        if not self.validate_salesOrder_delivery(saleNo):
+        delivery = self.post_salesOrder_delivery(saleNo)
+        if delivery is None:
             return False
-        try:
-            self.cursor.execute("""SELECT i.ProductID, b.QuantityTaken, b.PBatchID
-                FROM Sales_Inventory_Batch b INNER JOIN Sales_Inventory i ON b.SalesInventoryID = i.SalesInventoryID
-                INNER JOIN Sales s ON i.SaleID = s.SaleID
-                WHERE SaleNo = ?
-            """, (saleNo,))
-            results = self.cursor.fetchall()
 
-            for result in results:
-                self.cursor.execute("""SELECT StockQuantity FROM Inventory
-                    WHERE ProductID = ? AND LocationID = 4 AND PBatchID = ? """, (result[0], result[2],))
-                qty = self.cursor.fetchone()[0] - result[1]
-                self.cursor.execute("""UPDATE Inventory SET StockQuantity = ?
-                    WHERE ProductID = ? AND LocationID = 4 AND PBatchID = ?
-                """, (qty, result[0], result[2],))
+        for prod_name, qty_left in delivery.low_stock:
+            if qty_left == 0:
+                self.logger.success("", event="Out of Stock Alert", placeholder=prod_name, type="notification")
+            elif qty_left <= 20:
+                self.logger.success("", event="Stock at Critical Level", placeholder=prod_name, type="notification")
+            else:
+                self.logger.success("", event="Low Stock Alert", placeholder=prod_name, type="notification")
 
-                self.cursor.execute(
-                    """SELECT InventoryID FROM Inventory WHERE ProductID = ? AND LocationID = 5 AND PBatchID = ?""",
-                    (result[0], result[2]))
-                if self.cursor.fetchone() is None:
-                    self.cursor.execute("""INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID)
-                        VALUES (?, ?, 5, ?) """, (result[0], result[1], result[2]))
-                else:
-                    self.cursor.execute("""UPDATE Inventory SET StockQuantity = StockQuantity + ?
-                        WHERE ProductID = ? AND LocationID = 5 AND PBatchID = ?
-                    """, (result[1], result[0], result[2],))
-
-            self.cursor.execute("""UPDATE Sales SET Status = 'Delivered' WHERE SaleNo = ?""", (saleNo,))
-            self.connection.commit()
+        self.logger.info(f"Validate Sales Order | Validated Delivery for {saleNo}",
+                         type="report", key="User Activities")
+        return True
 
-            for result in results:
-                self.cursor.execute("""SELECT COALESCE(SUM(i.StockQuantity), 0), p.ProductName
-                    FROM Inventory i INNER JOIN Products p ON i.ProductID = p.ProductID
-                    WHERE i.LocationID!=5 AND i.ProductID = ?""", (result[0],))
-                product = self.cursor.fetchone()
-                qty_left, prod_name = int(product[0]), product[1]
-                if qty_left == 0:
-                    self.logger.success("", event="Out of Stock Alert", placeholder=prod_name, type="notification")
-                elif qty_left <= 20:
-                    self.logger.success("", event="Stock at Critical Level", placeholder=prod_name, type="notification")
-                elif qty_left <= 40:
-                    self.logger.success("", event="Low Stock Alert", placeholder=prod_name, type="notification")
-
-                self.cursor.execute("SELECT PBatchNumber FROM Product_Batch WHERE PBatchID = ?", (result[2],))
-                batchNumber = self.cursor.fetchone()[0]
-                self.logger.info(f"{product[1]} | {batchNumber} | Output | Customer | {result[1]}",
-                                 type="report", key="Product Movement Report")
-
-            self.logger.info(f"Validate Sales Order | Validated Delivery for {saleNo}",
-                             type="report", key="User Activities")
-            return True
+    def post_salesOrder_delivery(self, saleNo: str) -> Delivery:
+        """
+        Validates a sales order and moves every assigned batch line from Output to Customer in one transaction.
+        Returns the moved lines and the products left at 40 units or fewer, or None if the order can't be delivered.
+        """
+        try:
+            with self.transaction():
+                if not self._salesOrder_deliverable(saleNo):
+                    raise _Rollback
+
+                self.cursor.execute("""SELECT si.ProductID, pb.PBatchID, SUM(b.QuantityTaken), p.ProductName, pb.PBatchNumber
+                    FROM Sales_Inventory_Batch b INNER JOIN Sales_Inventory si ON b.SalesInventoryID = si.SalesInventoryID
+                    INNER JOIN Sales s ON si.SaleID = s.SaleID
+                    INNER JOIN Products p ON si.ProductID = p.ProductID
+                    INNER JOIN Product_Batch pb ON b.PBatchID = pb.PBatchID
+                    WHERE s.SaleNo = ? GROUP BY si.ProductID, pb.PBatchID
+                """, (saleNo,))
+                lines = [DeliveryLine(*value) for value in self.cursor.fetchall()]
+                moves = [(line.quantity, line.product_id, line.batch_id) for line in lines]
+
+                self.cursor.executemany("""UPDATE Inventory SET StockQuantity = StockQuantity - ?
+                    WHERE ProductID = ? AND LocationID = 4 AND PBatchID = ?""", moves)
+                self.cursor.executemany("""UPDATE Inventory SET StockQuantity = StockQuantity + ?
+                    WHERE ProductID = ? AND LocationID = 5 AND PBatchID = ?""", moves)
+                self.cursor.executemany("""INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID)
+                    SELECT ?2, ?1, 5, ?3 WHERE NOT EXISTS
+                    (SELECT 1 FROM Inventory WHERE ProductID = ?2 AND LocationID = 5 AND PBatchID = ?3)""", moves)
+                self.cursor.execute("""UPDATE Sales SET Status = 'Delivered' WHERE SaleNo = ? RETURNING SaleID""",
+                                    (saleNo,))
+                saleID = self.cursor.fetchone()[0]
+                self._record_movements([Movement(line.product_id, line.batch_id, 4, 5, line.quantity, sale_id=saleID)
+                                        for line in lines])
+
+                productIDs = sorted({line.product_id for line in lines})
+                self.cursor.execute(f"""SELECT p.ProductName, COALESCE(SUM(ss.Quantity), 0) AS Quantity
+                    FROM Products p LEFT JOIN Stock_Summary ss ON p.ProductID = ss.ProductID AND ss.LocationID != 5
+                    WHERE p.ProductID IN ({', '.join('?' * len(productIDs))})
+                    GROUP BY p.ProductID HAVING Quantity <= 40 ORDER BY p.ProductID""", productIDs)
+                low_stock = self.cursor.fetchall()
+
+                return Delivery(lines, low_stock)
 
         except sqlite3.Error as err:
             print(f"Delivery Update Error: {err}")
-            return False
+        return None
 
     def validate_salesOrder_delivery(self, saleNo: str) -> bool:
         try:
-            self.cursor.execute("""SELECT i.ProductID, b.PBatchID, COALESCE(b.QuantityTaken, 0)
-                FROM Sales_Inventory i INNER JOIN Sales s ON i.SaleID = s.SaleID
-                LEFT JOIN Sales_Inventory_Batch b ON i.SalesInventoryID = b.SalesInventoryID
-                WHERE s.SaleNo = ?
-            """, (saleNo,))
-            results = [list(value) for value in self.cursor.fetchall()]
-            for result in results:
-                self.cursor.execute(
-                    """SELECT StockQuantity FROM Inventory WHERE ProductID = ? AND LocationID = 4 AND PBatchID = ?""",
-                    (result[0], result[1],))
-                try:
-                    result += [self.cursor.fetchone()[0]]
-                except TypeError:
-                    result += [0]
-            for result in results:
-                if result[2] > result[3]:
-                    return False
-            self.cursor.execute("""SELECT i.QuantitySold, COALESCE(SUM(b.QuantityTaken), 0)
-                FROM Sales_Inventory i INNER JOIN Sales s ON i.SaleID = s.SaleID
-                INNER JOIN Sales_Inventory_Batch b ON i.SalesInventoryID = b.SalesInventoryID
-                WHERE s.SaleNo = ? GROUP BY i.SalesInventoryID""", (saleNo,))
-            for value in self.cursor.fetchall():
-                if value[0] > value[1]:
-                    return False
-            self.connection.commit()
-            return True
+            return self._salesOrder_deliverable(saleNo)
         except sqlite3.Error as err:
             print(f"Delivery Validation Error: {err}")
             return False
 
+    def _salesOrder_deliverable(self, saleNo: str) -> bool:
+        """
+        An order can be delivered once, when every line is fully assigned to batches
+        and Output holds enough of each assigned batch.
+        """
+        self.cursor.execute("""
+            WITH Lines AS (SELECT si.SalesInventoryID, si.ProductID, si.QuantitySold
+            FROM Sales_Inventory si INNER JOIN Sales s ON si.SaleID = s.SaleID
+            WHERE s.SaleNo = ? AND s.Status != 'Delivered'),
+
+            Assigned AS (SELECT l.ProductID, CAST(b.PBatchID AS INTEGER) AS PBatchID, SUM(b.QuantityTaken) AS Quantity
+            FROM Lines l INNER JOIN Sales_Inventory_Batch b ON l.SalesInventoryID = b.SalesInventoryID
+            GROUP BY l.ProductID, CAST(b.PBatchID AS INTEGER))
+
+            SELECT EXISTS (SELECT 1 FROM Lines)
+            AND NOT EXISTS (SELECT 1 FROM Lines l WHERE l.QuantitySold >
+                (SELECT COALESCE(SUM(QuantityTaken), 0) FROM Sales_Inventory_Batch WHERE SalesInventoryID = l.SalesInventoryID))
+            AND NOT EXISTS (SELECT 1 FROM Assigned a WHERE a.Quantity >
+                (SELECT COALESCE(SUM(StockQuantity), 0) FROM Inventory
+                WHERE ProductID = a.ProductID AND LocationID = 4 AND PBatchID = a.PBatchID))
+        """, (saleNo,))
+        return bool(self.cursor.fetchone()[0])
+
+    @writes
     def delete_salesOrder(self, saleNo: str) -> bool:
         try:
             self.cursor.execute(
                 "DELETE FROM Sales_Inventory WHERE SaleID IN (SELECT SaleID FROM Sales WHERE SaleNo = ?)", (saleNo,))
             self.cursor.execute("DELETE FROM Sales WHERE SaleNo = ?", (saleNo,))
-            self.connection.commit()
             try:
                 self._log_user_activity(getattr(self, 'employeeID', None), f"Delete Sales Order | {saleNo}")
             except Exception:
@@ -1496,39 +1965,172 @@ class DatabaseConnection:
             print(f"Error: {err}")
             return False
 
+    @writes
     def deleteAccount(self, employeeID: int) -> bool:
         try:
             self.cursor.execute("DELETE FROM Accounts WHERE WorkerID = ?", (employeeID,))
             self.cursor.execute("UPDATE Tasks SET WorkerID = NULL WHERE WorkerID = ?", (employeeID,))
             self.cursor.execute("DELETE FROM Workers WHERE WorkerID = ?", (employeeID,))
-            self.connection.commit()
+            self.lookups.invalidate("Workers")
             return True
         except sqlite3.Error as err:
             print(f"Error: {err}")
             return False
 
-    def _generateID(self, latestID: str) -> str:
+    def _record_movements(self, movements: list, employee_id: int | None = None) -> None:
+        """Appends [Movement, ...] to the Inventory_Movements ledger, attributed to employee_id or the logged-in worker."""
+        workerID = self.employeeID if employee_id is None else employee_id
+        timestamp = int(datetime.now().timestamp())
+        self.cursor.executemany("""INSERT INTO Inventory_Movements (Timestamp, ProductID, PBatchID, FromLocationID,
+            ToLocationID, Quantity, WorkerID, ShipmentID, SaleID) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                                [(timestamp, *movement[:5], workerID, *movement[5:]) for movement in movements])
+
+    def _import_movement_log(self):
+        """
+        Copies the Product Movement Report lines logged before the Inventory_Movements ledger existed.
+        Lines as old as the first ledger row are skipped, so running it again never imports a line twice.
+        """
+        if not os.path.exists(self.config.getLogFile()):
+            return
+        pattern = r"(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| " \
+                  r"Product Movement Report Report \| Employee ID: (?P<employee_id>[0-9]+) \| (?P<msg>.*) \| INFO"
+        try:
+            with self.transaction():
+                self.cursor.execute("SELECT MIN(Timestamp) FROM Inventory_Movements")
+                first = self.cursor.fetchone()[0]
+                self.cursor.execute("SELECT ProductName, ProductID FROM Products")
+                products = dict(self.cursor.fetchall())
+                self.cursor.execute("SELECT LocationName, LocationID FROM Locations")
+                locations = dict(self.cursor.fetchall()) | {"Vendor": None}
+                rows = []
+                for e in logger.parse(self.config.getLogFile(), pattern=pattern):
+                    timestamp = int(datetime.strptime(e["time"], "%Y-%m-%d %H:%M:%S").timestamp())
+                    if first is not None and timestamp >= first:
+                        continue
+                    try:
+                        name, batchNumber, source, destination, quantity = e["msg"].split(' | ')
+                        rows.append((timestamp, products[name], self.lookups.get("batches", batchNumber),
+                                     locations[source], locations[destination], int(quantity), int(e["employee_id"])))
+                    except (KeyError, ValueError):
+                        continue  # Product or location no longer exists
+                self.cursor.executemany("""INSERT INTO Inventory_Movements (Timestamp, ProductID, PBatchID,
+                    FromLocationID, ToLocationID, Quantity, WorkerID) VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+
+    def _import_user_activity_log(self):
+        """Copies the User Activities lines logged before the User_Activities table existed."""
+        if not os.path.exists(self.config.getLogFile()):
+            return
+        pattern = r"(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \| " \
+                  r"User Activities Report \| Employee ID: (?P<employee_id>[0-9]+) \| (?P<msg>.*) \| INFO"
+        rows = []
+        for e in logger.parse(self.config.getLogFile(), pattern=pattern):
+            activity, _, remark = e["msg"].partition(" | ")
+            rows.append((int(datetime.strptime(e["time"], "%Y-%m-%d %H:%M:%S").timestamp()), int(e["employee_id"]),
+                         activity.strip(), remark.strip()))
+        try:
+            with self.transaction():
+                self.cursor.executemany("""INSERT INTO User_Activities (Timestamp, WorkerID, Activity, Remark)
+                    VALUES (?, ?, ?, ?)""", rows)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+
+    def _import_notification_exclusions(self):
+        """Moves the exclude_notifications lists of config.json into Notification_Dismissals."""
+        exclusions = self.config.legacyNotificationExclusions()
+        rows = [(int(employeeID), int(notificationID)) for employeeID, notificationIDs in exclusions.items()
+                if employeeID.lstrip("-").isdigit()
+                for notificationID in notificationIDs if str(notificationID).isdigit()]
         try:
-            string = latestID.split('-')
-            if string[1] != date.today().strftime('%y%m%d'):
-                return f"{string[0]}-{date.today().strftime('%y%m%d')}-A"
-            else:
-                return f"{string[0]}-{string[1]}-{self.__increment_alphabet__(string[2])}"
-        except:
-            return ""
+            with self.transaction():
+                self.cursor.executemany("""INSERT OR IGNORE INTO Notification_Dismissals (WorkerID, NotificationID)
+                    SELECT ?1, ?2 WHERE EXISTS (SELECT 1 FROM Workers WHERE WorkerID = ?1)
+                    AND EXISTS (SELECT 1 FROM Notification WHERE NotificationID = ?2)""", rows)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return
+
+        self.config.deleteLegacyNotificationExclusions()
+
+    def _import_user_preferences(self):
+        """Moves the profile_picture and theme_name entries of config.json into User_Preferences."""
+        preferences = self.config.legacyPreferences()
+        try:
+            with self.transaction():
+                # Entries of workers that no longer exist are dropped with the rest
+                self.cursor.executemany("""INSERT INTO User_Preferences (WorkerID, ProfilePicture, ThemeName)
+                    SELECT ?1, COALESCE(?2, 'user_1a'), COALESCE(?3, 'litera')
+                    WHERE EXISTS (SELECT 1 FROM Workers WHERE WorkerID = ?1) ON CONFLICT (WorkerID) DO NOTHING""",
+                                        [(int(employeeID), values.get("profile_picture"), values.get("theme_name"))
+                                         for employeeID, values in preferences.items()
+                                         if employeeID.lstrip("-").isdigit()])
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return
+
+        self.config.deleteLegacyPreferences()
+
+    def _query_page(self, query: str, id_column: str, sort_keys: dict, after: tuple, page_size: int,
+                    sort_key: str, descending: bool, search_columns: tuple = (), search: str = None,
+                    where: str = None, group_by: str = None) -> Page:
+        """
+        Runs one page of a table query using keyset pagination. Deep pages cost the same as the first when
+        the sort key is indexed on the table of id_column, see the *_SORT_KEYS above.
+        `after` is the cursor of the previous page: (row ID,) when sorting by ID, else (sort value, row ID).
+        A non-empty `search` keeps only the rows where one of search_columns contains it, ignoring case.
+        """
+        if sort_key not in sort_keys:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        key = [column for column in (sort_keys[sort_key], id_column) if column is not None]
+        direction = "DESC" if descending else "ASC"
+
+        conditions = [] if where is None else [where]
+        params = []
+        if after is not None:
+            operator = "<" if descending else ">"
+            if len(key) > 1:
+                # The row value comparison alone is not used to seek an expression index; this bound is
+                conditions.append(f"{key[0]} {operator}= ?")
+                params.append(after[0])
+            conditions.append(f"({', '.join(key)}) {operator} ({', '.join('?' * len(key))})")
+            params += list(after)
+        if search:
+            # Escape the LIKE wildcards so the text is matched literally
+            pattern = "%" + search.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+            conditions.append("(" + " OR ".join(f"{column} LIKE ? ESCAPE '!'" for column in search_columns) + ")")
+            params += [pattern] * len(search_columns)
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        if group_by is not None:
+            query += f" GROUP BY {group_by}"
+        query += f" ORDER BY {', '.join(f'{column} {direction}' for column in key)} LIMIT ?"
+        params.append(page_size)
+
+        try:
+            query = query.replace("SELECT ", f"SELECT {', '.join(key)}, ", 1)
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+            cursor = tuple(rows[-1][:len(key)]) if len(rows) == page_size else None
+            return Page([row[len(key):] for row in rows], cursor)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return Page([])
 
-    def __increment_alphabet__(self, string: str) -> str:
-        """Increments alphabets, e.g. A->B, Z->AA, ABZ-> ACA"""
-        overflow = 1
-        newString = ""
-        for char in string[::-1]:
-            asciiNum = ord(char) + overflow
-            overflow = 0
-            if asciiNum > 90:
-                asciiNum -= 26
-                overflow = 1
-            newString += chr(asciiNum)
-        return newString[::-1]
+    @writes
+    def reserve_ids(self, prefix: str, count: int = 1) -> list[str]:
+        """Reserves `count` consecutive identifiers for prefix ("SALE", "SHIP" or "BATCH") and today's date."""
+        try:
+            return Sequences.reserve(self.cursor, prefix, count)
+
+        except sqlite3.Error as err:
+            print(f"Error: {err}")
+            return []
 
     def _create_tables(self):
         self.cursor.execute("PRAGMA foreign_keys = ON;")
@@ -1683,10 +2285,8 @@ class DatabaseConnection:
         self.cursor.execute("INSERT INTO Workers (RoleID, Name, ContactNumber) VALUES (1, 'Ahmad', '0161123344');")
         self.cursor.execute("INSERT INTO Accounts (WorkerID, Email, HashedPW) VALUES (1, 'ahmad@gmail.com', ?)",
                             (b'$2b$14$OQM2OwY9kdaOeA/IE0hhPeXwrQhbZwVxxJvlynbkRDfXB1dm6XSOy',))
-<<<<<<< HEAD
-=======
-        
-            # =======================
+
+    # =======================
     # ===== OTP support =====
     # =======================
 
@@ -1707,13 +2307,13 @@ class DatabaseConnection:
         self.connection.commit()
         cur.close()
 
+    @writes
     def otp_insert(self, worker_id: int, code_hash: bytes, ttl_sec: int):
         cur = self.connection.cursor()
         cur.execute(
             "INSERT INTO OTP_Codes(WorkerID, CodeHash, CreatedAt, ExpiresAt) VALUES (?, ?, ?, ?)",
             (worker_id, code_hash.decode() if isinstance(code_hash, bytes) else code_hash, now(), now()+ttl_sec)
         )
-        self.connection.commit()
         cur.close()
 
     def otp_get_latest_active(self, worker_id: int):
@@ -1729,25 +2329,26 @@ class DatabaseConnection:
         cur.close()
         return row
 
+    @writes
     def otp_consume(self, otp_id: int):
         cur = self.connection.cursor()
         cur.execute("UPDATE OTP_Codes SET ConsumedAt=? WHERE id=?", (now(), otp_id))
-        self.connection.commit()
         cur.close()
 
+    @writes
     def otp_inc_attempt(self, otp_id: int):
         cur = self.connection.cursor()
         cur.execute("UPDATE OTP_Codes SET Attempts=Attempts+1 WHERE id=?", (otp_id,))
-        self.connection.commit()
         cur.close()
 
+    @writes
     def otp_cleanup(self):
         cur = self.connection.cursor()
         cur.execute("DELETE FROM OTP_Codes WHERE (ConsumedAt IS NOT NULL) OR (ExpiresAt < ?)", (now(),))
-        self.connection.commit()
         cur.close()
 
     # --- Logs helpers ---
+    @writes
     def log_event(self, actor_id: int, actor_name: str, action: str,
                   target_type: str, target_id: str|int|None, detail: str=""):
         cur = self.connection.cursor()
@@ -1756,7 +2357,6 @@ class DatabaseConnection:
             "VALUES(?, ?, ?, ?, ?, ?)",
             (actor_id, actor_name, action, target_type, str(target_id) if target_id is not None else None, detail)
         )
-        self.connection.commit()
         cur.close()
 
     def logs_latest(self, limit: int = 50):
@@ -1844,4 +2444,3 @@ if __name__ == "__main__":
     #print(con.query_product_movement_report())
     # print(con.query_traceability_report("BATCH-240526-A", "Executive Office Chair"))
     print(con.query_product_meter())
->>>>>>> dfcd0630c26e219a7187e71cd49a3531ad29663d
@@ -0,0 +1,138 @@
+# Database/LookupCache.py
+"""
+In-memory maps of the small, mostly static lookup tables that the write paths
+consult on every call (roles, locations, worker roles, product and batch numbers,
+supplier names).
+
+A map is filled one key at a time: a miss runs a point query for that key and
+remembers the answer, a missing row included, so an unknown key costs one
+indexed lookup once. load() fills a whole map with a single query when a caller
+needs all of it.
+
+Every lookup first compares PRAGMA data_version, which moves when another
+connection commits, and the connection's own total_changes with the values seen
+last time. Only when one of them moved are the per-table version counters that
+triggers keep in Lookup_Versions (migration 12) read, and only the maps built from
+a table whose counter moved are dropped; commits that touch no lookup table, such
+as notifications, leave the maps alone. A cache hit therefore costs one PRAGMA
+while nothing is written. A rolled-back transaction clears every map. On a
+database without Lookup_Versions, any change clears every map instead.
+"""
+import sqlite3
+import threading
+
+# name: (source tables, query returning (key, value) rows, point query returning the value for one key)
+LOOKUPS = {
+    "roles": (("Roles",), "SELECT RoleName, RoleID FROM Roles",
+              "SELECT RoleID FROM Roles WHERE RoleName = ?"),
+    "worker_roles": (("Workers", "Roles"),
+                     "SELECT w.WorkerID, r.RoleName FROM Workers w INNER JOIN Roles r ON w.RoleID = r.RoleID",
+                     """SELECT r.RoleName FROM Workers w INNER JOIN Roles r ON w.RoleID = r.RoleID
+                     WHERE w.WorkerID = ?"""),
+    "locations": (("Locations",), "SELECT LocationID, LocationName FROM Locations",
+                  "SELECT LocationName FROM Locations WHERE LocationID = ?"),
+    "products": (("Products",), "SELECT ProductNo, ProductID FROM Products",
+                 "SELECT ProductID FROM Products WHERE ProductNo = ?"),
+    "product_nos": (("Products",), "SELECT ProductID, ProductNo FROM Products",
+                    "SELECT ProductNo FROM Products WHERE ProductID = ?"),
+    "product_names": (("Products",), "SELECT ProductNo, ProductName FROM Products",
+                      "SELECT ProductName FROM Products WHERE ProductNo = ?"),
+    "batches": (("Product_Batch",), "SELECT PBatchNumber, PBatchID FROM Product_Batch",
+                "SELECT PBatchID FROM Product_Batch WHERE PBatchNumber = ?"),
+    "batch_numbers": (("Product_Batch",), "SELECT PBatchID, PBatchNumber FROM Product_Batch",
+                      "SELECT PBatchNumber FROM Product_Batch WHERE PBatchID = ?"),
+    "suppliers": (("Suppliers",), "SELECT SupplierID, Name FROM Suppliers",
+                  "SELECT Name FROM Suppliers WHERE SupplierID = ?"),
+}
+
+# table: columns the lookups read; updates to other columns leave the table's version alone
+LOOKUP_COLUMNS = {
+    "Roles": ("RoleID", "RoleName"),
+    "Workers": ("WorkerID", "RoleID"),
+    "Locations": ("LocationID", "LocationName"),
+    "Products": ("ProductID", "ProductNo", "ProductName"),
+    "Product_Batch": ("PBatchID", "PBatchNumber"),
+    "Suppliers": ("SupplierID", "Name"),
+}
+
+_MISSING = object()  # Remembered answer for a key with no row
+
+
+class LookupCache:
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self._maps = {}
+        self._complete = set()  # Maps filled by load()
+        self._versions = None
+        self._own = {}  # table: counter bumps made by set() callers since the last check
+        self._seen = None  # (PRAGMA data_version, total_changes) when the versions were last read
+        self._lock = threading.RLock()
+
+    def get(self, name: str, key, default=None):
+        """Returns the value mapped to key in the named lookup, or default if there is no such row."""
+        with self._lock:
+            self._check_versions()
+            values = self._maps.setdefault(name, {})
+            if key not in values:
+                if name in self._complete:
+                    return default
+                row = self.connection.execute(LOOKUPS[name][2], (key,)).fetchone()
+                values[key] = _MISSING if row is None else row[0]
+            value = values[key]
+            return default if value is _MISSING else value
+
+    def load(self, name: str) -> dict:
+        """Returns a copy of the whole named lookup, loaded with one query."""
+        with self._lock:
+            self._check_versions()
+            if name not in self._complete:
+                self._maps[name] = dict(self.connection.execute(LOOKUPS[name][1]).fetchall())
+                self._complete.add(name)
+            return dict(self._maps[name])
+
+    def set(self, name: str, key, value, written: str = None) -> None:
+        """
+        Records a row the caller has just written, so the next get() needs no query. written names the
+        table if that write bumped its Lookup_Versions counter once, so the bump is not taken for a change
+        made elsewhere.
+        """
+        with self._lock:
+            self._maps.setdefault(name, {})[key] = value
+            if written is not None:
+                self._own[written] = self._own.get(written, 0) + 1
+
+    def invalidate(self, *tables: str) -> None:
+        """Drops every map loaded from any of the given tables."""
+        with self._lock:
+            for name, (sources, _, _) in LOOKUPS.items():
+                if set(sources).intersection(tables):
+                    self._maps.pop(name, None)
+                    self._complete.discard(name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
+            self._complete.clear()
+            self._versions = None
+            self._own.clear()
+            self._seen = None
+
+    def _check_versions(self) -> None:
+        seen = (self.connection.execute("PRAGMA data_version").fetchone()[0], self.connection.total_changes)
+        if seen == self._seen:
+            return
+        self._seen = seen
+        try:
+            versions = dict(self.connection.execute("SELECT TableName, Version FROM Lookup_Versions").fetchall())
+        except sqlite3.OperationalError:
+            self._maps.clear()
+            self._complete.clear()
+            return
+        if self._versions is not None:
+            changed = [table for table in LOOKUP_COLUMNS
+                       if versions.get(table, 0) != self._versions.get(table, 0) + self._own.get(table, 0)]
+            if changed:
+                self.invalidate(*changed)
+        self._versions = versions
+        self._own.clear()
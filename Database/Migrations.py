@@ -0,0 +1,324 @@
+# Database/Migrations.py
+"""
+Versioned schema migrations.
+
+Each migration is a (version, description, steps) tuple. Steps are either a
+sequence of SQL statements or a callable taking a cursor. Pending migrations
+are applied in version order, each inside its own transaction, and recorded
+in the schema_version table so existing databases evolve in place.
+"""
+import sqlite3
+import time
+
+from Database import Sequences
+from Database.LookupCache import LOOKUP_COLUMNS
+
+
+def _hot_path_indexes() -> tuple[str, ...]:
+    return (
+        """CREATE INDEX IF NOT EXISTS idx_inventory_product_batch_location
+           ON Inventory(ProductID, PBatchID, LocationID)""",
+        """CREATE INDEX IF NOT EXISTS idx_sales_inventory_sale_product
+           ON Sales_Inventory(SaleID, ProductID)""",
+        """CREATE INDEX IF NOT EXISTS idx_sales_inventory_batch_line
+           ON Sales_Inventory_Batch(SalesInventoryID, PBatchID)""",
+        """CREATE INDEX IF NOT EXISTS idx_sales_status ON Sales(Status)""",
+        """CREATE INDEX IF NOT EXISTS idx_shipments_status ON Shipments(Status)""",
+        """CREATE INDEX IF NOT EXISTS idx_product_batch_number ON Product_Batch(PBatchNumber)""",
+    )
+
+
+def _stock_summary() -> tuple[str, ...]:
+    # Stock_Summary holds one row per (product, location) with the summed quantity and the number
+    # of Inventory rows behind it, so a row exists exactly when Inventory has stock records there.
+    # Rows without a location are never counted as stock and are left out.
+    add = """INSERT INTO Stock_Summary (ProductID, LocationID, Quantity, Entries)
+           VALUES (NEW.ProductID, NEW.LocationID, COALESCE(NEW.StockQuantity, 0), 1)
+           ON CONFLICT (ProductID, LocationID) DO UPDATE
+           SET Quantity = Quantity + excluded.Quantity, Entries = Entries + 1;"""
+    remove = """UPDATE Stock_Summary SET Quantity = Quantity - COALESCE(OLD.StockQuantity, 0), Entries = Entries - 1
+           WHERE ProductID = OLD.ProductID AND LocationID = OLD.LocationID;
+           DELETE FROM Stock_Summary
+           WHERE ProductID = OLD.ProductID AND LocationID = OLD.LocationID AND Entries = 0;"""
+    return (
+        """CREATE TABLE IF NOT EXISTS Stock_Summary (
+           ProductID INTEGER NOT NULL,
+           LocationID INTEGER NOT NULL,
+           Quantity INTEGER NOT NULL DEFAULT 0,
+           Entries INTEGER NOT NULL DEFAULT 0,
+           PRIMARY KEY (ProductID, LocationID)) WITHOUT ROWID""",
+        """INSERT INTO Stock_Summary (ProductID, LocationID, Quantity, Entries)
+           SELECT ProductID, LocationID, COALESCE(SUM(StockQuantity), 0), COUNT(*)
+           FROM Inventory WHERE LocationID IS NOT NULL GROUP BY ProductID, LocationID""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_inventory_summary_insert
+           AFTER INSERT ON Inventory WHEN NEW.LocationID IS NOT NULL
+           BEGIN {add} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_inventory_summary_delete
+           AFTER DELETE ON Inventory WHEN OLD.LocationID IS NOT NULL
+           BEGIN {remove} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_inventory_summary_update_old
+           AFTER UPDATE OF ProductID, LocationID, StockQuantity ON Inventory WHEN OLD.LocationID IS NOT NULL
+           BEGIN {remove} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_inventory_summary_update_new
+           AFTER UPDATE OF ProductID, LocationID, StockQuantity ON Inventory WHEN NEW.LocationID IS NOT NULL
+           BEGIN {add} END""",
+    )
+
+
+def _batch_availability() -> tuple[str, ...]:
+    # Stock per product and batch still on hand, less what undelivered sales orders have already
+    # assigned from it. Delivered assignments are excluded since that stock has left for Customer.
+    # Filtering on ProductID or ProductNo is pushed into the grouped scan, and the assigned total is
+    # a per-batch index lookup, so the cost follows the product's batches rather than the table size.
+    # Sales_Inventory_Batch.PBatchID is a TEXT column, hence the cast to keep its index usable.
+    return (
+        """CREATE INDEX IF NOT EXISTS idx_sales_inventory_batch_batch
+           ON Sales_Inventory_Batch(PBatchID, SalesInventoryID)""",
+        """CREATE VIEW IF NOT EXISTS Batch_Availability AS
+           WITH Stock AS (SELECT p.ProductID, p.ProductNo, i.PBatchID, SUM(i.StockQuantity) AS OnHand
+           FROM Products p INNER JOIN Inventory i ON p.ProductID = i.ProductID
+           WHERE i.LocationID != 5 GROUP BY p.ProductID, p.ProductNo, i.PBatchID),
+
+           Assigned AS (SELECT st.*, (SELECT COALESCE(SUM(b.QuantityTaken), 0)
+           FROM Sales_Inventory_Batch b INNER JOIN Sales_Inventory si ON b.SalesInventoryID = si.SalesInventoryID
+           INNER JOIN Sales s ON si.SaleID = s.SaleID
+           WHERE b.PBatchID = CAST(st.PBatchID AS TEXT) AND si.ProductID = st.ProductID
+           AND s.Status != 'Delivered') AS Assigned FROM Stock st)
+
+           SELECT ProductID, ProductNo, PBatchID, OnHand, Assigned, OnHand - Assigned AS Available FROM Assigned""",
+    )
+
+
+def _sequences(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""CREATE TABLE IF NOT EXISTS Sequences (
+        Prefix TEXT NOT NULL,
+        Day TEXT NOT NULL,
+        LastValue INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Prefix, Day)) WITHOUT ROWID""")
+    Sequences.seed(cursor)
+
+
+def _batch_date(column: str) -> str:
+    # BATCH-YYMMDD-X -> YYYY-MM-DD, NULL for batch numbers in any other format
+    return f"""CASE WHEN {column} GLOB 'BATCH-[0-9][0-9][0-9][0-9][0-9][0-9]-*'
+           THEN '20' || substr({column}, 7, 2) || '-' || substr({column}, 9, 2) || '-' || substr({column}, 11, 2) END"""
+
+
+def _unique_batches() -> tuple[str, ...]:
+    # Duplicate batch numbers are merged into the oldest PBatchID before the unique index is built.
+    # Inventory rows that end up on the same (ProductID, LocationID, PBatchID) are merged into the
+    # oldest of them, quantities summed. Shipments and Sales_Inventory_Batch store PBatchID as TEXT,
+    # hence the casts.
+    duplicates = """SELECT d.PBatchID AS Duplicate, MIN(k.PBatchID) AS Keep FROM Product_Batch d
+           INNER JOIN Product_Batch k ON k.PBatchNumber = d.PBatchNumber
+           WHERE d.PBatchNumber IS NOT NULL GROUP BY d.PBatchID HAVING d.PBatchID != MIN(k.PBatchID)"""
+    repoint = """UPDATE {table} SET PBatchID = (SELECT Keep FROM Batch_Duplicates WHERE Duplicate = CAST({table}.PBatchID AS INTEGER))
+           WHERE CAST(PBatchID AS INTEGER) IN (SELECT Duplicate FROM Batch_Duplicates)"""
+    same_row = """o.ProductID = Inventory.ProductID AND o.LocationID IS Inventory.LocationID
+           AND o.PBatchID = Inventory.PBatchID"""
+    return (
+        f"""CREATE TEMP TABLE Batch_Duplicates AS {duplicates}""",
+        repoint.format(table="Inventory"),
+        f"""UPDATE Inventory SET StockQuantity = (SELECT SUM(o.StockQuantity) FROM Inventory o WHERE {same_row})
+           WHERE PBatchID IN (SELECT Keep FROM Batch_Duplicates)
+           AND InventoryID = (SELECT MIN(o.InventoryID) FROM Inventory o WHERE {same_row})""",
+        f"""DELETE FROM Inventory WHERE PBatchID IN (SELECT Keep FROM Batch_Duplicates)
+           AND InventoryID != (SELECT MIN(o.InventoryID) FROM Inventory o WHERE {same_row})""",
+        repoint.format(table="Shipments"),
+        repoint.format(table="Sales_Inventory_Batch"),
+        """DELETE FROM Product_Batch WHERE PBatchID IN (SELECT Duplicate FROM Batch_Duplicates)""",
+        """DROP TABLE temp.Batch_Duplicates""",
+        """DROP INDEX IF EXISTS idx_product_batch_number""",
+        """CREATE UNIQUE INDEX IF NOT EXISTS idx_product_batch_number ON Product_Batch(PBatchNumber)""",
+        """ALTER TABLE Product_Batch ADD COLUMN BatchDate TEXT""",
+        f"""UPDATE Product_Batch SET BatchDate = {_batch_date("PBatchNumber")}""",
+        """CREATE INDEX IF NOT EXISTS idx_product_batch_date ON Product_Batch(BatchDate)""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_product_batch_date_insert
+           AFTER INSERT ON Product_Batch WHEN NEW.BatchDate IS NULL
+           BEGIN UPDATE Product_Batch SET BatchDate = {_batch_date("NEW.PBatchNumber")}
+           WHERE PBatchID = NEW.PBatchID; END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_product_batch_date_update
+           AFTER UPDATE OF PBatchNumber ON Product_Batch
+           BEGIN UPDATE Product_Batch SET BatchDate = {_batch_date("NEW.PBatchNumber")}
+           WHERE PBatchID = NEW.PBatchID; END""",
+    )
+
+
+def _inventory_movements() -> tuple[str, ...]:
+    # Append-only ledger of stock movements. FromLocationID is NULL for stock received from a vendor;
+    # ShipmentID / SaleID link receipts and deliveries to their orders. IDs are not foreign keys so
+    # the history outlives deleted products and workers.
+    return (
+        """CREATE TABLE IF NOT EXISTS Inventory_Movements (
+           MovementID INTEGER PRIMARY KEY AUTOINCREMENT,
+           Timestamp INTEGER NOT NULL,
+           ProductID INTEGER NOT NULL,
+           PBatchID INTEGER,
+           FromLocationID INTEGER,
+           ToLocationID INTEGER NOT NULL,
+           Quantity INTEGER NOT NULL,
+           WorkerID INTEGER,
+           ShipmentID INTEGER,
+           SaleID INTEGER)""",
+        """CREATE INDEX IF NOT EXISTS idx_movements_timestamp ON Inventory_Movements(Timestamp)""",
+        """CREATE INDEX IF NOT EXISTS idx_movements_batch ON Inventory_Movements(PBatchID, Timestamp)""",
+        """CREATE INDEX IF NOT EXISTS idx_movements_product ON Inventory_Movements(ProductID, Timestamp)""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movements_no_update BEFORE UPDATE ON Inventory_Movements
+           BEGIN SELECT RAISE(ABORT, 'Inventory_Movements is append-only'); END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movements_no_delete BEFORE DELETE ON Inventory_Movements
+           BEGIN SELECT RAISE(ABORT, 'Inventory_Movements is append-only'); END""",
+    )
+
+
+def _user_activities() -> tuple[str, ...]:
+    return (
+        """CREATE TABLE IF NOT EXISTS User_Activities (
+           ActivityID INTEGER PRIMARY KEY AUTOINCREMENT,
+           Timestamp INTEGER NOT NULL,
+           WorkerID INTEGER,
+           Activity TEXT NOT NULL,
+           Remark TEXT)""",
+        """CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp ON User_Activities(Timestamp)""",
+        """CREATE INDEX IF NOT EXISTS idx_user_activities_worker ON User_Activities(WorkerID, Timestamp)""",
+        """CREATE INDEX IF NOT EXISTS idx_user_activities_activity ON User_Activities(Activity, Timestamp)""",
+    )
+
+
+def _notification_feed() -> tuple[str, ...]:
+    return (
+        """CREATE INDEX IF NOT EXISTS idx_notification_role ON Notification(RoleID, NotificationID)""",
+        """CREATE TABLE IF NOT EXISTS Notification_Cursors (
+           WorkerID INTEGER PRIMARY KEY,
+           LastSeenID INTEGER NOT NULL DEFAULT 0,
+           FOREIGN KEY (WorkerID) REFERENCES Workers(WorkerID) ON DELETE CASCADE)""",
+    )
+
+
+def _notification_dismissals() -> tuple[str, ...]:
+    return (
+        """CREATE TABLE IF NOT EXISTS Notification_Dismissals (
+           WorkerID INTEGER NOT NULL,
+           NotificationID INTEGER NOT NULL,
+           PRIMARY KEY (WorkerID, NotificationID),
+           FOREIGN KEY (WorkerID) REFERENCES Workers(WorkerID) ON DELETE CASCADE,
+           FOREIGN KEY (NotificationID) REFERENCES Notification(NotificationID) ON DELETE CASCADE
+           ) WITHOUT ROWID""",
+        """CREATE INDEX IF NOT EXISTS idx_notification_dismissals_notification
+           ON Notification_Dismissals(NotificationID)""",
+    )
+
+
+def _user_preferences() -> tuple[str, ...]:
+    return (
+        """CREATE TABLE IF NOT EXISTS User_Preferences (
+           WorkerID INTEGER PRIMARY KEY,
+           ProfilePicture TEXT NOT NULL DEFAULT 'user_1a',
+           ThemeName TEXT NOT NULL DEFAULT 'litera',
+           FOREIGN KEY (WorkerID) REFERENCES Workers(WorkerID) ON DELETE CASCADE)""",
+    )
+
+
+def _lookup_versions() -> list[str]:
+    # One counter per lookup source table, bumped by any change to the columns LookupCache reads,
+    # so the cache can tell which of its maps another connection made stale.
+    statements = ["""CREATE TABLE IF NOT EXISTS Lookup_Versions (
+           TableName TEXT PRIMARY KEY,
+           Version INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"""]
+    for table, columns in LOOKUP_COLUMNS.items():
+        statements.append(f"INSERT OR IGNORE INTO Lookup_Versions (TableName) VALUES ('{table}')")
+        bump = f"BEGIN UPDATE Lookup_Versions SET Version = Version + 1 WHERE TableName = '{table}'; END"
+        for event in ("INSERT", f"UPDATE OF {', '.join(columns)}", "DELETE"):
+            statements.append(f"""CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_lookup_{event.split()[0].lower()}
+           AFTER {event} ON {table} {bump}""")
+    return statements
+
+
+def _sort_key_indexes() -> tuple[str, ...]:
+    # One per non-ID key of the paginated table queries (the *_SORT_KEYS in Database.py); an
+    # expression index only serves a query that spells the expression the same way.
+    # Shipments.ShipmentNo and Status are already covered by their unique and status indexes.
+    return (
+        """CREATE INDEX IF NOT EXISTS idx_inventory_quantity ON Inventory(COALESCE(StockQuantity, 0))""",
+        """CREATE INDEX IF NOT EXISTS idx_shipments_date ON Shipments(ShipmentDate)""",
+    )
+
+
+# DatabaseConnection imports what was logged to Database.log before these were first applied
+MOVEMENT_LEDGER_VERSION = 7
+MOVEMENT_LOG_REIMPORT_VERSION = 14  # The import after 7 used to find no lines; runs it again
+USER_ACTIVITIES_VERSION = 8
+NOTIFICATION_DISMISSALS_VERSION = 10  # and the exclude_notifications lists in config.json
+USER_PREFERENCES_VERSION = 11  # and the profile_picture and theme_name entries in config.json
+
+MIGRATIONS = [
+    (1, "Hot-path indexes for inventory, sales and shipments", _hot_path_indexes()),
+    (2, "Trigger-maintained Stock_Summary of on-hand quantities", _stock_summary()),
+    (3, "Batch_Availability view of unassigned stock per batch", _batch_availability()),
+    (4, "Sequences table for sale, shipment and batch numbers", _sequences),
+    (5, "Unique batch numbers and an indexed BatchDate", _unique_batches()),
+    (6, "Optional ExpiryDate on product batches", ("ALTER TABLE Product_Batch ADD COLUMN ExpiryDate TEXT",)),
+    (7, "Append-only Inventory_Movements ledger", _inventory_movements()),
+    (8, "Indexed User_Activities audit table", _user_activities()),
+    (9, "Notification feed index and per-worker last seen cursor", _notification_feed()),
+    (10, "Notification_Dismissals replacing the config.json exclusion lists", _notification_dismissals()),
+    (11, "User_Preferences replacing the config.json avatar and theme entries", _user_preferences()),
+    (12, "Trigger-maintained Lookup_Versions for the lookup cache", _lookup_versions()),
+    (13, "Indexes behind the sort keys of the paginated tables", _sort_key_indexes()),
+    (14, "Import the movement log lines missed after Inventory_Movements was added", ()),
+]
+
+
+def _ensure_version_table(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at INTEGER NOT NULL);
+    """)
+
+
+def current_version(connection: sqlite3.Connection) -> int:
+    """Returns the highest applied migration version, 0 for an unversioned database."""
+    cursor = connection.cursor()
+    try:
+        _ensure_version_table(cursor)
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def migrate(connection: sqlite3.Connection, migrations: list = None) -> list[int]:
+    """Applies every pending migration in order. Returns the versions that were applied."""
+    migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda m: m[0])
+    if connection.in_transaction:
+        connection.commit()
+
+    applied = []
+    version = current_version(connection)
+    cursor = connection.cursor()
+    try:
+        for number, description, steps in migrations:
+            if number <= version:
+                continue
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                if callable(steps):
+                    steps(cursor)
+                else:
+                    for statement in steps:
+                        cursor.execute(statement)
+                cursor.execute("INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                               (number, description, int(time.time())))
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+            applied.append(number)
+
+        if applied:
+            cursor.execute("PRAGMA optimize")
+        return applied
+
+    finally:
+        cursor.close()
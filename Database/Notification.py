@@ -1,8 +1,8 @@
 # Database/Notification.py
-from ttkbootstrap.toast import ToastNotification
 from Database import DatabaseConnection
+from Database.NotificationDispatcher import ROLE_RANKS
+from Database.NotificationTemplates import NotificationTemplate
 from configuration import Configuration
-import json
 
 
 class Notification:
@@ -16,56 +16,44 @@ class Notification:
     def __init__(self, employee_id: int):
         self.db_connection = DatabaseConnection()
         self.config = Configuration()
-        self.notification_file = f"{self.config.repo_file_path}/Database/Notifications.json"
         self.employee_id = str(employee_id)
         emp = self.db_connection.query_employee(employee_id)
         self.role = emp[1] if emp else "Worker"
 
-    def get_notifications(self):
-        """Returns: [NotificationID, TimeStamp, Description] excluding configured exclusions."""
-        notifications = self.__read_notifications__()
+    def get_notifications(self, limit: int = -1, before_id: int = None, after_id: int = 0):
+        """Returns: [NotificationID, TimeStamp, Description] newest first, excluding dismissed notifications."""
         try:
-            exclusions = self.config.getNotificationExclusions(str(self.employee_id))
+            return self.db_connection.query_notification(self.role, limit, before_id, after_id, int(self.employee_id))
         except Exception:
-            exclusions = []
-        for exclusion in exclusions:
-            notifications = [n for n in notifications if str(n[0]) != exclusion]
-        return notifications
+            return []
 
-    def create_notification(self, notification_key: str, placeholder: str = None):
-        """Creates a new notification. Placeholder is inserted if necessary."""
-        data = self._read_json_key(notification_key)
-        if not data:
-            return
+    def unread_count(self) -> int:
+        """Number of notifications newer than the last one this employee has seen."""
+        return self.db_connection.query_unread_notification_count(self.role, int(self.employee_id))
 
-        message = data.get("Message", "")
-        if placeholder is not None:
-            try:
-                message = message.format(placeholder)
-            except Exception:
-                pass
+    def last_seen(self) -> int:
+        return self.db_connection.query_notification_cursor(int(self.employee_id))
 
-        self._write_notification(data.get("Access", "Worker"), message)
+    def mark_seen(self, notification_id: int) -> None:
+        self.db_connection.mark_notifications_seen(int(self.employee_id), notification_id)
 
-        dictionary = {"Worker": 3, "Supervisor": 2, "Administrator": 1}
-        try:
-            if dictionary.get(self.role, 3) <= dictionary.get(data.get("Access", "Worker"), 3):
-                ToastNotification(title=data.get("Title", "Notification"),
-                                  message=message, duration=500).show_toast()
-        except Exception:
-            # Don't crash UI if toast fails
-            pass
+    def create_notification(self, notification_key: str, placeholder: str = None):
+        """Queues a new notification for the dispatcher thread. Placeholder is inserted if necessary."""
+        if not self._read_json_key(notification_key):
+            return
+
+        self.db_connection.notifications.submit(notification_key, placeholder, ROLE_RANKS.get(self.role, 3))
 
-    def exclude_notification(self, notification_id: str) -> None:
+    def exclude_notification(self, notification_id: int) -> None:
         try:
-            self.config.writeNotificationExclusions(self.employee_id, notification_id)
+            self.db_connection.dismiss_notification(int(self.employee_id), int(notification_id))
         except Exception:
             pass
 
-    def __read_notifications__(self):
-        """Returns: [NotificationID, TimeStamp, Description] without exclusions."""
+    def __read_notifications__(self, limit: int = -1, before_id: int = None, after_id: int = 0):
+        """Returns: [NotificationID, TimeStamp, Description] including dismissed notifications."""
         try:
-            return self.db_connection.query_notification(self.role)
+            return self.db_connection.query_notification(self.role, limit, before_id, after_id)
         except Exception:
             return []
 
@@ -85,13 +73,8 @@ class Notification:
 
     # ---- helpers ---------------------------------------------------------
 
-    def _read_json_key(self, key: str):
-        try:
-            with open(self.notification_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data.get(key)
-        except Exception:
-            return None
+    def _read_json_key(self, key: str) -> NotificationTemplate | None:
+        return self.db_connection.notifications.templates.get(key)
 
 
 if __name__ == '__main__':
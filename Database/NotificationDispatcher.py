@@ -0,0 +1,131 @@
+# Database/NotificationDispatcher.py
+"""
+Background delivery of notifications raised through the logger.
+
+log_notification_filter runs on whichever thread logged, which is the UI thread
+for every add/update action, so it only puts the event on a queue. A worker
+thread with its own connection takes the events off the queue, waits briefly for
+the rest of a burst, and writes the whole batch with one executemany in one
+transaction. Toasts cannot be shown from the worker, so they go on a second queue
+that the Tk main loop drains with after() once a window has been attached; without
+one they are dropped.
+
+Notifications are committed on their own, so one raised by an action that is later
+rolled back is still kept. The worker only writes Notification, which no lookup
+table depends on, so its commits leave the LookupCache maps of the main connection
+alone (see Lookup_Versions).
+"""
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from tkinter import TclError
+
+from ttkbootstrap.toast import ToastNotification
+
+from Database.ConnectionPool import configure_writer, BUSY_TIMEOUT_MS
+from Database.NotificationTemplates import NotificationTemplates
+
+BATCH_SIZE = 200  # Most events written in one transaction
+COALESCE_SECONDS = 0.05  # How long the worker waits for the rest of a burst
+POLL_MS = 200  # How often the Tk main loop checks for toasts
+TOAST_DURATION = 500
+
+ROLE_RANKS = {"Administrator": 1, "Supervisor": 2, "Worker": 3}
+
+
+class NotificationDispatcher:
+
+    def __init__(self, db_filepath: str, templates_path: str):
+        self.db_filepath = db_filepath
+        self.templates = NotificationTemplates(templates_path)
+        self.transactions = 0  # Batches committed, for diagnostics and tests
+        self._events = queue.Queue()
+        self._toasts = queue.SimpleQueue()
+        self._root = None
+        self._thread = threading.Thread(target=self._run, name="NotificationDispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, notification_key: str, placeholder: str = None, viewer_rank: int = None) -> None:
+        """
+        Queues a notification. viewer_rank is the ROLE_RANKS value of the logged-in employee;
+        a toast is shown when it is at or above the notification's access level.
+        """
+        self._events.put((notification_key, placeholder, viewer_rank))
+
+    def flush(self) -> None:
+        """Blocks until every queued notification has been written."""
+        self._events.join()
+
+    def attach(self, root) -> None:
+        """Shows queued toasts from the Tk main loop of root."""
+        self._root = root
+        root.after(POLL_MS, self._show_toasts)
+
+    def close(self) -> None:
+        self._events.put(None)
+        self._thread.join()
+
+    def _run(self):
+        connection = sqlite3.connect(self.db_filepath, timeout=BUSY_TIMEOUT_MS / 1000)
+        configure_writer(connection)
+        try:
+            while True:
+                batch = [self._events.get()]
+                deadline = time.monotonic() + COALESCE_SECONDS
+                while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self._events.get(timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+
+                try:
+                    self._write(connection, [event for event in batch if event is not None])
+                except sqlite3.Error as err:
+                    print(f"Error: {err}")
+                finally:
+                    for _ in batch:
+                        self._events.task_done()
+
+                if batch[-1] is None:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection: sqlite3.Connection, events: list) -> None:
+        if not events:
+            return
+        roles = dict(connection.execute("SELECT RoleName, RoleID FROM Roles").fetchall())
+
+        rows, toasts = [], []
+        for notification_key, placeholder, viewer_rank in events:
+            template = self.templates.get(notification_key)
+            if template is None:
+                continue
+            message = template.render(placeholder)
+            rows.append((roles.get(template.access), datetime.now(), message))
+            if viewer_rank is not None and viewer_rank <= ROLE_RANKS.get(template.access, 3):
+                toasts.append((template.title, message))
+
+        with connection:
+            connection.executemany("""INSERT INTO Notification (RoleID, Timestamp, NotificationDesc)
+                VALUES (?, ?, ?)""", rows)
+        self.transactions += 1
+
+        if self._root is not None:
+            for toast in toasts:
+                self._toasts.put(toast)
+
+    def _show_toasts(self):
+        while True:
+            try:
+                title, message = self._toasts.get_nowait()
+            except queue.Empty:
+                break
+            ToastNotification(title=title, message=message, duration=TOAST_DURATION).show_toast()
+        try:
+            self._root.after(POLL_MS, self._show_toasts)
+        except TclError:
+            # The window was destroyed
+            self._root = None
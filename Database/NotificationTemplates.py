@@ -0,0 +1,70 @@
+# Database/NotificationTemplates.py
+"""
+Registry of the notification templates in Notifications.json.
+
+The file is read once and each message is split into its literal text and
+placeholder fields up front, so rendering is a join rather than a str.format
+parse. Every lookup compares the file's mtime with the one seen at load time and
+reloads only when it changed, which means an unknown key costs a stat and a dict
+miss instead of a file read.
+"""
+import json
+import os
+import string
+import threading
+from typing import NamedTuple
+
+
+class NotificationTemplate(NamedTuple):
+    key: str
+    title: str
+    access: str  # Lowest role that sees it: "Worker", "Supervisor" or "Administrator"
+    message: str
+    parts: tuple  # ((literal text, has a placeholder field), ...)
+
+    def render(self, placeholder: str = None) -> str:
+        """Returns the message with placeholder inserted into its fields, or the raw message without one."""
+        if placeholder is None:
+            return self.message
+        value = str(placeholder)
+        return "".join(literal + value if field else literal for literal, field in self.parts)
+
+
+def parse_template(key: str, data: dict) -> NotificationTemplate:
+    message = data.get("Message", "")
+    parts = tuple((literal, field is not None) for literal, field, _, _ in string.Formatter().parse(message))
+    return NotificationTemplate(key, data.get("Title", "Notification"), data.get("Access", "Worker"), message, parts)
+
+
+class NotificationTemplates:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._templates = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> NotificationTemplate | None:
+        with self._lock:
+            self._check_mtime()
+            return self._templates.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def _check_mtime(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._templates, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as err:
+            print(f"Error: {err}")
+            return  # Keep the last good templates; a half-written file is retried on the next lookup
+        self._templates = {key: parse_template(key, value) for key, value in data.items()}
+        self._mtime = mtime
@@ -0,0 +1,155 @@
+# Database/Profiler.py
+"""
+Opt-in timing of DatabaseConnection methods.
+
+Set KEAI_PROFILE=1 to enable. Every public query_*, add_*, update_* and delete_*
+method is wrapped to record its call count, latency and rows returned, and each
+connection's sqlite3 trace callback attributes the SQL statements it runs to the
+method that issued them. Set KEAI_PROFILE_OUT to a file path to dump the stats as
+JSON when the application exits; the admin Profiling page can also export them.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+PROFILE_ENV = "KEAI_PROFILE"
+PROFILE_OUT_ENV = "KEAI_PROFILE_OUT"
+PROFILED_PREFIXES = ("query_", "add_", "update_", "delete_")
+SAMPLE_SIZE = 2048  # Latency samples kept per method for the percentiles
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def _row_count(result) -> int:
+    if hasattr(result, "rows"):
+        return len(result.rows)
+    if isinstance(result, (list, dict, set)) or (isinstance(result, tuple) and not hasattr(result, "_fields")):
+        return len(result)
+    return 0 if result is None or isinstance(result, bool) else 1
+
+
+class MethodStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.rows = 0
+        self.statements = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def as_dict(self, name: str) -> dict:
+        samples = sorted(self.samples)
+        return {
+            "method": name,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(_percentile(samples, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+            "rows": self.rows,
+            "statements": self.statements,
+        }
+
+
+class Profiler:
+
+    def __init__(self):
+        self._stats = {}
+        self._sql = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def instrument(self, db) -> None:
+        """Wraps the public methods of a DatabaseConnection instance and traces its connections."""
+        for name in dir(type(db)):
+            if name.startswith(PROFILED_PREFIXES) and callable(getattr(type(db), name)):
+                setattr(db, name, self._wrap(name, getattr(db, name)))
+
+        db.connection.set_trace_callback(self._trace)
+        db.read_pool.trace_callback = self._trace
+        db.read_pool.close()  # Reopen pooled connections with the trace callback installed
+
+    def _wrap(self, name: str, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            stack.append(name)
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+            self._record(name, elapsed, _row_count(result))
+            return result
+
+        return wrapper
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _trace(self, statement: str) -> None:
+        """sqlite3 trace callback: counts the statement against the innermost profiled method."""
+        stack = self._stack()
+        name = stack[-1] if stack else None
+        sql = " ".join(statement.split())
+        with self._lock:
+            self._sql[sql] = self._sql.get(sql, 0) + 1
+            if name is not None:
+                self._stats.setdefault(name, MethodStats()).statements += 1
+
+    def _record(self, name: str, elapsed: float, rows: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, MethodStats())
+            stats.calls += 1
+            stats.total += elapsed
+            stats.rows += rows
+            stats.samples.append(elapsed)
+
+    def snapshot(self) -> list[dict]:
+        """Returns per-method stats, slowest total first."""
+        with self._lock:
+            results = [stats.as_dict(name) for name, stats in self._stats.items() if stats.calls]
+        return sorted(results, key=lambda value: value["total_ms"], reverse=True)
+
+    def top_statements(self, limit: int = 20) -> list[tuple[str, int]]:
+        """Returns the most frequently executed SQL statements as (sql, count)."""
+        with self._lock:
+            return sorted(self._sql.items(), key=lambda value: value[1], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._sql.clear()
+
+    def dump(self, filepath: str) -> None:
+        with open(filepath, "w") as f:
+            json.dump({"methods": self.snapshot(),
+                       "statements": [{"sql": sql, "count": count} for sql, count in self.top_statements()]},
+                      f, indent=2)
+
+
+def install(db) -> Profiler | None:
+    """Instruments db when profiling is enabled. Returns the Profiler, or None when profiling is off."""
+    if not profiling_enabled():
+        return None
+    profiler = Profiler()
+    profiler.instrument(db)
+    if os.environ.get(PROFILE_OUT_ENV):
+        atexit.register(profiler.dump, os.environ[PROFILE_OUT_ENV])
+    return profiler
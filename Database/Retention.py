@@ -0,0 +1,192 @@
+# Database/Retention.py
+"""
+Retention policy for the Notification table.
+
+Notifications older than max_age_days, and the oldest rows of any role holding more
+than its max_rows_per_role, are removed in chunks of CHUNK_SIZE, each chunk in its
+own short BEGIN IMMEDIATE transaction, with a pause in between so writes from the
+UI are never held up for long. With archive on, each chunk is first copied into
+Notification_Archive.db, which is attached to the job's own connection. Dismissals
+of a removed notification go with it through their foreign key. Freed pages are
+then handed back with PRAGMA incremental_vacuum, a few at a time, on databases
+that enable_incremental_vacuum() has switched over at start-up.
+
+NotificationIDs are handed out in time order, so the age pass only ever looks at
+the oldest CHUNK_SIZE rows, and the row limits are turned into one boundary
+NotificationID per role up front; neither needs an index on TimeStamp.
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from Database.ConnectionPool import configure_writer, BUSY_TIMEOUT_MS
+
+CHUNK_SIZE = 500
+CHUNK_PAUSE = 0.05  # Seconds between chunks, so other writers can take the lock
+VACUUM_PAGES = 256  # Pages freed per incremental_vacuum step
+RETENTION_INTERVAL = 6 * 60 * 60.0  # Seconds between runs of the background job
+STARTUP_DELAY = 60.0  # Seconds after start-up before the first run
+INCREMENTAL = 2  # PRAGMA auto_vacuum value
+
+
+class RetentionPolicy(NamedTuple):
+    max_age_days: int | None = 90  # None keeps notifications of any age
+    max_rows_per_role: int | dict | None = 5000  # One limit for every role, or {RoleName: limit}
+    archive: bool = True  # Copy removed rows to the archive database instead of only deleting them
+
+    @classmethod
+    def from_config(cls, values: dict) -> "RetentionPolicy":
+        """Builds a policy from the notification_retention block of config.json, ignoring unknown keys."""
+        return cls(**{key: value for key, value in values.items() if key in cls._fields})
+
+    def row_limit(self, role: str) -> int | None:
+        if isinstance(self.max_rows_per_role, dict):
+            return self.max_rows_per_role.get(role)
+        return self.max_rows_per_role
+
+
+class RetentionResult(NamedTuple):
+    expired: int  # Removed for being older than max_age_days
+    over_limit: int  # Removed because their role held more than its row limit
+    pages_freed: int
+
+
+class NotificationRetention:
+
+    def __init__(self, db_filepath: str, archive_path: str, policy: RetentionPolicy = RetentionPolicy(),
+                 chunk_size: int = CHUNK_SIZE, chunk_pause: float = CHUNK_PAUSE):
+        self.db_filepath = db_filepath
+        self.archive_path = archive_path
+        self.policy = policy
+        self.chunk_size = chunk_size
+        self.chunk_pause = chunk_pause
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self) -> RetentionResult:
+        """Applies the policy once."""
+        connection = sqlite3.connect(self.db_filepath, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        try:
+            configure_writer(connection)
+            if self.policy.archive:
+                self._attach_archive(connection)
+
+            expired = 0
+            if self.policy.max_age_days is not None:
+                cutoff = str(datetime.now() - timedelta(days=self.policy.max_age_days))
+                expired = self._drain(connection, """SELECT NotificationID FROM
+                    (SELECT NotificationID, TimeStamp FROM main.Notification ORDER BY NotificationID LIMIT ?2)
+                    WHERE TimeStamp < ?1""", (cutoff,))
+
+            over_limit = 0
+            for roleID, boundary in self._role_boundaries(connection):
+                over_limit += self._drain(connection, """SELECT NotificationID FROM main.Notification
+                    WHERE RoleID = ?1 AND NotificationID <= ?2 ORDER BY NotificationID LIMIT ?3""", (roleID, boundary))
+
+            return RetentionResult(expired, over_limit, self._vacuum(connection))
+
+        finally:
+            connection.close()
+
+    def start(self, interval: float = RETENTION_INTERVAL, delay: float = STARTUP_DELAY) -> None:
+        """Runs the policy from a daemon thread, first after delay and then every interval."""
+        if self._thread is not None:
+            return
+
+        def run():
+            wait = delay
+            while not self._stop.wait(wait):
+                try:
+                    self.run()
+                except sqlite3.Error as err:
+                    print(f"Error: {err}")
+                wait = interval
+
+        self._thread = threading.Thread(target=run, name="NotificationRetention", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self, connection: sqlite3.Connection, query: str, params: tuple) -> int:
+        """Removes the NotificationIDs returned by query, chunk_size per transaction. Returns the number removed."""
+        removed = 0
+        while not self._stop.is_set():
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [row[0] for row in connection.execute(query, (*params, self.chunk_size)).fetchall()]
+                if ids:
+                    self._remove(connection, ids)
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                connection.execute("ROLLBACK")
+                raise
+
+            removed += len(ids)
+            if len(ids) < self.chunk_size:
+                break
+            time.sleep(self.chunk_pause)
+        return removed
+
+    def _remove(self, connection: sqlite3.Connection, ids: list) -> None:
+        marks = ", ".join("?" * len(ids))
+        if self.policy.archive:
+            # The two files commit separately in WAL mode; OR IGNORE makes a chunk safe to archive twice
+            connection.execute(f"""INSERT OR IGNORE INTO archive.Notification
+                (NotificationID, RoleID, TimeStamp, NotificationDesc, ArchivedAt)
+                SELECT NotificationID, RoleID, TimeStamp, NotificationDesc, ? FROM main.Notification
+                WHERE NotificationID IN ({marks})""", (int(time.time()), *ids))
+        connection.execute(f"DELETE FROM main.Notification WHERE NotificationID IN ({marks})", ids)
+
+    def _role_boundaries(self, connection: sqlite3.Connection) -> list:
+        """Returns [(RoleID, newest NotificationID past the role's row limit), ...] for the roles over their limit."""
+        boundaries = []
+        for roleID, roleName in connection.execute("SELECT RoleID, RoleName FROM Roles").fetchall():
+            limit = self.policy.row_limit(roleName)
+            if limit is None:
+                continue
+            row = connection.execute("""SELECT NotificationID FROM main.Notification WHERE RoleID = ?
+                ORDER BY NotificationID DESC LIMIT 1 OFFSET ?""", (roleID, limit)).fetchone()
+            if row is not None:
+                boundaries.append((roleID, row[0]))
+        return boundaries
+
+    def _attach_archive(self, connection: sqlite3.Connection) -> None:
+        connection.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+        connection.execute("""CREATE TABLE IF NOT EXISTS archive.Notification (
+            NotificationID INTEGER PRIMARY KEY,
+            RoleID INTEGER NOT NULL,
+            TimeStamp TEXT,
+            NotificationDesc TEXT,
+            ArchivedAt INTEGER NOT NULL)""")
+
+    def _vacuum(self, connection: sqlite3.Connection) -> int:
+        """Returns free pages to the file system, VACUUM_PAGES per statement, if auto_vacuum is INCREMENTAL."""
+        freed = 0
+        if connection.execute("PRAGMA main.auto_vacuum").fetchone()[0] != INCREMENTAL:
+            return freed
+        while not self._stop.is_set():
+            free = connection.execute("PRAGMA main.freelist_count").fetchone()[0]
+            if free == 0:
+                break
+            connection.execute(f"PRAGMA main.incremental_vacuum({VACUUM_PAGES})").fetchall()
+            freed += min(free, VACUUM_PAGES)
+            time.sleep(self.chunk_pause)
+        return freed
+
+
+def enable_incremental_vacuum(connection: sqlite3.Connection) -> bool:
+    """
+    Switches a database created without auto_vacuum to INCREMENTAL, which takes one full VACUUM.
+    Meant for start-up, before anything else has the file open. Returns True if the database was switched.
+    """
+    if connection.execute("PRAGMA main.auto_vacuum").fetchone()[0] == INCREMENTAL:
+        return False
+    connection.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+    connection.execute("VACUUM main")
+    return True
@@ -0,0 +1,90 @@
+# Database/Sequences.py
+"""
+Atomic generation of the PREFIX-YYMMDD-SUFFIX identifiers used for sales orders
+(SALE), shipments (SHIP) and product batches (BATCH).
+
+The Sequences table keeps the last suffix handed out per prefix and day, with
+suffixes counted A=1, B=2, ..., Z=26, AA=27. A reservation is one
+INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, so it runs inside the
+caller's write transaction and two processes can never receive the same suffix.
+"""
+import sqlite3
+from datetime import date
+
+# prefix: (table, column) holding the identifiers, used to seed the sequences
+SEQUENCE_SOURCES = {
+    "SALE": ("Sales", "SaleNo"),
+    "SHIP": ("Shipments", "ShipmentNo"),
+    "BATCH": ("Product_Batch", "PBatchNumber"),
+}
+
+
+def suffix_value(suffix: str) -> int:
+    """Returns the sequence number of an alphabetic suffix, e.g. A -> 1, Z -> 26, AA -> 27"""
+    value = 0
+    for char in suffix:
+        value = value * 26 + ord(char) - 64
+    return value
+
+
+def suffix_letters(value: int) -> str:
+    """Returns the alphabetic suffix of a sequence number, e.g. 1 -> A, 26 -> Z, 27 -> AA"""
+    letters = ""
+    while value > 0:
+        value, remainder = divmod(value - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def today() -> str:
+    return date.today().strftime("%y%m%d")
+
+
+def parse(identifier: str) -> tuple[str, str, int] | None:
+    """Splits 'BATCH-250101-C' into ('BATCH', '250101', 3), or returns None if it is not in that format."""
+    parts = identifier.split("-") if identifier else []
+    if len(parts) != 3 or not parts[1].isdigit() or not parts[2].isalpha() or not parts[2].isupper():
+        return None
+    return parts[0], parts[1], suffix_value(parts[2])
+
+
+def reserve(cursor: sqlite3.Cursor, prefix: str, count: int = 1) -> list[str]:
+    """Hands out the next `count` identifiers for prefix and today's date."""
+    if count < 1:
+        return []
+    day = today()
+    cursor.execute("""INSERT INTO Sequences (Prefix, Day, LastValue) VALUES (?, ?, ?)
+        ON CONFLICT (Prefix, Day) DO UPDATE SET LastValue = LastValue + excluded.LastValue
+        RETURNING LastValue""", (prefix, day, count))
+    last = cursor.fetchone()[0]
+    return [f"{prefix}-{day}-{suffix_letters(value)}" for value in range(last - count + 1, last + 1)]
+
+
+def peek(cursor: sqlite3.Cursor, prefix: str) -> str:
+    """Returns the identifier reserve() would hand out next, without reserving it."""
+    day = today()
+    cursor.execute("SELECT LastValue FROM Sequences WHERE Prefix = ? AND Day = ?", (prefix, day))
+    row = cursor.fetchone()
+    return f"{prefix}-{day}-{suffix_letters((row[0] if row else 0) + 1)}"
+
+
+def claim(cursor: sqlite3.Cursor, identifier: str) -> None:
+    """Moves the sequence past an identifier that was chosen by hand, so it is never handed out again."""
+    parsed = parse(identifier)
+    if parsed is None:
+        return
+    cursor.execute("""INSERT INTO Sequences (Prefix, Day, LastValue) VALUES (?, ?, ?)
+        ON CONFLICT (Prefix, Day) DO UPDATE SET LastValue = MAX(LastValue, excluded.LastValue)""", parsed)
+
+
+def seed(cursor: sqlite3.Cursor) -> None:
+    """Starts every sequence after the highest identifier already stored for its prefix and day."""
+    latest = {}
+    for prefix, (table, column) in SEQUENCE_SOURCES.items():
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {column} LIKE ?", (f"{prefix}-%",))
+        for (identifier,) in cursor.fetchall():
+            if (parsed := parse(identifier)) is not None and parsed[0] == prefix:
+                latest[parsed[:2]] = max(latest.get(parsed[:2], 0), parsed[2])
+    cursor.executemany("""INSERT INTO Sequences (Prefix, Day, LastValue) VALUES (?, ?, ?)
+        ON CONFLICT (Prefix, Day) DO UPDATE SET LastValue = MAX(LastValue, excluded.LastValue)""",
+                       [(prefix, day, value) for (prefix, day), value in latest.items()])
@@ -64,6 +64,7 @@ class DashboardFrame(ttk.Frame):
         top_frame.columnconfigure(2, weight=0)
 
         # Configure Middle Frame and Bottom Frame
+        self.snapshot = self.db_connection.query_dashboard_snapshot()
         self.configure_middle_frame(middle_frame)
         self.configure_bottom_frame(bottom_frame)
 
@@ -89,13 +90,13 @@ class DashboardFrame(ttk.Frame):
         # Left Frame
         ttk.Label(left_frame, text="Sales Activity", font=self.font.get_font("regular4"), foreground="black",
                   bootstyle="inverse-light").grid(row=0, column=0, columnspan= 4, sticky="nw", pady=4, padx=4)
-        self._info_frame(left_frame, column=0, qty=len(self.db_connection.query_SalesOrder()),
+        self._info_frame(left_frame, column=0, qty=self.snapshot.sales_orders_created,
                          qty_style="info", info="Sales Order Created")
-        self._info_frame(left_frame, column=1, qty=len(self.db_connection.query_updatableSalesOrder()),
+        self._info_frame(left_frame, column=1, qty=self.snapshot.sales_orders_pending,
                          qty_style="danger", info="Sales Order Pending")
-        self._info_frame(left_frame, column=2, qty=len(self.db_connection.query_salesOrder_delivered()),
+        self._info_frame(left_frame, column=2, qty=self.snapshot.sales_orders_delivered,
                          qty_style="success", info="Sales Order Delivered")
-        self._info_frame(left_frame, column=3, qty=self.db_connection.query_stock_sold(),
+        self._info_frame(left_frame, column=3, qty=self.snapshot.stock_sold,
                          qty_style="success", info="Stock Sold")
 
         left_frame.rowconfigure(0, weight=0)
@@ -114,7 +115,7 @@ class DashboardFrame(ttk.Frame):
 
         ttk.Label(right_frame, text="QUANTITY IN STOCK", font=self.font.get_font("thin5"), anchor=ttk.W,
                   foreground=self.styleObj.colors.get('dark')).grid(row=1, column=1, sticky="w", padx=4)
-        ttk.Label(right_frame, text=self.db_connection.query_stock_quantity(), font=self.font.get_font("regular4"),
+        ttk.Label(right_frame, text=self.snapshot.stock_quantity, font=self.font.get_font("regular4"),
                   anchor=ttk.E).grid(row=1, column=3, sticky="we", padx=10)
         ttk.Separator(ne_frame, orient="vertical").grid(row=0, column=1, sticky="nse")
 
@@ -128,7 +129,7 @@ class DashboardFrame(ttk.Frame):
 
         ttk.Label(right_frame, text="QUANTITY TO BE RECEIVED", font=self.font.get_font("thin5"), anchor=ttk.W,
                   foreground=self.styleObj.colors.get('dark')).grid(row=2, column=1, sticky="w", padx=4)
-        ttk.Label(right_frame, text=self.db_connection.query_shipment_quantity(), font=self.font.get_font("regular4"),
+        ttk.Label(right_frame, text=self.snapshot.shipment_quantity, font=self.font.get_font("regular4"),
                   anchor=ttk.E).grid(row=2, column=3, sticky="we", padx=10)
         ttk.Separator(se_frame, orient="vertical").grid(row=0, column=1, sticky="nse")
 
@@ -172,7 +173,7 @@ class DashboardFrame(ttk.Frame):
         ttk.Separator(southwest_frame).grid(row=1, column=1, columnspan=2, sticky="nwe")
         ttk.Label(southwest_frame, text="Remaining Tasks", font=self.font.get_font("header5"), anchor=ttk.S,
                   foreground=self.styleObj.colors.get('secondary')).grid(row=2, column=1, sticky="swe")
-        ttk.Label(southwest_frame, text=len(self.db_connection.query_task_updatable()),
+        ttk.Label(southwest_frame, text=self.snapshot.remaining_tasks,
                   font=self.font.get_font("header6"), anchor=ttk.N, foreground=self.styleObj.colors.get("danger")
                   ).grid(row=3, column=1, sticky="nwe")
 
@@ -195,7 +196,7 @@ class DashboardFrame(ttk.Frame):
         ttk.Label(northeast_frame, text="No. 3", font=self.font.get_font("header2"), anchor=ttk.CENTER,
                   foreground=self.styleObj.colors.get('secondary')).grid(row=2, column=5, sticky="nwes")
 
-        for index, detail in enumerate(self.db_connection.query_product_popular(), start=1):
+        for index, detail in enumerate(self.snapshot.top_selling, start=1):
             ttk.Label(northeast_frame, text=detail[0], font=self.font.get_font("thin2"),
                       foreground=self.styleObj.colors.get("dark")).grid(row=3, column=2*index-1)
             ttk.Label(northeast_frame, text=detail[1], font=self.font.get_font("thin2"),
@@ -226,11 +227,11 @@ class DashboardFrame(ttk.Frame):
         ttk.Label(southeast_frame, text="Purchase Activity", font=self.font.get_font("regular4"), foreground="black",
                   anchor=ttk.W, bootstyle="inverse-light").grid(row=0, column=1, columnspan=4, sticky="nwes", pady=0)
 
-        parameters = self.db_connection.query_purchaseOrder_dashboard()
-        self._info_frame(southeast_frame, 1, parameters[0], "primary", "Purchase Order Created")
-        self._info_frame(southeast_frame, 2, parameters[1], "danger", "Purchase Order In Transit")
-        self._info_frame(southeast_frame, 3, parameters[2], "success", "Purchase Order Received")
-        self._info_frame(southeast_frame, 4, parameters[3], "primary", "Stock Purchased")
+        snapshot = self.snapshot
+        self._info_frame(southeast_frame, 1, snapshot.purchase_orders_created, "primary", "Purchase Order Created")
+        self._info_frame(southeast_frame, 2, snapshot.purchase_orders_in_transit, "danger", "Purchase Order In Transit")
+        self._info_frame(southeast_frame, 3, snapshot.purchase_orders_received, "success", "Purchase Order Received")
+        self._info_frame(southeast_frame, 4, snapshot.stock_purchased, "primary", "Stock Purchased")
 
         southeast_frame.rowconfigure(0, weight=1)
         southeast_frame.rowconfigure(1, weight=1)
@@ -240,7 +241,7 @@ class DashboardFrame(ttk.Frame):
         southeast_frame.columnconfigure(4, weight=1)
 
     def _product_details_frame(self, west_frame):
-        parameters = self.db_connection.query_product_dashboard()
+        snapshot = self.snapshot
         ttk.Label(west_frame, text="Product Details", font=self.font.get_font("header4"), foreground="black",
                   anchor=ttk.W).grid(row=0, column=1, columnspan=2, sticky="nwes")
         ttk.Separator(west_frame).grid(row=1, column=1, columnspan=2, sticky="nwe")
@@ -254,13 +255,13 @@ class DashboardFrame(ttk.Frame):
                   foreground="black").grid(row=2, column=0, sticky="w")
         ttk.Label(left_frame, text="Products Out Of Stock", font=self.font.get_font("thin2"), anchor=ttk.W,
                   foreground=self.styleObj.colors.get("danger")).grid(row=3, column=0, sticky="w")
-        ttk.Label(left_frame, text=parameters[0], font=self.font.get_font("thin2"), anchor=ttk.E,
+        ttk.Label(left_frame, text=snapshot.low_stock_items, font=self.font.get_font("thin2"), anchor=ttk.E,
                   foreground=self.styleObj.colors.get('danger')).grid(row=0, column=0, sticky="e")
-        ttk.Label(left_frame, text=parameters[1], font=self.font.get_font("thin2"), anchor=ttk.E,
+        ttk.Label(left_frame, text=snapshot.product_categories, font=self.font.get_font("thin2"), anchor=ttk.E,
                   foreground="black").grid(row=1, column=0, sticky="e")
-        ttk.Label(left_frame, text=parameters[2], font=self.font.get_font("thin2"), anchor=ttk.E,
+        ttk.Label(left_frame, text=snapshot.product_types, font=self.font.get_font("thin2"), anchor=ttk.E,
                   foreground="black").grid(row=2, column=0, sticky="e")
-        ttk.Label(left_frame, text=parameters[3], font=self.font.get_font("thin2"), anchor=ttk.E,
+        ttk.Label(left_frame, text=snapshot.out_of_stock_items, font=self.font.get_font("thin2"), anchor=ttk.E,
                   foreground=self.styleObj.colors.get('danger')).grid(row=3, column=0, sticky="e")
         left_frame.rowconfigure(0, weight=1)
         left_frame.rowconfigure(1, weight=1)
@@ -271,13 +272,12 @@ class DashboardFrame(ttk.Frame):
         right_frame.grid(row=2, column=2)
         ttk.Label(right_frame, text="Active Products", font=self.font.get_font("thin3"), anchor=ttk.CENTER,
                   foreground=self.styleObj.colors.get("dark")).grid(row=0, column=0, sticky="we")
-        parameters = self.db_connection.query_product_meter()
-        print(parameters)
-        ttk.Meter(right_frame, amounttotal=parameters[0] if parameters[0] else 1, amountused=parameters[1],
+        product_types = snapshot.product_types
+        ttk.Meter(right_frame, amounttotal=product_types if product_types else 1, amountused=snapshot.products_in_stock,
                   bootstyle="success",
-                  meterthickness=15, stripethickness=int(360 / int(parameters[0])) if parameters[0] else 1,
+                  meterthickness=15, stripethickness=int(360 / int(product_types)) if product_types else 1,
                   metersize=200,
-                  textfont=self.font.get_font("header5"), subtext="Products In Stock", textright=f"/{parameters[0]}",
+                  textfont=self.font.get_font("header5"), subtext="Products In Stock", textright=f"/{product_types}",
                   subtextfont=self.font.get_font("thin6")).grid(row=1, column=0, sticky="nwes")
         right_frame.rowconfigure(0, weight=1)
         right_frame.rowconfigure(1, weight=1)
@@ -11,6 +11,7 @@ class inventoryFrame(pageFrame):
     Inventory page with Receive / Update / Delete actions.
     This version fixes Worker-side Update validation/submit and hardens comboboxes.
     """
+    SORT_COLUMNS = {0: "id", 4: "quantity"}
 
     def __init__(self, master: ttk.Window, role: str, employeeID: int) -> None:
         super().__init__(master=master,
@@ -30,7 +31,7 @@ class inventoryFrame(pageFrame):
         for name in colNames:
             self._insert_table_columns(name)
 
-        self._load_table_rows(self.db_connection.query_inventory_table())
+        self._load_table_pages(self.db_connection.query_inventory_page)
 
     def getButtonCommand(self, button_text):
         if button_text == "Receive":
@@ -62,7 +63,7 @@ class inventoryFrame(pageFrame):
             try:
                 ok = self.db_connection.update_purchaseOrder_receive(top.stringVar[0].get())
                 if ok:
-                    self._load_table_rows(self.db_connection.query_inventory_table())
+                    self._load_table_pages(self.db_connection.query_inventory_page)
                     popup.infoPopup(self, "Shipment received.")
                     top.destroy()
                 else:
@@ -186,7 +187,7 @@ class inventoryFrame(pageFrame):
             try:
                 ok = self.db_connection.update_inventory(product_no, batch_no, src_id, des_id, qty)
                 if ok:
-                    self._load_table_rows(self.db_connection.query_inventory_table())
+                    self._load_table_pages(self.db_connection.query_inventory_page)
                     popup.infoPopup(self, "Inventory updated.")
                     top.destroy()
                 else:
@@ -261,7 +262,7 @@ class inventoryFrame(pageFrame):
             try:
                 ok = self.db_connection.delete_inventory(int(inv_id))
                 if ok:
-                    self._load_table_rows(self.db_connection.query_inventory_table())
+                    self._load_table_pages(self.db_connection.query_inventory_page)
                     popup.infoPopup(self, "Inventory deleted.")
                     top.destroy()
                 else:
@@ -16,7 +16,8 @@ from Frames.settingsPopup import SettingsPopup
 from Frames.dashboardFrame import DashboardFrame
 from Frames.reportsFrame import ReportFrame
 from Frames.accountSetupDialog import AccountSetupDialog
-from Frames.loggingFrame import LoggingFrame 
+from Frames.loggingFrame import LoggingFrame
+from Frames.profilingFrame import ProfilingFrame
 
 
 
@@ -44,19 +45,14 @@ class navigationFrame(ttk.Frame):
         # Menu by role name from Roles table
         buttonConfig = {
             "Worker": ["Dashboard", "Inventory", "Report", "Tasks"],
-<<<<<<< HEAD
             "Supervisor": [
                 "Dashboard", "Product", "Inventory", "Purchase Order",
                 "Sales Order", "Tasks", "Vendor", "Report", "Logging & Analytics"
             ],
             "Administrator": [
                 "Dashboard", "Product", "Inventory", "Purchase Order",
-                "Sales Order", "Vendor", "Report", "Logging & Analytics", "Add Worker"
+                "Sales Order", "Vendor", "Report", "Logging & Analytics", "Add Worker", "Logging", "Profiling"
             ]
-=======
-            "Supervisor": ["Dashboard", "Product", "Inventory", "Purchase Order", "Sales Order", "Tasks", "Vendor", "Report"],
-            "Administrator": ["Dashboard", "Product", "Inventory", "Purchase Order", "Sales Order", "Vendor", "Report", "Add Worker", "Logging"]
->>>>>>> dfcd0630c26e219a7187e71cd49a3531ad29663d
         }
         if self.role not in buttonConfig:
             self.role = "Worker"
@@ -193,7 +189,8 @@ class navigationFrame(ttk.Frame):
             "Tasks": taskFrame,
             "Vendor": vendorFrame,
             "Report": ReportFrame,
-            "Logging": LoggingFrame
+            "Logging": LoggingFrame,
+            "Profiling": ProfilingFrame
         }
         if text in mapping:
             self._show_page(mapping[text])
@@ -6,6 +6,9 @@ from configuration import Configuration
 from Database import Notification
 from datetime import datetime
 
+PAGE_SIZE = 50
+REFRESH_MS = 5000  # How often an open feed checks for new notifications
+
 
 class notificationFrame(ttk.Frame):
 
@@ -16,6 +19,10 @@ class notificationFrame(ttk.Frame):
         self.styleObj = ttk.style.Style.get_instance()
         self.config = Configuration()
         self.notif = Notification(employee_id)
+        self._newest_id = self._oldest_id = None
+        self._cards = []  # [(NotificationID, frame)] newest first
+        self._moreButton = None
+        self._refreshJob = None
         graphicsPath = self.config.getGraphicsPath()
         self.icon = Image.open(f'{graphicsPath}/notificationIcon.png').resize((40, 40))
         self.icon = ImageTk.PhotoImage(image=self.icon)
@@ -33,7 +40,8 @@ class notificationFrame(ttk.Frame):
         bottomFrame.configure(style="TFrame", padding=10)
         lSeparator = ttk.Separator(self, bootstyle="dark", orient="vertical")
 
-        notification = ttk.Label(topFrame, bootstyle="inverse-warning", text="Notifications", anchor="center", font=self.Fonts.get_font("regular"), foreground="black")
+        self.notificationLabel = ttk.Label(topFrame, bootstyle="inverse-warning", anchor="center",
+                                           font=self.Fonts.get_font("regular"), foreground="black")
         notificationButton = ttk.Button(topFrame, image=self.icon, bootstyle="warning", command=lambda: self.destroy())
         bSeparator = ttk.Separator(topFrame, bootstyle="dark")
 
@@ -48,7 +56,7 @@ class notificationFrame(ttk.Frame):
         self.columnconfigure(1, weight=1)
 
         # Top Frame Widgets
-        notification.grid(row=0, column=0, sticky="nwes")
+        self.notificationLabel.grid(row=0, column=0, sticky="nwes")
         notificationButton.grid(row=0, column=1, sticky="nwes")
         bSeparator.grid(row=1, column=0, columnspan=2, sticky="wes")
 
@@ -59,56 +67,109 @@ class notificationFrame(ttk.Frame):
 
         # Bottom Frame Widgets
         self.configure_bottomFrame(bottomFrame)
+        self._refreshJob = self.after(REFRESH_MS, self._refresh, bottomFrame)
 
     def configure_bottomFrame(self, bottomFrame):
-        for child in bottomFrame.winfo_children():
-            child.destroy()
-        bottomFrame.grid_forget()
-
-        notifications = self.notif.get_notifications()
-        for i, notification in enumerate(
-                sorted(notifications, key=lambda x: datetime.strptime(x[1], "%Y-%m-%d %H:%M:%S.%f"))):
-            # Create a frame for each notification
-            frame = ttk.Frame(bottomFrame, bootstyle="light", relief="ridge", padding=2)
-            frame.grid(row=i, column=1, sticky="nwes", pady=2)
-
-            # Convert Timestamp
-            timestamp = datetime.strptime(notification[1], "%Y-%m-%d %H:%M:%S.%f")
-            if (timestamp - datetime.today()).days >= 1:
-                timestamp = timestamp.strftime("%A, %dth %B")
-            else:
-                timestamp = timestamp.strftime("%H:%M:%S")
-
-            # Configure Labels
-            ttk.Label(frame, text=f"Notification {notification[0]}", font=self.Fonts.get_font("thin4"), anchor=ttk.NW,
-                      bootstyle="inverse-light", foreground=self.styleObj.colors.get("dark")).grid(
-                row=0, column=1, sticky="nwes")
-            self.styleObj.configure("grey.secondary.TButton", background=self.styleObj.colors.get("light"),
-                                    borderwidth=0)
-            ttk.Button(frame, image=self.xButton, style="grey.secondary.TButton",
-                       command=lambda x=bottomFrame, y=notification[0]: self._xButton(x, y)).grid(
-                       row=0, column=2, sticky="ne")
-            ttk.Label(frame, text=notification[2], font=self.Fonts.get_font("thin2"), anchor=ttk.CENTER,
-                      bootstyle="inverse-light", foreground="black", wraplength=240).grid(
-                      row=1, column=1, columnspan=2, sticky="nwes")
-            ttk.Label(frame, text=timestamp, font=self.Fonts.get_font("thin4"), anchor=ttk.NE,
-                      bootstyle="inverse-light", foreground=self.styleObj.colors.get("dark")).grid(
-                      row=2, column=2, sticky="nwes")
-
-            frame.rowconfigure(1, weight=1)
-            frame.columnconfigure(1, weight=1)
-            frame.columnconfigure(2, weight=1)
-
-            bottomFrame.rowconfigure(i, weight=1)
+        self._load_page(bottomFrame)
+        self._mark_seen()
         ttk.Frame(bottomFrame, width=8).grid(row=0, column=2)
         bottomFrame.columnconfigure(0, weight=0)
         bottomFrame.columnconfigure(1, weight=1)
 
         bottomFrame.grid(row=1, column=1, sticky="nwes")
 
+    def _mark_seen(self):
+        if self._newest_id is not None:
+            self.notif.mark_seen(self._newest_id)
+        unread = self.notif.unread_count()
+        self.notificationLabel.configure(text=f"Notifications ({unread} new)" if unread else "Notifications")
+
+    def _refresh(self, bottomFrame):
+        """Adds the notifications that arrived since the newest one shown, leaving the others in place."""
+        notifications = self.notif.get_notifications(after_id=self._newest_id or 0)
+        if notifications:
+            self._newest_id = notifications[0][0]
+            if self._oldest_id is None:
+                self._oldest_id = notifications[-1][0]
+            self._cards[:0] = [(notification[0], self._add_notification(bottomFrame, notification))
+                               for notification in notifications]
+            self._grid_cards(bottomFrame)
+            self._mark_seen()
+        self._refreshJob = self.after(REFRESH_MS, self._refresh, bottomFrame)
+
+    def _grid_cards(self, bottomFrame, start=0):
+        """Places the cards from index start on, with "Show older" below them."""
+        for row, (_, frame) in enumerate(self._cards[start:], start):
+            frame.grid(row=row, column=1, sticky="nwes", pady=2)
+            bottomFrame.rowconfigure(row, weight=1)
+        bottomFrame.rowconfigure(len(self._cards), weight=0)
+        if self._moreButton is not None:
+            self._moreButton.grid(row=len(self._cards), column=1, sticky="we", pady=2)
+
+    def _load_page(self, bottomFrame):
+        """Appends the next page of older notifications, newest first."""
+        if self._moreButton is not None:
+            self._moreButton.destroy()
+            self._moreButton = None
+
+        notifications = self.notif.get_notifications(limit=PAGE_SIZE, before_id=self._oldest_id)
+        start = len(self._cards)
+        self._cards += [(notification[0], self._add_notification(bottomFrame, notification))
+                        for notification in notifications]
+        if notifications:
+            if self._newest_id is None:
+                self._newest_id = notifications[0][0]
+            self._oldest_id = notifications[-1][0]
+        if len(notifications) == PAGE_SIZE:
+            self._moreButton = ttk.Button(bottomFrame, text="Show older", bootstyle="secondary-link",
+                                          command=lambda: self._load_page(bottomFrame))
+        self._grid_cards(bottomFrame, start)
+
+    def _add_notification(self, bottomFrame, notification):
+        """Returns the card of a notification, placed by _grid_cards."""
+        frame = ttk.Frame(bottomFrame, bootstyle="light", relief="ridge", padding=2)
+
+        # Convert Timestamp
+        timestamp = datetime.strptime(notification[1], "%Y-%m-%d %H:%M:%S.%f")
+        if (timestamp - datetime.today()).days >= 1:
+            timestamp = timestamp.strftime("%A, %dth %B")
+        else:
+            timestamp = timestamp.strftime("%H:%M:%S")
+
+        # Configure Labels
+        ttk.Label(frame, text=f"Notification {notification[0]}", font=self.Fonts.get_font("thin4"), anchor=ttk.NW,
+                  bootstyle="inverse-light", foreground=self.styleObj.colors.get("dark")).grid(
+            row=0, column=1, sticky="nwes")
+        self.styleObj.configure("grey.secondary.TButton", background=self.styleObj.colors.get("light"),
+                                borderwidth=0)
+        ttk.Button(frame, image=self.xButton, style="grey.secondary.TButton",
+                   command=lambda x=bottomFrame, y=notification[0]: self._xButton(x, y)).grid(
+                   row=0, column=2, sticky="ne")
+        ttk.Label(frame, text=notification[2], font=self.Fonts.get_font("thin2"), anchor=ttk.CENTER,
+                  bootstyle="inverse-light", foreground="black", wraplength=240).grid(
+                  row=1, column=1, columnspan=2, sticky="nwes")
+        ttk.Label(frame, text=timestamp, font=self.Fonts.get_font("thin4"), anchor=ttk.NE,
+                  bootstyle="inverse-light", foreground=self.styleObj.colors.get("dark")).grid(
+                  row=2, column=2, sticky="nwes")
+
+        frame.rowconfigure(1, weight=1)
+        frame.columnconfigure(1, weight=1)
+        frame.columnconfigure(2, weight=1)
+        return frame
+
     def _xButton(self, bottomFrame, notification_id):
-        self.config.writeNotificationExclusions(self.employee_id, notification_id)
-        self.configure_bottomFrame(bottomFrame)
+        self.notif.exclude_notification(notification_id)
+        for index, (card_id, frame) in enumerate(self._cards):
+            if card_id == notification_id:
+                frame.destroy()
+                del self._cards[index]
+                self._grid_cards(bottomFrame, index)
+                break
+
+    def destroy(self):
+        if self._refreshJob is not None:
+            self.after_cancel(self._refreshJob)
+        super().destroy()
 
     def placeNotificationFrame(self):
         #print("Place called")
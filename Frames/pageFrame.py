@@ -1,14 +1,57 @@
 from abc import ABC, abstractmethod
 from utils import *
 import ttkbootstrap as ttk
-from ttkbootstrap.tableview import Tableview
+from ttkbootstrap.tableview import Tableview, ASCENDING, DESCENDING
+from ttkbootstrap.dialogs import Messagebox
+from tkinter import filedialog
 from PIL import Image, ImageTk
 
 from Frames.notificationFrame import notificationFrame
 from configuration import Configuration
 
+WINDOW_PAGES = 3  # Pages held in the table at once in virtual table mode
+
+
+class pageTableview(Tableview):
+    """
+    Tableview that hands searching and sorting to its pageFrame in virtual table mode, so they run in SQL
+    over every row instead of over the rows currently loaded.
+    """
+    pager = None  # The pageFrame while it is in virtual table mode
+
+    def _search_table_data(self, event):
+        if self.pager is None:
+            return super()._search_table_data(event)
+        self.pager._search_pages(self.searchcriteria)
+
+    def sort_column_data(self, event=None, cid=None, sort=None):
+        if self.pager is None:
+            return super().sort_column_data(event, cid, sort)
+        if event is not None:
+            column = self._get_event_objects(event).column
+        elif cid is not None:
+            column = self.cidmap.get(int(cid))
+        else:
+            return
+        descending = self.pager._sort_pages(column.tableindex, None if sort is None else sort == DESCENDING)
+        if descending is None:  # The column has no sort key
+            return
+        # Like Tableview, columnsort holds the direction of the next click
+        self._column_sort_header_reset()
+        column.columnsort = ASCENDING if descending else DESCENDING
+        self._column_sort_header_update(column.cid)
+
+    def reset_table(self):
+        if self.pager is None:
+            return super().reset_table()
+        self.searchcriteria = ""
+        self._column_sort_header_reset()
+        self.pager._reset_pages()
+
 
 class pageFrame(ttk.Frame, ABC):
+    # {column index: sort key of the query_page} of the columns sorted in SQL in virtual table mode
+    SORT_COLUMNS = {}
 
     def __init__(self, master: ttk.Window, title: str, button_config: dict, role: str, employeeID: int) -> None:
         """
@@ -71,7 +114,7 @@ class pageFrame(ttk.Frame, ABC):
         topFrame.columnconfigure(2, weight=0)
 
         # Bottom Frame Widgets
-        self.tableview = Tableview(
+        self.tableview = pageTableview(
             master=bottomFrame,
             searchable=True,
             stripecolor=(self.styleObj.theme.colors.get("light"), None),
@@ -80,9 +123,17 @@ class pageFrame(ttk.Frame, ABC):
         )
         self.tableview.grid(row=1, column=1, sticky="nwes")
 
-        y_scrollbar = ttk.Scrollbar(bottomFrame, orient="vertical", command=self.tableview.winfo_children()[1].yview,
-                                    bootstyle="secondary-round")
-        y_scrollbar.grid(row=1, column=2, sticky="ns")
+        # Virtual table mode state, see _load_table_pages
+        self._query_page = None
+        self._sort_key, self._descending, self._search = "id", False, None
+        self._page_cursors = []  # `after` of every page found so far, None for the first
+        self._window = []  # (page number, rows) of the pages in the table
+        self._page_pending = False
+
+        self.y_scrollbar = ttk.Scrollbar(bottomFrame, orient="vertical", command=self.tableview.view.yview,
+                                         bootstyle="secondary-round")
+        self.y_scrollbar.grid(row=1, column=2, sticky="ns")
+        self.tableview.view.configure(yscrollcommand=self._on_table_scroll)
 
         bottomFrame.rowconfigure(1, weight=1)
         bottomFrame.columnconfigure(1, weight=1)
@@ -113,11 +164,112 @@ class pageFrame(ttk.Frame, ABC):
         )
 
     def _load_table_rows(self, rowList: list) -> None:
+        self._query_page = None
+        self.tableview.pager = None
+        self._fill_table(rowList)
+
+    def _fill_table(self, rowList: list) -> None:
         self.tableview.delete_rows()
         for list in rowList:
             self.tableview.insert_row('end', list)
         self.tableview.load_table_data()
 
+    def _load_table_pages(self, query_page) -> None:
+        """
+        Virtual table mode. Pages are fetched with query_page(after, sort_key=, descending=, search=) -> Page
+        as the view is scrolled, and only WINDOW_PAGES of them are held in the table at once.
+        The search box and the headers of SORT_COLUMNS query the database; reloading keeps their search and sort.
+        """
+        self._query_page = query_page
+        self.tableview.pager = self
+        self._show_first_page()
+
+    def _fetch_page(self, number: int) -> list:
+        page = self._query_page(self._page_cursors[number], sort_key=self._sort_key, descending=self._descending,
+                                search=self._search)
+        if page.cursor is not None and number + 1 == len(self._page_cursors):
+            self._page_cursors.append(page.cursor)
+        return page.rows
+
+    def _show_first_page(self) -> None:
+        self._page_cursors = [None]
+        self._window = [(0, self._fetch_page(0))]
+        self._fill_table(self._window[0][1])
+        self.tableview.view.yview_moveto(0)
+
+    def _slide_window(self, step: int) -> None:
+        """Loads the page after (step 1) or before (step -1) the window, dropping the page at the other end."""
+        self._page_pending = False
+        number = self._window[-1][0] + 1 if step > 0 else self._window[0][0] - 1
+        if self._query_page is None or not 0 <= number < len(self._page_cursors):
+            return
+        view = self.tableview.view
+        top = round(float(view.yview()[0]) * sum(len(rows) for _, rows in self._window))
+        if step > 0:
+            self._window.append((number, self._fetch_page(number)))
+            if len(self._window) > WINDOW_PAGES:
+                top -= len(self._window.pop(0)[1])
+        else:
+            self._window.insert(0, (number, self._fetch_page(number)))
+            top += len(self._window[0][1])
+            if len(self._window) > WINDOW_PAGES:
+                self._window.pop()
+
+        # Keep the rows that were in view where they were
+        self._fill_table([row for _, rows in self._window for row in rows])
+        view.yview_moveto(0)
+        view.yview_scroll(top, "units")
+
+    def _search_pages(self, text: str) -> None:
+        self._search = text or None
+        self._show_first_page()
+
+    def _sort_pages(self, column: int, descending: bool = None):
+        """Sorts by the key of the column, reversing it if it is already sorted by. Returns descending, or None."""
+        sort_key = self.SORT_COLUMNS.get(column)
+        if sort_key is None:
+            return None
+        if descending is None:
+            descending = sort_key == self._sort_key and not self._descending
+        self._sort_key, self._descending = sort_key, descending
+        self._show_first_page()
+        return descending
+
+    def _reset_pages(self) -> None:
+        self._sort_key, self._descending, self._search = "id", False, None
+        self._show_first_page()
+
+    def _on_table_scroll(self, first: str, last: str) -> None:
+        self.y_scrollbar.set(first, last)
+        if self._query_page is None or self._page_pending:
+            return
+        if float(last) >= 0.9 and self._window[-1][0] + 1 < len(self._page_cursors):
+            self._page_pending = True
+            self.after_idle(self._slide_window, 1)
+        elif float(first) <= 0.1 and self._window[0][0] > 0:
+            self._page_pending = True
+            self.after_idle(self._slide_window, -1)
+
+    def _import_file(self, import_method, reload) -> None:
+        """Runs a BulkImporter method on a file picked by the user, then reports the outcome and reloads the table."""
+        filepath = filedialog.askopenfilename(parent=self, title="Import",
+                                              filetypes=[("CSV / JSON", "*.csv *.json *.jsonl")])
+        if not filepath:
+            return
+        try:
+            result = import_method(filepath)
+        except (OSError, ValueError) as err:
+            Messagebox.show_error(f"Could not read {filepath}:\n{err}", "Import", parent=self)
+            return
+
+        message = f"{result.imported} rows imported, {len(result.errors)} rejected."
+        if result.errors:
+            message += "\n\n" + "\n".join(f"Row {error.row}: {error.message}" for error in result.errors[:10])
+            if len(result.errors) > 10:
+                message += f"\n... and {len(result.errors) - 10} more"
+        Messagebox.show_info(message, "Import", parent=self)
+        reload()
+
     @abstractmethod
     def getButtonCommand(self, button_text):
         pass
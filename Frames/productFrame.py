@@ -1,5 +1,6 @@
 from Frames.pageFrame import *
 from Database import DatabaseConnection, Notification
+from Database.BulkImport import BulkImporter
 
 from Frames.popup import popup
 
@@ -14,7 +15,7 @@ class productFrame(pageFrame):
                          role=role,
                          button_config={
                              "Supervisor": ["Create", "Update", "Delete"],
-                             "Administrator": ["Create", "Update", "Delete"]
+                             "Administrator": ["Create", "Update", "Delete", "Import"]
                          },
                          employeeID=employeeID)
 
@@ -39,6 +40,10 @@ class productFrame(pageFrame):
         elif button_text == "Delete":
             self.deletePopup()
 
+        elif button_text == "Import":
+            self._import_file(BulkImporter(self.db_connection).import_products,
+                              lambda: self._load_table_rows(self.db_connection.query_product_table()))
+
     def createPopup(self):
         # Database Query
         vendors = [f"{vendorID} - {vendorName}" for vendorID, vendorName in self.db_connection.query_vendor()]
@@ -0,0 +1,71 @@
+import ttkbootstrap as ttk
+from ttkbootstrap.dialogs import Messagebox
+from tkinter import filedialog
+from Database.Database import DatabaseConnection
+from Database.Profiler import PROFILE_ENV
+
+
+class ProfilingFrame(ttk.Frame):
+    """
+    Admin-only: per-method database timings collected by Database/Profiler.py.
+    Columns: Method, Calls, Total (ms), Mean (ms), p50 (ms), p95 (ms), Rows, Statements
+    """
+    def __init__(self, master: ttk.window.Window, role: str, employeeID: int):
+        super().__init__(master, padding=10)
+        self.role = role
+        self.employeeID = employeeID
+        self.db = DatabaseConnection()
+
+        if str(self.role).lower() != "administrator":
+            ttk.Label(self, text="Access denied.", bootstyle="danger").grid()
+            return
+
+        if self.db.profiler is None:
+            ttk.Label(self, text=f"Profiling is off. Start the application with {PROFILE_ENV}=1 to collect timings.",
+                      bootstyle="secondary").grid(row=0, column=0, sticky="nw")
+            return
+
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, sticky="ew", pady=(0, 8))
+        ttk.Button(toolbar, text="Refresh", bootstyle="info", command=self._refresh).grid(row=0, column=0, padx=4)
+        ttk.Button(toolbar, text="Reset", bootstyle="secondary", command=self._reset).grid(row=0, column=1, padx=4)
+        ttk.Button(toolbar, text="Export JSON", bootstyle="secondary", command=self._export).grid(row=0, column=2, padx=4)
+
+        # table
+        self.keys = ("method", "calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "rows", "statements")
+        cols = ("Method", "Calls", "Total (ms)", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Rows", "Statements")
+        self.table = ttk.Treeview(self, columns=cols, show="headings", height=18)
+        widths = [260, 80, 110, 100, 100, 100, 90, 100]
+        for c, w in zip(cols, widths):
+            self.table.heading(c, text=c)
+            self.table.column(c, width=w, anchor="w" if c == "Method" else "e")
+        self.table.grid(row=1, column=0, sticky="nsew")
+
+        yscroll = ttk.Scrollbar(self, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=yscroll.set)
+        yscroll.grid(row=1, column=1, sticky="ns")
+
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self._refresh()
+
+    def _refresh(self):
+        for i in self.table.get_children():
+            self.table.delete(i)
+        for stats in self.db.profiler.snapshot():
+            self.table.insert("", "end", values=[stats[key] for key in self.keys])
+
+    def _reset(self):
+        self.db.profiler.reset()
+        self._refresh()
+
+    def _export(self):
+        filepath = filedialog.asksaveasfilename(parent=self, title="Export Profile", defaultextension=".json",
+                                                filetypes=[("JSON", "*.json")])
+        if not filepath:
+            return
+        try:
+            self.db.profiler.dump(filepath)
+        except OSError as e:
+            Messagebox.show_error(f"Failed to export profile:\n{e}", "Profiling")
@@ -1,8 +1,10 @@
 from Frames.pageFrame import *
 from Frames.popup import popup
+from Database.BulkImport import BulkImporter
 
 
 class purchaseOrderFrame(pageFrame):
+    SORT_COLUMNS = {0: "purchase", 5: "date", 6: "status"}
 
     def __init__(self, master: ttk.Window, role: str, employeeID: int) -> None:
 
@@ -12,7 +14,7 @@ class purchaseOrderFrame(pageFrame):
                          role=role,
                          button_config={
                              "Supervisor": ["Create", "Update", "Delete"],
-                             "Administrator": ["Create", "Update", "Delete"]
+                             "Administrator": ["Create", "Update", "Delete", "Import"]
                          },
                          employeeID=employeeID)
 
@@ -21,7 +23,7 @@ class purchaseOrderFrame(pageFrame):
         self._insert_table_headings(colNames)
 
         self.db_connection = DatabaseConnection()
-        self._load_table_rows(self.db_connection.query_purchaseOrder())
+        self._load_table_pages(self.db_connection.query_purchaseOrder_page)
 
     def _insert_table_headings(self, colNames:list) -> None:
         for name in colNames:
@@ -36,10 +38,15 @@ class purchaseOrderFrame(pageFrame):
 
         elif button_text == "Delete":
             self.deletePopup()
+
+        elif button_text == "Import":
+            self._import_file(BulkImporter(self.db_connection).import_purchaseOrders,
+                              lambda: self._load_table_pages(self.db_connection.query_purchaseOrder_page))
+
     def createPopup(self):
 
         # Creates Popup
-        toplevel = popup(master=self.masterWindow, title="Create Purchase Order", entryFieldQty=5, load_table_callback=self._load_table_rows(self.db_connection.query_purchaseOrder()))
+        toplevel = popup(master=self.masterWindow, title="Create Purchase Order", entryFieldQty=5, load_table_callback=lambda: self._load_table_pages(self.db_connection.query_purchaseOrder_page))
 
         def onProductEntry(*args, **kwargs):
             #print(f"Value: {toplevel.stringVar[0].get()}\nOptions: {[f'{ID} - {NAME}' for ID, NAME, DESC in self.db_connection.query_product()]}")
@@ -74,7 +81,7 @@ class purchaseOrderFrame(pageFrame):
             if not self.db_connection.add_purchaseOrder(*parameters):
                 toplevel.errVar[-1].set("Submission failed to process.")
             else:
-                self._load_table_rows(self.db_connection.query_purchaseOrder())
+                self._load_table_pages(self.db_connection.query_purchaseOrder_page)
                 toplevel.destroy()
 
         def productPostCommand():
@@ -145,7 +152,7 @@ class purchaseOrderFrame(pageFrame):
 
         # Creates Popup
         toplevel = popup(master=self.masterWindow, title="Create Purchase Order", entryFieldQty=7,
-                         load_table_callback=self._load_table_rows(self.db_connection.query_purchaseOrder()))
+                         load_table_callback=lambda: self._load_table_pages(self.db_connection.query_purchaseOrder_page))
 
         def onProductEntry(*args, **kwargs):
             # print(f"Value: {toplevel.stringVar[0].get()}\nOptions: {[f'{ID} - {NAME}' for ID, NAME, DESC in self.db_connection.query_product()]}")
@@ -186,7 +193,7 @@ class purchaseOrderFrame(pageFrame):
             if not self.db_connection.update_purchaseOrder(*parameters):
                 toplevel.errVar[-1].set("Submission failed to process.")
             else:
-                self._load_table_rows(self.db_connection.query_purchaseOrder())
+                self._load_table_pages(self.db_connection.query_purchaseOrder_page)
                 toplevel.destroy()
 
         def productPostCommand():
@@ -261,7 +268,7 @@ class purchaseOrderFrame(pageFrame):
             return
         if popup.deleteDialog(self) == "OK":
             if self.db_connection.delete_purchaseOrder(rowDetails[0]):
-                self._load_table_rows(self.db_connection.query_purchaseOrder())
+                self._load_table_pages(self.db_connection.query_purchaseOrder_page)
             else:
                 popup.deleteFail(self)
 
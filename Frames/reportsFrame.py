@@ -19,6 +19,8 @@ from Frames.pageFrame import pageFrame
 from Database import DatabaseConnection
 from utils import previewText
 
+UA_ROW_LIMIT = 1000  # User activities loaded at a time; "Load more" fetches the next ones
+
 
 class ReportFrame(pageFrame):
     def __init__(self, master: ttk.window.Window, role: str, employee_id: int):
@@ -47,6 +49,11 @@ class ReportFrame(pageFrame):
         self._ua_all_rows = None
         self._ua_filter_frame: ttk.Frame | None = None
         self._ua_filter_var = ttk.StringVar(value="All")
+        self._ua_worker_var = ttk.StringVar(value="All users")
+        self._ua_activity_var = ttk.StringVar(value="All activities")
+        self._ua_rows = []  # Live rows loaded so far for the current filters
+        self._ua_status: ttk.Label | None = None
+        self._ua_more_button: ttk.Button | None = None
 
         self.product_movement_report()
 
@@ -88,9 +95,11 @@ class ReportFrame(pageFrame):
         if batch_number is None:
             return
         batch_number = (batch_number.split(' - ')[0], batch_number.split(' - ')[1])
-        column_names = ("PIC", "Product Name", "Date", "Batch No.", "From", "To", "Quantity")
+        column_names = ("PIC", "Product Name", "Date", "Batch No.", "From", "To", "Quantity", "Shipment / Sale No.")
         self._insert_table_headings(column_names)
-        self._load_table_rows(self.db_connection.query_traceability_report(batch_number[0], batch_number[1]))
+        self._load_table_rows([[step.worker, step.product, step.date, step.batch_number, step.source, step.destination,
+                                step.quantity, step.reference or ""]
+                               for step in self.db_connection.query_batch_trace(batch_number[0], batch_number[1])])
 
     def user_activities_report(self):
         """
@@ -103,15 +112,16 @@ class ReportFrame(pageFrame):
         column_names = ("Date", "Time", "User", "Activity", "Remark")
         self._insert_table_headings(column_names)
 
-        # --- 2️⃣ Try to fetch from DB ---
+        # --- 2️⃣ Check the DB has any activity; filtering then happens in SQL ---
         try:
-            data = self.db_connection.query_user_activities_report()
+            has_rows = bool(self.db_connection.query_user_activities(limit=1))
         except Exception as e:
             print("DB query failed, using dummy data instead:", e)
-            data = []
+            has_rows = False
 
         # --- 3️⃣ If empty or connection fails, build local dummy dataset ---
-        if not data or len(data) == 0:
+        data = None
+        if not has_rows:
             fake_users = [
                 ("Admin One", "Administrator"),
                 ("Supervisor Sam", "Supervisor"),
@@ -141,7 +151,7 @@ class ReportFrame(pageFrame):
                     random.choice(fake_remarks)
                 ))
 
-        # --- 4️⃣ Save for filtering, show filter bar and render ---
+        # --- 4️⃣ Save dummy rows for filtering (None means live data), show filter bar and render ---
         self._ua_all_rows = data
         self._build_ua_filter_bar()
         self._apply_ua_filter_and_render()
@@ -279,17 +289,39 @@ class ReportFrame(pageFrame):
         combo.grid(row=0, column=1, sticky="w")
         combo.bind("<<ComboboxSelected>>", lambda e: self._apply_ua_filter_and_render())
 
+        # User and activity choices come from the same source as the rows
+        if self._ua_all_rows is None:
+            users = self._list_employees_for_picker()
+            activities = self.db_connection.query_user_activity_names()
+        else:
+            users = sorted({row[2] for row in self._ua_all_rows})
+            activities = sorted({row[3] for row in self._ua_all_rows})
+        for column, (variable, everything, values) in enumerate(
+                ((self._ua_worker_var, "All users", users), (self._ua_activity_var, "All activities", activities)),
+                start=2):
+            if variable.get() not in values:
+                variable.set(everything)
+            combo = ttk.Combobox(self._ua_filter_frame, textvariable=variable, values=[everything, *values],
+                                 state="readonly", width=22)
+            combo.grid(row=0, column=column, sticky="w", padx=(8, 0))
+            combo.bind("<<ComboboxSelected>>", lambda e: self._apply_ua_filter_and_render())
+
         ttk.Button(self._ua_filter_frame, text="Refresh", bootstyle="secondary",
-                   command=self._refresh_ua_data).grid(row=0, column=2, padx=(8, 0))
+                   command=self._refresh_ua_data).grid(row=0, column=4, padx=(8, 0))
+
+        self._ua_status = ttk.Label(self._ua_filter_frame, font=self.font.get_font("thin4"))
+        self._ua_status.grid(row=0, column=5, sticky="e", padx=(8, 0))
+        self._ua_more_button = ttk.Button(self._ua_filter_frame, text="Load more", bootstyle="secondary-link",
+                                          command=self._load_ua_page, state="disabled")
+        self._ua_more_button.grid(row=0, column=6, padx=(8, 0))
 
         # little spacer
         ttk.Separator(self._ua_filter_frame, orient="horizontal").grid(
-            row=1, column=0, columnspan=3, sticky="ew", pady=(8, 0)
+            row=1, column=0, columnspan=7, sticky="ew", pady=(8, 0)
         )
 
-        self._ua_filter_frame.columnconfigure(0, weight=0)
-        self._ua_filter_frame.columnconfigure(1, weight=0)
-        self._ua_filter_frame.columnconfigure(2, weight=1)
+        self._ua_filter_frame.columnconfigure((0, 1, 2, 3, 4), weight=0)
+        self._ua_filter_frame.columnconfigure(5, weight=1)
 
     def _destroy_ua_filter(self):
         if self._ua_filter_frame is not None and self._ua_filter_frame.winfo_exists():
@@ -301,25 +333,29 @@ class ReportFrame(pageFrame):
 
     def _refresh_ua_data(self):
         """Requery DB and reapply active filter."""
-        try:
-            self._ua_all_rows = self.db_connection.query_user_activities_report()
-        except Exception as e:
-            print("Refresh query failed:", e)
-            self._ua_all_rows = []
         self._apply_ua_filter_and_render()
 
+    def _ua_filters(self):
+        """Returns (user, activity) picked in the filter bar, None where everything is shown."""
+        user, activity = self._ua_worker_var.get(), self._ua_activity_var.get()
+        return (None if user == "All users" else user), (None if activity == "All activities" else activity)
+
     def _apply_ua_filter_and_render(self):
-        if not self._ua_all_rows:
-            self.tableview.delete_rows()
-            self.tableview.load_table_data()
+        if self._ua_all_rows is None:
+            # Live data: every filter is pushed into the indexed query, newest rows first
+            self._ua_rows = []
+            self._load_ua_page()
             return
 
         key = (self._ua_filter_var.get() or "All").strip()
 
         # Compute date window
         start, end = self._date_window_for_key(key)  # both are datetime.date or None
+        user, activity = self._ua_filters()
         rows = []
         for row in self._ua_all_rows:
+            if (user is not None and row[2] != user) or (activity is not None and row[3] != activity):
+                continue
             # Expecting ("YYYY-MM-DD", "HH:MM:SS", user, activity, remark)
             raw_date = str(row[0]) if len(row) > 0 else ""
             dt = self._safe_parse_date(raw_date)
@@ -332,6 +368,26 @@ class ReportFrame(pageFrame):
                     rows.append(row)
 
         self._load_table_rows(rows)
+        self._ua_status.configure(text=f"{len(rows)} activities")
+
+    def _load_ua_page(self):
+        """Appends the next UA_ROW_LIMIT live activities matching the filters."""
+        start, end = self._date_window_for_key((self._ua_filter_var.get() or "All").strip())
+        user, activity = self._ua_filters()
+        try:
+            rows = self.db_connection.query_user_activities(start, end,
+                                                            None if user is None else int(user.split(" - ")[0]),
+                                                            activity, limit=UA_ROW_LIMIT, offset=len(self._ua_rows))
+        except Exception as e:
+            print("Refresh query failed:", e)
+            rows = []
+        self._ua_rows += rows
+        self._load_table_rows(self._ua_rows)
+
+        more = len(rows) == UA_ROW_LIMIT
+        self._ua_status.configure(text=f"Latest {len(self._ua_rows)} activities, more not loaded" if more
+                                  else f"{len(self._ua_rows)} activities")
+        self._ua_more_button.configure(state="normal" if more else "disabled")
 
     def _safe_parse_date(self, s: str):
         """Try a few common formats, return date() or None."""
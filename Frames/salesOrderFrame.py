@@ -4,6 +4,7 @@ import ttkbootstrap.tableview
 import ttkbootstrap.toast
 from Frames.pageFrame import *
 from Database.Database import DatabaseConnection
+from Database.Allocation import BatchAllocator
 from ttkbootstrap.validation import add_validation, validator
 
 from Frames.popup import popup
@@ -18,8 +19,8 @@ class salesOrderFrame(pageFrame):
                          title="Sales Order",
                          role=role,
                          button_config={
-                             "Supervisor": ["Add","Update",  "Delete", "Validate"],
-                             "Administrator": ["Add", "Update", "Delete", "Validate"]
+                             "Supervisor": ["Add","Update",  "Delete", "Validate", "Allocate"],
+                             "Administrator": ["Add", "Update", "Delete", "Validate", "Allocate"]
                          }, employeeID=employeeID)
 
         # Inserts Tableview columns
@@ -27,7 +28,7 @@ class salesOrderFrame(pageFrame):
         self._insert_table_headings(colNames)
 
         self.db_connection = DatabaseConnection()
-        self._load_table_rows(self.db_connection.query_salesOrder_table())
+        self._load_table_pages(self.db_connection.query_salesOrder_page)
 
     def _insert_table_headings(self, colNames:list) -> None:
         for name in colNames:
@@ -47,6 +48,9 @@ class salesOrderFrame(pageFrame):
         elif button_text == "Validate":
             self.validatePopup()
 
+        elif button_text == "Allocate":
+            self.allocatePopup()
+
 
     def addPopup(self):
 
@@ -54,7 +58,7 @@ class salesOrderFrame(pageFrame):
             if not self.db_connection.add_salesOrder(toplevel.stringVar[0].get(), toplevel.stringVar[1].get()[:1], toplevel.stringVar[3].get()):
                 toplevel.errVar[4].set("Submission failed to process")
             else:
-                self._load_table_rows(self.db_connection.query_salesOrder_table())
+                self._load_table_pages(self.db_connection.query_salesOrder_page)
                 toplevel.destroy()
 
         def onSaleNoEntry(*args, **kwargs):
@@ -170,7 +174,7 @@ class salesOrderFrame(pageFrame):
                             toplevel.stringVar[2].get().split(' (')[0], toplevel.stringVar[3].get()):
                 toplevel.errVar[3].set("Submission failed to process")
             else:
-                self._load_table_rows(self.db_connection.query_salesOrder_table())
+                self._load_table_pages(self.db_connection.query_salesOrder_page)
                 toplevel.destroy()
 
         def onSaleNoEntry(*args, **kwargs):
@@ -247,11 +251,32 @@ class salesOrderFrame(pageFrame):
             return
         if popup.deleteDialog(self) == "OK":
             if self.db_connection.delete_salesOrder(rowDetails[0]):
-                self._load_table_rows(self.db_connection.query_salesOrder_table())
+                self._load_table_pages(self.db_connection.query_salesOrder_page)
             else:
                 popup.deleteFail(self)
 
+    def allocatePopup(self):
+        """Assigns batches automatically to the selected sales order, or to every Not Delivered order."""
+        try:
+            rowDetails = self.tableview.get_row(iid=self.tableview.view.focus()).values
+        except:
+            rowDetails = []
+        allocator = BatchAllocator(self.db_connection)
+        if rowDetails:
+            result = allocator.allocate(rowDetails[0])
+        elif Messagebox.yesno("No sales order selected. Allocate batches to every Not Delivered order?",
+                              "Allocate", parent=self) == "Yes":
+            result = allocator.allocate_pending()
+        else:
+            return
 
+        message = f"{sum(value.quantity for value in result.allocations)} units assigned " \
+                  f"from {len({value.batch_id for value in result.allocations})} batches."
+        if result.shortfalls:
+            message += f"\n{sum(value[2] for value in result.shortfalls)} units could not be assigned " \
+                       f"(not enough stock)."
+        Messagebox.show_info(message, "Allocate", parent=self)
+        self._load_table_pages(self.db_connection.query_salesOrder_page)
 
     def validatePopup(self):
         try:
@@ -269,13 +294,13 @@ class salesOrderFrame(pageFrame):
                 if not self.db_connection.validate_salesOrder(toplevel.stringVar[0].get()):
                     toplevel.errVar[4].set("Submission failed to process")
                 else:
-                    self._load_table_rows(self.db_connection.query_salesOrder_table())
+                    self._load_table_pages(self.db_connection.query_salesOrder_page)
                     toplevel.destroy()
             else:
                 if not self.db_connection.update_salesOrder_delivery(toplevel.stringVar[0].get().split(' (')[0]):
                     toplevel.errVar[4].set("Submission failed to process")
                 else:
-                    self._load_table_rows(self.db_connection.query_salesOrder_table())
+                    self._load_table_pages(self.db_connection.query_salesOrder_page)
                     toplevel.destroy()
 
         def onSaleNoEntry(*args, **kwargs):
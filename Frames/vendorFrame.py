@@ -1,5 +1,6 @@
 from Frames.pageFrame import *
 from Database.Database import DatabaseConnection
+from Database.BulkImport import BulkImporter
 import re
 from Frames.popup import popup
 from ttkbootstrap.dialogs import Messagebox
@@ -15,7 +16,7 @@ class vendorFrame(pageFrame):
                          role=role,
                          button_config={
                              "Supervisor": ["Add", "Update", "Delete"],
-                             "Administrator": ["Add", "Update", "Delete"]
+                             "Administrator": ["Add", "Update", "Delete", "Import"]
                          }, employeeID=employeeID)
 
         # Inserts Tableview columns
@@ -39,6 +40,10 @@ class vendorFrame(pageFrame):
         elif button_text == "Delete":
             self.deletePopup()
 
+        elif button_text == "Import":
+            self._import_file(BulkImporter(self.db_connection).import_vendors,
+                              lambda: self._load_table_rows(self.db_connection.query_vendor_all()))
+
     def _validate_vendor_form(self, tl) -> bool:
         """
         tl: add/update Pop-up object popup(...)
@@ -0,0 +1,48 @@
+import pytest
+
+from Database import DatabaseConnection
+
+
+@pytest.fixture()
+def seeded():
+    """Seeds a small warehouse inside an open writer transaction and rolls it back afterwards."""
+    db = DatabaseConnection()
+    cursor = db.cursor
+    cursor.execute("INSERT INTO Suppliers (Name) VALUES ('Seed Supplier')")
+    supplier_id = cursor.lastrowid
+    products = []
+    for product_no, name in (("SEED-CHR-001", "Seed Chair"), ("SEED-CHR-002", "Seed Stool"), ("TEST-TBL-001", "Seed Table")):
+        cursor.execute("""INSERT INTO Products (ProductNo, ProductName, Description, Price, PreferredSupplierID)
+            VALUES (?, ?, '', 10.0, ?)""", (product_no, name, supplier_id))
+        products.append(cursor.lastrowid)
+    batches = []
+    for batch_no in ("BATCH-990101-A", "BATCH-990102-A"):
+        cursor.execute("INSERT INTO Product_Batch (PBatchNumber) VALUES (?)", (batch_no,))
+        batches.append(cursor.lastrowid)
+    cursor.executemany("INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID) VALUES (?, ?, ?, ?)", [
+        (products[0], 30, 2, batches[0]), (products[0], 10, 4, batches[0]), (products[0], 5, 4, batches[1]),
+        (products[1], 0, 2, batches[0]), (products[1], 8, 5, batches[1]),
+        (products[2], 20, 4, batches[1]),
+    ])
+    sales = []
+    for sale_no, status in (("SALE-990101-A", "Delivered"), ("SALE-990101-B", "Not Delivered"),
+                            ("SALE-990101-C", "Not Paid")):
+        cursor.execute("INSERT INTO Sales (SaleNo, Date, Status) VALUES (?, '2099-01-01', ?)", (sale_no, status))
+        sales.append(cursor.lastrowid)
+    cursor.executemany("INSERT INTO Sales_Inventory (SaleID, ProductID, QuantitySold) VALUES (?, ?, ?)", [
+        (sales[0], products[1], 8), (sales[0], products[0], 2), (sales[1], products[0], 12), (sales[2], products[2], 4),
+    ])
+    cursor.executemany("""INSERT INTO Shipments (ShipmentNo, ProductID, Quantity, SupplierID, ShipmentDate, PBatchID,
+        Status) VALUES (?, ?, ?, ?, '2099-01-01', ?, ?)""", [
+        ("SHIP-990101-A", products[0], 40, supplier_id, batches[0], "Received"),
+        ("SHIP-990101-B", products[2], 15, supplier_id, batches[1], "In Transit"),
+        ("SHIP-990101-C", products[1], 7, supplier_id, batches[1], "Not Received"),
+    ])
+    cursor.execute("INSERT INTO Tasks (TaskDesc, TaskStatus) VALUES ('Seed task', 'Not Started')")
+    cursor.execute("INSERT INTO Workers (RoleID, Name) VALUES (3, 'Seed Worker')")
+    worker_id = cursor.lastrowid
+    try:
+        yield {"db": db, "products": products, "batches": batches, "sales": sales, "worker": worker_id}
+    finally:
+        db.connection.rollback()
+        db.lookups.clear()
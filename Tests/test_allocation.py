@@ -0,0 +1,34 @@
+import pytest
+
+from Database.Allocation import Allocation, BatchAllocator
+
+
+class TestBatchAllocator:
+    @pytest.fixture()
+    def allocator(self, seeded):
+        return BatchAllocator(seeded["db"])
+
+    def test_fifo_fills_oldest_batch_first(self, seeded, allocator):
+        product, (batch, _) = seeded["products"][0], seeded["batches"]
+        result = allocator.allocate("SALE-990101-B")
+        assert result == ([Allocation("SALE-990101-B", product, batch, 12)], [])
+        assert allocator.allocate("SALE-990101-B") == ([], [])
+        assert seeded["db"].query_salesOrder_productBatch("SEED-CHR-001")[0] == \
+               "BATCH-990101-A (28 units left in warehouse)"
+
+    def test_fefo_prefers_expiring_batch(self, seeded, allocator):
+        product, (batch, other_batch) = seeded["products"][0], seeded["batches"]
+        assert seeded["db"].add_productBatch("BATCH-990102-A", expiryDate="2099-06-01")
+        result = allocator.allocate("SALE-990101-B")
+        assert result.allocations == [Allocation("SALE-990101-B", product, other_batch, 5),
+                                      Allocation("SALE-990101-B", product, batch, 7)]
+
+    def test_pending_run_skips_unpaid_and_reports_shortfalls(self, seeded, allocator):
+        db, products = seeded["db"], seeded["products"]
+        db.cursor.execute("UPDATE Sales_Inventory SET QuantitySold = 50 WHERE SaleID = ?", (seeded["sales"][1],))
+        result = allocator.allocate_pending()
+        seed = [value for value in result.allocations if value.sale_no.startswith("SALE-990101")]
+        assert sum(value.quantity for value in seed) == 45
+        assert ("SALE-990101-B", products[0], 5) in result.shortfalls
+        assert allocator.allocate("SALE-990101-C").allocations == \
+               [Allocation("SALE-990101-C", products[2], seeded["batches"][1], 4)]
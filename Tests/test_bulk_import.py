@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from Database.BulkImport import BulkImporter, RowError
+
+
+class TestBulkImporter:
+    @pytest.fixture()
+    def importer(self, seeded, monkeypatch):
+        notifications = []
+        monkeypatch.setattr(seeded["db"], "create_notification", lambda *args: notifications.append(args))
+        importer = BulkImporter(seeded["db"], chunk_size=2)
+        importer.notifications = notifications
+        return importer
+
+    def test_import_products_reports_bad_rows(self, importer, tmp_path):
+        path = tmp_path / "products.csv"
+        path.write_text("ProductNo,ProductName,Description,Price,Vendor\n"
+                        "BULK-CHR-001,Bulk Chair,Oak,12.5,Seed Supplier\n"
+                        "BULK-CHR-002,Bulk Stool,,abc,Seed Supplier\n"
+                        "SEED-CHR-001,Existing Chair,,1,Seed Supplier\n"
+                        "BULK-CHR-003,Bulk Bench,,4,Unknown Vendor\n"
+                        "BULK-CHR-001,Duplicate Chair,,1,Seed Supplier\n"
+                        "BULK-TBL-001,Bulk Table,,30,Seed Supplier\n")
+        result = importer.import_products(str(path))
+        assert result.imported == 2
+        assert [error.row for error in result.errors] == [2, 3, 4, 5]
+        assert {value[0] for value in importer.db_connection.query_product_table()} >= {"BULK-CHR-001", "BULK-TBL-001"}
+        assert importer.notifications == [("Bulk Import Completed", "2 products")]
+
+    def test_import_purchase_orders_from_json(self, importer, tmp_path):
+        path = tmp_path / "orders.json"
+        path.write_text(json.dumps([
+            {"ProductNo": "SEED-CHR-001", "Quantity": 5, "Vendor": "Seed Supplier", "BatchNo": "BATCH-990101-A"},
+            {"ProductNo": "SEED-CHR-002", "Quantity": 7, "Vendor": "Seed Supplier", "BatchNo": "BATCH-990301-A"},
+            {"ProductNo": "SEED-CHR-002", "Quantity": 0, "Vendor": "Seed Supplier", "BatchNo": "BATCH-990301-A"},
+        ]))
+        result = importer.import_purchaseOrders(str(path))
+        assert result == (2, [RowError(3, "Quantity must be positive")])
+        orders = [order for order in importer.db_connection.query_purchaseOrder() if order[3] == "BATCH-990301-A"]
+        assert [(order[1], order[2]) for order in orders] == [("Seed Stool", 7)]
+
+    def test_malformed_records_are_skipped(self, importer, tmp_path):
+        path = tmp_path / "vendors.jsonl"
+        path.write_text('{"Name": "Bulk Vendor A", "Email": "a@bulk.com", "ContactNumber": "0123456789"}\n'
+                        '{"Name": "Bulk Vendor B", "Email": \n'
+                        '42\n'
+                        '{"Name": "Bulk Vendor C", "Email": "c@bulk.com", "ContactNumber": "0123456789"}\n')
+        result = importer.import_vendors(str(path))
+        assert result.imported == 2
+        assert [error.row for error in result.errors] == [2, 3]
+
+    def test_truncated_json_array_keeps_earlier_rows(self, importer, tmp_path, monkeypatch):
+        monkeypatch.setattr("Database.BulkImport.READ_SIZE", 16)
+        vendors = [{"Name": f"Bulk Vendor {letter}", "Email": f"{letter}@bulk.com", "ContactNumber": 1234567890}
+                   for letter in "ABC"]
+        path = tmp_path / "vendors.json"
+        path.write_text(json.dumps(vendors[:2] + ["not a vendor"] + vendors[2:])[:-30])
+        result = importer.import_vendors(str(path))
+        assert result.imported == 2
+        assert [error.row for error in result.errors] == [3, 4]
+        assert result.errors[1].message.startswith("The rest of the file could not be read")
@@ -3,6 +3,7 @@ import json
 from os.path import dirname, abspath
 
 from configuration import Configuration
+from Database import DatabaseConnection
 
 
 class TestConfiguration:
@@ -28,29 +29,26 @@ class TestConfiguration:
     def test_get_ui_preview_file(self, configuration):
         assert configuration.getPreviewFile() == f"{dirname(dirname(abspath(__file__)))}/Frames/ui_preview_text.json"
 
-    def test_write_preferences(self, configuration):
-        configuration.writePreferences('-1')
+    def test_write_preferences(self, configuration, seeded):
+        worker = str(seeded["worker"])
+        assert configuration.getPreferences(worker) == ('user_1a', 'litera')
+        assert configuration.writePreferences(worker)
+        assert configuration.getPreferences(worker) == ('user_1a', 'litera')
+        configuration.writePreferences(worker, 'user_3b',)
+        assert configuration.getPreferences(worker) == ('user_3b', 'litera')
+        configuration.writePreferences(worker, theme_name='flatly')
+        assert configuration.getPreferences(worker) == ('user_3b', 'flatly')
+        configuration.writePreferences(worker, 'user_2a', 'pulse')
+        assert configuration.getPreferences(worker) == ('user_2a', 'pulse')
+
+    def test_unknown_employee_gets_default_preferences(self, configuration, capsys):
         assert configuration.getPreferences('-1') == ('user_1a', 'litera')
-        configuration.writePreferences('-1', 'user_3b',)
-        assert configuration.getPreferences('-1') == ('user_3b', 'litera')
-        configuration.writePreferences('-1', theme_name='flatly')
-        assert configuration.getPreferences('-1') == ('user_3b', 'flatly')
-        configuration.writePreferences('-1', 'user_2a', 'pulse')
-        assert configuration.getPreferences('-1') == ('user_2a', 'pulse')
-
-    def test_delete_preferences(self, configuration):
-        configuration.deletePreferences('-1')
-        with open(configuration.config_file_path, "r") as f:
-            data = json.load(f)
-        assert '-1' not in data["user_preferences"]["user_id"]
-
-    def test_write_notification_exclusions(self, configuration):
-        configuration.writeNotificationExclusions('-1', '1')
-        configuration.writeNotificationExclusions('-1', '3')
-        assert configuration.getNotificationExclusions('-1') == ['1', '3']
-
-    def test_delete_notification_exclusions(self, configuration):
-        configuration.deleteNotificationExclusions('-1')
-        assert configuration.getNotificationExclusions('-1') == []
-
-
+        assert not configuration.writePreferences('-1', 'user_3b')
+        assert DatabaseConnection().query_preferences(-1) is None
+        assert "Error" not in capsys.readouterr().out
+
+    def test_delete_preferences(self, configuration, seeded):
+        worker = seeded["worker"]
+        configuration.writePreferences(str(worker), 'user_3b')
+        configuration.deletePreferences(str(worker))
+        assert DatabaseConnection().query_preferences(worker) is None
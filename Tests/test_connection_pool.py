@@ -0,0 +1,31 @@
+import sqlite3
+
+import pytest
+
+from Database.ConnectionPool import ReadConnectionPool
+
+
+class TestReadConnectionPool:
+    @pytest.fixture()
+    def pool(self, tmp_path):
+        db_file = tmp_path / "pool.db"
+        with sqlite3.connect(db_file) as connection:
+            connection.execute("CREATE TABLE Roles (RoleID INTEGER PRIMARY KEY, RoleName TEXT)")
+        pool = ReadConnectionPool(str(db_file), size=1, timeout=0.01)
+        yield pool
+        pool.close()
+
+    def test_exhausted_pool_raises_sqlite_error(self, pool):
+        with pool.connection():
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.connection():
+                    pass
+
+    def test_close_keeps_borrowed_connections_counted(self, pool):
+        with pool.connection() as borrowed:
+            pool.close()
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.connection():
+                    pass
+        with pool.connection() as connection:
+            assert connection is borrowed
@@ -0,0 +1,449 @@
+import sqlite3
+
+import pytest
+
+from Database import DatabaseConnection, Sequences
+
+
+class TestDatabaseConnection:
+    @pytest.fixture(scope="class")
+    def db(self):
+        return DatabaseConnection()
+
+    def test_singleton(self, db):
+        assert db is DatabaseConnection()
+
+    def test_wal_mode(self, db):
+        assert db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_read_pool_is_read_only(self, db):
+        with db.read_pool.connection() as connection:
+            with pytest.raises(sqlite3.Error):
+                connection.execute("INSERT INTO Roles (RoleName) VALUES ('Read Only')")
+
+    def test_reads_see_uncommitted_writes(self, db):
+        db.cursor.execute("INSERT INTO Suppliers (Name) VALUES ('Uncommitted Supplier')")
+        try:
+            assert "Uncommitted Supplier" in [value[1] for value in db.query_vendor()]
+        finally:
+            db.connection.rollback()
+        assert "Uncommitted Supplier" not in [value[1] for value in db.query_vendor()]
+        assert db.cursor is db._cursor
+
+
+class TestDashboardSnapshot:
+    def test_matches_individual_queries(self, seeded):
+        db = seeded["db"]
+        snapshot = db.query_dashboard_snapshot()
+        assert snapshot.sales_orders_created == len(db.query_SalesOrder())
+        assert snapshot.sales_orders_pending == len(db.query_updatableSalesOrder())
+        assert snapshot.sales_orders_delivered == len(db.query_salesOrder_delivered())
+        assert snapshot.stock_sold == db.query_stock_sold()
+        assert snapshot.stock_quantity == db.query_stock_quantity()
+        assert snapshot.shipment_quantity == db.query_shipment_quantity()
+        assert snapshot.remaining_tasks == len(db.query_task_updatable())
+        assert list(snapshot.top_selling) == [tuple(value) for value in db.query_product_popular()]
+        assert [snapshot.purchase_orders_created, snapshot.purchase_orders_in_transit,
+                snapshot.purchase_orders_received, snapshot.stock_purchased] == db.query_purchaseOrder_dashboard()
+        assert [snapshot.low_stock_items, snapshot.product_categories, snapshot.product_types,
+                snapshot.out_of_stock_items] == db.query_product_dashboard()
+        assert [snapshot.product_types, snapshot.products_in_stock] == db.query_product_meter()
+
+
+class TestKeysetPagination:
+    @staticmethod
+    def walk(query_page, **kwargs):
+        rows, after = [], None
+        while True:
+            page = query_page(after, page_size=2, **kwargs)
+            rows += page.rows
+            if page.cursor is None:
+                return rows
+            after = page.cursor
+
+    def test_pages_match_unpaginated_queries(self, seeded):
+        db = seeded["db"]
+        assert self.walk(db.query_inventory_page) == db.query_inventory_table()
+        assert self.walk(db.query_salesOrder_page) == db.query_salesOrder_table()
+        assert self.walk(db.query_purchaseOrder_page) == db.query_purchaseOrder()
+
+    def test_sort_keys(self, seeded):
+        db = seeded["db"]
+        rows = self.walk(db.query_inventory_page, sort_key="quantity", descending=True)
+        assert sorted(rows, key=lambda value: value[4], reverse=True) == rows
+        assert sorted(rows) == sorted(db.query_inventory_table())
+        with pytest.raises(ValueError):
+            db.query_inventory_page(sort_key="ProductID; DROP TABLE Inventory")
+
+    def test_search(self, seeded):
+        db = seeded["db"]
+        rows = self.walk(db.query_inventory_page, search="CHAIR")
+        assert rows and rows == [row for row in db.query_inventory_table()
+                                 if any("chair" in str(row[column]).lower() for column in (1, 2, 5, 6))]
+        rows = self.walk(db.query_purchaseOrder_page, sort_key="date", descending=True, search="seed")
+        assert rows and sorted(rows) == sorted(row for row in db.query_purchaseOrder()
+                                               if any("seed" in str(value).lower() for value in row))
+        assert self.walk(db.query_salesOrder_page, search="%") == []
+
+    def test_sort_keys_seek_an_index(self, seeded):
+        db = seeded["db"]
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        try:
+            for sort_key in ("purchase", "date", "status"):
+                rows = self.walk(db.query_purchaseOrder_page, sort_key=sort_key)
+                assert sorted(rows) == sorted(db.query_purchaseOrder())
+            self.walk(db.query_inventory_page, sort_key="quantity")
+        finally:
+            db.connection.set_trace_callback(None)
+        pages = [statement for statement in statements if statement.lstrip().startswith("SELECT") and "LIMIT" in statement]
+        for statement in pages:
+            plan = " ".join(row[3] for row in db.connection.execute(f"EXPLAIN QUERY PLAN {statement}"))
+            assert "TEMP B-TREE" not in plan
+            if " >= " in statement:  # A page after the first starts where the previous one ended
+                assert plan.startswith(("SEARCH s USING INDEX", "SEARCH i USING INDEX"))
+
+
+class TestBatchAvailability:
+    def test_subtracts_undelivered_assignments(self, seeded):
+        db = seeded["db"]
+        product, (batch, other_batch), (delivered, pending, _) = seeded["products"][0], seeded["batches"], seeded["sales"]
+        for sale, quantity in ((delivered, 2), (pending, 4)):
+            db.cursor.execute("SELECT SalesInventoryID FROM Sales_Inventory WHERE SaleID = ? AND ProductID = ?",
+                              (sale, product))
+            db.cursor.execute("INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken) VALUES (?, ?, ?)",
+                              (db.cursor.fetchone()[0], batch, quantity))
+        assert db.query_salesOrder_productBatch("SEED-CHR-001") == ["BATCH-990101-A (36 units left in warehouse)",
+                                                                    "BATCH-990102-A (5 units left in warehouse)"]
+
+
+class TestSalesOrderDelivery:
+    def assign(self, db, sale, product, batch, quantity):
+        db.cursor.execute("SELECT SalesInventoryID FROM Sales_Inventory WHERE SaleID = ? AND ProductID = ?",
+                          (sale, product))
+        db.cursor.execute("INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken) VALUES (?, ?, ?)",
+                          (db.cursor.fetchone()[0], batch, quantity))
+
+    def stock(self, db, product, batch, location):
+        db.cursor.execute("SELECT COALESCE(SUM(StockQuantity), 0) FROM Inventory WHERE ProductID = ? AND PBatchID = ? AND LocationID = ?",
+                          (product, batch, location))
+        return db.cursor.fetchone()[0]
+
+    def test_moves_all_lines_in_one_pass(self, seeded):
+        db = seeded["db"]
+        product, (batch, other_batch) = seeded["products"][0], seeded["batches"]
+        self.assign(db, seeded["sales"][1], product, batch, 8)
+        self.assign(db, seeded["sales"][1], product, other_batch, 4)
+
+        delivery = db.post_salesOrder_delivery("SALE-990101-B")
+        assert sorted((line.batch_id, line.quantity) for line in delivery.lines) == [(batch, 8), (other_batch, 4)]
+        assert (self.stock(db, product, batch, 4), self.stock(db, product, other_batch, 4)) == (2, 1)
+        assert (self.stock(db, product, batch, 5), self.stock(db, product, other_batch, 5)) == (8, 4)
+        assert delivery.low_stock == [("Seed Chair", 33)]
+        assert db.post_salesOrder_delivery("SALE-990101-B") is None
+
+    def test_rejects_unassigned_or_short_orders(self, seeded):
+        db = seeded["db"]
+        product, batch = seeded["products"][0], seeded["batches"][0]
+        assert db.post_salesOrder_delivery("SALE-990101-B") is None
+        self.assign(db, seeded["sales"][1], product, batch, 12)
+        assert db.post_salesOrder_delivery("SALE-990101-B") is None
+        assert self.stock(db, product, batch, 4) == 10
+        assert db.connection.in_transaction
+
+
+class TestTransaction:
+    def vendors(self, db):
+        return [value[1] for value in db.query_vendor()]
+
+    def test_rolls_back_every_step(self):
+        db = DatabaseConnection()
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                assert db.add_vendor("Unit Of Work Vendor", "uow@demo.com", "0123456789")
+                assert db.create_salesOrder()
+                raise RuntimeError
+        assert not db.connection.in_transaction
+        assert "Unit Of Work Vendor" not in self.vendors(db)
+
+    def test_nested_blocks_are_savepoints(self, seeded):
+        db = seeded["db"]
+        with db.transaction():
+            db.add_vendor("Outer Vendor", "outer@demo.com", "0123456789")
+            with pytest.raises(RuntimeError):
+                with db.transaction():
+                    db.add_vendor("Inner Vendor", "inner@demo.com", "0123456789")
+                    raise RuntimeError
+        assert db.connection.in_transaction
+        assert "Outer Vendor" in self.vendors(db)
+        assert "Inner Vendor" not in self.vendors(db)
+
+    def test_failed_write_method_is_rolled_back(self, seeded):
+        db = seeded["db"]
+        with db.transaction():
+            assert not db.add_product("SEED-CHR-001", "Duplicate", "", 1.0, 1)
+            assert db.add_vendor("Still Here", "here@demo.com", "0123456789")
+        assert "Still Here" in self.vendors(db)
+
+
+class TestLookupCache:
+    def test_write_methods_invalidate(self, seeded):
+        db = seeded["db"]
+        assert db.lookups.get("product_names", "SEED-CHR-001") == "Seed Chair"
+        supplier = db.lookups.get("products", "SEED-CHR-001")
+        db.cursor.execute("SELECT PreferredSupplierID FROM Products WHERE ProductID = ?", (supplier,))
+        supplier = db.cursor.fetchone()[0]
+        assert db.update_product("SEED-CHR-001", "Seed Armchair", "", 1.0, supplier)
+        assert db.lookups.get("product_names", "SEED-CHR-001") == "Seed Armchair"
+        assert db.update_vendor(supplier, "Renamed Supplier", "0123456789", "renamed@demo.com")
+        assert db.lookups.get("suppliers", supplier) == "Renamed Supplier"
+
+    def test_rollback_clears_maps(self, seeded):
+        db = seeded["db"]
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.add_productBatch("BATCH-990103-A")
+                assert db.lookups.get("batches", "BATCH-990103-A") is not None
+                raise RuntimeError
+        assert db.lookups.get("batches", "BATCH-990103-A") is None
+
+    def test_other_connection_commit_reloads(self, tmp_path):
+        from Database.LookupCache import LookupCache
+        path = tmp_path / "lookups.db"
+        writer, other = sqlite3.connect(path), sqlite3.connect(path)
+        writer.execute("CREATE TABLE Locations (LocationID INTEGER PRIMARY KEY, LocationName TEXT)")
+        writer.execute("INSERT INTO Locations VALUES (1, 'Input')")
+        writer.commit()
+        lookups = LookupCache(writer)
+        assert lookups.get("locations", 1) == "Input"
+        other.execute("UPDATE Locations SET LocationName = 'Receiving' WHERE LocationID = 1")
+        other.commit()
+        assert lookups.get("locations", 1) == "Receiving"
+
+        statements = []
+        writer.set_trace_callback(statements.append)
+        assert lookups.get("locations", 1) == "Receiving"
+        assert statements == ["PRAGMA data_version"]
+        writer.close(), other.close()
+
+    def test_only_changed_tables_are_reloaded(self, tmp_path):
+        from Database.LookupCache import LookupCache
+        from Database.Migrations import _lookup_versions
+        path = tmp_path / "lookups.db"
+        writer, other = sqlite3.connect(path), sqlite3.connect(path)
+        writer.executescript("""
+            CREATE TABLE Roles (RoleID INTEGER PRIMARY KEY, RoleName TEXT);
+            CREATE TABLE Workers (WorkerID INTEGER PRIMARY KEY, RoleID INTEGER);
+            CREATE TABLE Locations (LocationID INTEGER PRIMARY KEY, LocationName TEXT);
+            CREATE TABLE Products (ProductID INTEGER PRIMARY KEY, ProductNo TEXT, ProductName TEXT, Price REAL);
+            CREATE TABLE Product_Batch (PBatchID INTEGER PRIMARY KEY, PBatchNumber TEXT);
+            CREATE TABLE Suppliers (SupplierID INTEGER PRIMARY KEY, Name TEXT);
+            CREATE TABLE Notification (NotificationID INTEGER PRIMARY KEY, NotificationDesc TEXT);
+            INSERT INTO Locations VALUES (1, 'Input');
+            INSERT INTO Products VALUES (1, 'P-1', 'Chair', 1.0);
+        """)
+        for statement in _lookup_versions():
+            writer.execute(statement)
+        writer.commit()
+
+        lookups = LookupCache(writer)
+        assert lookups.get("locations", 1) == "Input"
+        assert lookups.get("product_names", "P-1") == "Chair"
+        assert lookups.get("product_names", "P-2") is None
+        other.execute("INSERT INTO Notification (NotificationDesc) VALUES ('unrelated')")
+        other.execute("UPDATE Products SET Price = 2.0")
+        other.commit()
+        lookups.get("locations", 1)
+        assert set(lookups._maps) == {"locations", "product_names"}
+
+        other.execute("INSERT INTO Products VALUES (2, 'P-2', 'Stool', 1.0)")
+        other.execute("UPDATE Locations SET LocationName = 'Receiving'")
+        other.commit()
+        assert lookups.get("product_names", "P-2") == "Stool"
+        assert lookups.get("locations", 1) == "Receiving"
+
+        statements = []
+        writer.set_trace_callback(statements.append)
+        assert lookups.get("locations", 1) == "Receiving"
+        assert statements == ["PRAGMA data_version"]
+        writer.close(), other.close()
+
+
+class TestSequences:
+    def test_suffixes(self):
+        from Database.Sequences import suffix_letters, suffix_value
+        assert [suffix_letters(value) for value in (1, 26, 27, 52, 703)] == ["A", "Z", "AA", "AZ", "AAA"]
+        assert all(suffix_value(suffix_letters(value)) == value for value in range(1, 2000))
+
+    def test_reservations_are_consecutive(self, seeded):
+        db = seeded["db"]
+        first, second = db.reserve_ids("SALE", 2)
+        assert db.create_salesOrder()
+        db.cursor.execute("SELECT SaleNo FROM Sales ORDER BY SaleID DESC LIMIT 1")
+        created = db.cursor.fetchone()[0]
+        values = [Sequences.parse(value)[2] for value in (first, second, created)]
+        assert values == [values[0], values[0] + 1, values[0] + 2]
+
+    def test_manual_batch_is_claimed(self, seeded):
+        db = seeded["db"]
+        suggested = db.query_productBatch_today()[-1]
+        prefix, day, value = Sequences.parse(suggested)
+        manual = f"{prefix}-{day}-{Sequences.suffix_letters(value + 2)}"
+        assert db.add_productBatch(manual)
+        assert Sequences.parse(db.reserve_ids("BATCH")[0])[2] == value + 3
+
+
+class TestProductBatch:
+    def test_today_and_idempotent_creation(self, seeded):
+        db = seeded["db"]
+        batch = db.reserve_ids("BATCH")[0]
+        assert db.add_productBatch(batch)
+        assert db.add_productBatch(batch)
+        db.cursor.execute("SELECT COUNT(*) FROM Product_Batch WHERE PBatchNumber = ?", (batch,))
+        assert db.cursor.fetchone()[0] == 1
+        assert batch in db.query_productBatch_today()[:-1]
+        assert "BATCH-990101-A" not in db.query_productBatch_today()
+
+    def test_new_batch_does_not_reload_the_table(self, seeded):
+        db = seeded["db"]
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        try:
+            batchID, created = db._productBatch_id("BATCH-990103-A")
+            assert created
+            assert db.lookups.get("batches", "BATCH-990103-A") == batchID
+            assert db._productBatch_id("BATCH-990103-A") == (batchID, False)
+        finally:
+            db.connection.set_trace_callback(None)
+        assert not [sql for sql in statements if "FROM Product_Batch" in sql and "WHERE" not in sql]
+
+
+class TestMovementLedger:
+    def test_movements_feed_reports(self, seeded):
+        db = seeded["db"]
+        assert db.receive_inventory("SHIP-990101-B")
+        assert db.update_inventory("TEST-TBL-001", "BATCH-990102-A", 1, 2, 6)
+        trace = db.query_traceability_report("BATCH-990102-A", "Seed Table")
+        assert [row[1:2] + row[3:] for row in trace] == [
+            ["TEST-TBL-001 - Seed Table", "BATCH-990102-A", "Vendor", "Input", 15],
+            ["TEST-TBL-001 - Seed Table", "BATCH-990102-A", "Input", "Warehouse", 6]]
+        assert trace[0][0].startswith(f"{db.employeeID} - ")
+        assert [row[1:6] for row in db.query_product_movement_report()[-2:]] == [
+            ["Seed Table", "BATCH-990102-A", "Vendor", "Input", 15],
+            ["Seed Table", "BATCH-990102-A", "Input", "Warehouse", 6]]
+
+    def test_delivery_is_recorded_and_ledger_is_append_only(self, seeded):
+        db = seeded["db"]
+        db.cursor.execute("SELECT SalesInventoryID FROM Sales_Inventory WHERE SaleID = ?", (seeded["sales"][1],))
+        db.cursor.execute("INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken) VALUES (?, ?, 5)",
+                          (db.cursor.fetchone()[0], seeded["batches"][1]))
+        db.cursor.execute("UPDATE Sales_Inventory SET QuantitySold = 5 WHERE SaleID = ?", (seeded["sales"][1],))
+        assert db.post_salesOrder_delivery("SALE-990101-B")
+        db.cursor.execute("""SELECT FromLocationID, ToLocationID, Quantity, SaleID FROM Inventory_Movements
+            ORDER BY MovementID DESC LIMIT 1""")
+        assert db.cursor.fetchone() == (4, 5, 5, seeded["sales"][1])
+        with pytest.raises(sqlite3.IntegrityError):
+            db.cursor.execute("DELETE FROM Inventory_Movements")
+
+    def test_batch_trace_follows_stock_to_customer(self, seeded):
+        db = seeded["db"]
+        table, batch = seeded["products"][2], seeded["batches"][1]
+        assert db.receive_inventory("SHIP-990101-B")
+        assert db.update_inventory("TEST-TBL-001", "BATCH-990102-A", 1, 4, 15)
+        db.cursor.execute("SELECT SalesInventoryID FROM Sales_Inventory WHERE SaleID = ?", (seeded["sales"][2],))
+        db.cursor.execute("INSERT INTO Sales_Inventory_Batch (SalesInventoryID, PBatchID, QuantityTaken) VALUES (?, ?, 4)",
+                          (db.cursor.fetchone()[0], batch))
+        db.cursor.execute("UPDATE Sales SET Status = 'Not Delivered' WHERE SaleID = ?", (seeded["sales"][2],))
+        assert db.post_salesOrder_delivery("SALE-990101-C")
+        trace = db.query_batch_trace("BATCH-990102-A", "Seed Table")
+        assert [(step.depth, step.source, step.destination, step.quantity, step.reference) for step in trace] == [
+            (0, "Vendor", "Input", 15, "SHIP-990101-B"), (1, "Input", "Output", 15, None),
+            (2, "Output", "Customer", 4, "SALE-990101-C")]
+        assert db.query_batch_trace("BATCH-990102-A", "Seed Chair") == []
+
+    def test_batch_trace_depth_is_the_shortest_path(self, seeded):
+        db = seeded["db"]
+        chair, batch = seeded["products"][0], seeded["batches"][0]
+        moves = [(None, 1), (1, 2)] + [(2, 3), (3, 2)] * 200  # Stock bouncing between two locations
+        db.cursor.executemany("""INSERT INTO Inventory_Movements (Timestamp, ProductID, PBatchID, FromLocationID,
+            ToLocationID, Quantity) VALUES (0, ?, ?, ?, ?, 1)""", [(chair, batch, *move) for move in moves])
+        trace = db.query_batch_trace("BATCH-990101-A", "Seed Chair")
+        assert [step.depth for step in trace] == [0, 1] + [2, 3] * 200
+
+    def test_log_import_never_imports_a_line_twice(self, seeded, tmp_path, monkeypatch):
+        db = seeded["db"]
+        log = tmp_path / "Database.log"
+        log.write_text("".join(f"2000-01-0{day} 09:00:00 | Product Movement Report Report | Employee ID: 1 | "
+                               f"Seed Chair | BATCH-990101-A | Input | Warehouse | {day} | INFO\n" for day in (1, 2)))
+        monkeypatch.setattr(db.config, "getLogFile", lambda: str(log))
+        db._import_movement_log()
+        db._import_movement_log()
+        db.cursor.execute("SELECT FromLocationID, ToLocationID, Quantity FROM Inventory_Movements WHERE ProductID = ?",
+                          (seeded["products"][0],))
+        assert db.cursor.fetchall() == [(1, 2, 1), (1, 2, 2)]
+
+    def test_notification_exclusions_import_skips_bad_ids(self, seeded, monkeypatch):
+        db = seeded["db"]
+        db.cursor.execute("INSERT INTO Notification (RoleID, Timestamp, NotificationDesc) VALUES (3, '', 'Seed')")
+        notification = db.cursor.lastrowid
+        deleted = []
+        monkeypatch.setattr(db.config, "legacyNotificationExclusions",
+                            lambda: {"admin": [str(notification)], str(seeded["worker"]): ["x", str(notification)]})
+        monkeypatch.setattr(db.config, "deleteLegacyNotificationExclusions", lambda: deleted.append(True))
+        db._import_notification_exclusions()
+        db.cursor.execute("SELECT WorkerID FROM Notification_Dismissals WHERE NotificationID = ?", (notification,))
+        assert db.cursor.fetchall() == [(seeded["worker"],)]
+        assert deleted == [True]
+
+
+class TestUserActivities:
+    def test_activities_are_stored_and_filtered_in_sql(self, seeded):
+        from datetime import date, timedelta
+        db = seeded["db"]
+        db.cursor.execute("SELECT COALESCE(MAX(ActivityID), 0) FROM User_Activities")
+        before = db.cursor.fetchone()[0]
+        assert db.add_vendor("Audited Vendor", "audit@demo.com", "0123456789")
+        db.logger.bind(id="0").info("Delete Vendor | Someone Else", type="report", key="User Activities")
+        db.cursor.execute("SELECT WorkerID, Activity, Remark FROM User_Activities WHERE ActivityID > ? ORDER BY 1 DESC",
+                          (before,))
+        assert db.cursor.fetchall() == [(1, "Create Vendor", "Audited Vendor"), (0, "Delete Vendor", "Someone Else")]
+
+        today = date.today()
+        assert db.query_user_activities(today, today, worker_id=1, activity="Create Vendor", limit=1)[0][3:] == \
+               ["Create Vendor", "Audited Vendor"]
+        assert db.query_user_activities(today - timedelta(days=7), today - timedelta(days=1), activity="Delete Vendor",
+                                        worker_id=0) == []
+        assert [row[3] for row in db.query_user_activities(today, today, worker_id=0)] == ["Delete Vendor"]
+        assert {"Create Vendor", "Delete Vendor"} <= set(db.query_user_activity_names())
+        first, rest = db.query_user_activities(limit=1), db.query_user_activities(limit=-1, offset=1)
+        assert first + rest == db.query_user_activities(limit=-1)
+
+
+class TestNotificationFeed:
+    def test_keyset_pages_and_unread_cursor(self, seeded):
+        db = seeded["db"]
+        ids = [db.add_notification("Supervisor", f"Feed {i}") for i in range(5)]
+        worker_id = db.add_notification("Worker", "Feed worker")
+        first = ids[0] - 1
+
+        page = db.query_notification("Supervisor", limit=3, after_id=first)
+        assert [row[0] for row in page] == [worker_id, ids[4], ids[3]]
+        page = db.query_notification("Supervisor", limit=3, before_id=page[-1][0], after_id=first)
+        assert [row[0] for row in page] == [ids[2], ids[1], ids[0]]
+        assert [row[0] for row in db.query_notification("Worker", after_id=first)] == [worker_id]
+
+        assert db.mark_notifications_seen(1, ids[2])
+        assert db.mark_notifications_seen(1, ids[0])
+        assert db.query_notification_cursor(1) == ids[2]
+        assert db.query_unread_notification_count("Administrator", 1) == 3
+        assert db.query_unread_notification_count("Worker", 1) == 1
+
+    def test_dismissed_notifications_are_left_out(self, seeded):
+        db = seeded["db"]
+        ids = [db.add_notification("Worker", f"Dismiss {i}") for i in range(3)]
+        assert db.dismiss_notification(1, ids[1])
+        assert db.dismiss_notification(1, ids[1])
+
+        assert [row[0] for row in db.query_notification("Worker", after_id=ids[0] - 1, employeeID=1)] == [ids[2], ids[0]]
+        assert [row[0] for row in db.query_notification("Worker", after_id=ids[0] - 1, employeeID=2)] == ids[::-1]
+        assert db.query_unread_notification_count("Worker", 1) == db.query_unread_notification_count("Worker", 2) - 1
@@ -0,0 +1,83 @@
+import shutil
+import sqlite3
+from os.path import dirname, abspath
+
+import pytest
+
+from Database.Migrations import MIGRATIONS, migrate, current_version
+
+
+class TestMigrations:
+    @pytest.fixture()
+    def connection(self, tmp_path):
+        demo = f"{dirname(dirname(abspath(__file__)))}/Database/Database_demo.db"
+        shutil.copy(demo, tmp_path / "Database.db")
+        connection = sqlite3.connect(tmp_path / "Database.db")
+        yield connection
+        connection.close()
+
+    def test_migrate_unversioned_database(self, connection):
+        assert current_version(connection) == 0
+        assert migrate(connection) == [m[0] for m in MIGRATIONS]
+        assert current_version(connection) == MIGRATIONS[-1][0]
+
+    def test_migrate_is_idempotent(self, connection):
+        migrate(connection)
+        assert migrate(connection) == []
+
+    def test_inventory_lookup_uses_index(self, connection):
+        migrate(connection)
+        plan = connection.execute("""EXPLAIN QUERY PLAN SELECT StockQuantity FROM Inventory
+            WHERE ProductID = 1 AND PBatchID = 1 AND LocationID = 1""").fetchall()
+        assert "idx_inventory_product_batch_location" in str(plan)
+
+    def test_failed_migration_rolls_back(self, connection):
+        broken = MIGRATIONS + [(999, "Broken", ("CREATE TABLE Broken (id INTEGER)", "SELECT * FROM Missing"))]
+        with pytest.raises(sqlite3.Error):
+            migrate(connection, broken)
+        assert current_version(connection) == MIGRATIONS[-1][0]
+        assert connection.execute("SELECT name FROM sqlite_master WHERE name = 'Broken'").fetchone() is None
+
+    def test_stock_summary_tracks_inventory(self, connection):
+        migrate(connection)
+        connection.executemany("INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID) VALUES (?, ?, ?, ?)",
+                               [(1, 10, 2, 1), (1, 5, 2, 2), (1, 7, 5, 1), (2, 3, 4, 1), (2, 4, None, 1)])
+        connection.execute("UPDATE Inventory SET StockQuantity = StockQuantity - 2 WHERE ProductID = 1 AND PBatchID = 1")
+        connection.execute("UPDATE Inventory SET LocationID = 4 WHERE ProductID = 1 AND PBatchID = 2")
+        connection.execute("DELETE FROM Inventory WHERE ProductID = 2 AND LocationID = 4")
+        summary = connection.execute("SELECT ProductID, LocationID, Quantity, Entries FROM Stock_Summary ORDER BY 1, 2")
+        expected = connection.execute("""SELECT ProductID, LocationID, SUM(StockQuantity), COUNT(*) FROM Inventory
+            WHERE LocationID IS NOT NULL GROUP BY ProductID, LocationID ORDER BY 1, 2""")
+        assert summary.fetchall() == expected.fetchall()
+
+    def test_duplicate_batches_are_merged(self, connection):
+        migrate(connection, [m for m in MIGRATIONS if m[0] < 5])
+        connection.executemany("INSERT INTO Product_Batch (PBatchID, PBatchNumber) VALUES (?, ?)",
+                               [(1, "BATCH-250102-A"), (2, "BATCH-250102-A"), (3, "LEGACY")])
+        connection.executemany("INSERT INTO Inventory (ProductID, StockQuantity, LocationID, PBatchID) VALUES (?, ?, ?, ?)",
+                               [(1, 5, 2, 2), (1, 3, 2, 1), (1, 4, 3, 2), (2, 1, 2, 3)])
+        connection.commit()
+        assert migrate(connection) == [m[0] for m in MIGRATIONS if m[0] >= 5]
+        assert connection.execute("SELECT PBatchID, BatchDate FROM Product_Batch ORDER BY 1").fetchall() == \
+               [(1, "2025-01-02"), (3, None)]
+        assert connection.execute("SELECT ProductID, LocationID, PBatchID, StockQuantity FROM Inventory ORDER BY 1, 2"
+                                  ).fetchall() == [(1, 2, 1, 8), (1, 3, 1, 4), (2, 2, 3, 1)]
+        assert connection.execute("SELECT ProductID, LocationID, Quantity FROM Stock_Summary ORDER BY 1, 2"
+                                  ).fetchall() == [(1, 2, 8), (1, 3, 4), (2, 2, 1)]
+        with pytest.raises(sqlite3.IntegrityError):
+            connection.execute("INSERT INTO Product_Batch (PBatchNumber) VALUES ('BATCH-250102-A')")
+        connection.execute("INSERT INTO Product_Batch (PBatchNumber) VALUES ('BATCH-250103-B')")
+        assert connection.execute("SELECT BatchDate FROM Product_Batch WHERE PBatchNumber = 'BATCH-250103-B'"
+                                  ).fetchone() == ("2025-01-03",)
+
+    def test_preferences_go_with_the_worker(self, connection):
+        migrate(connection)
+        connection.execute("PRAGMA foreign_keys = ON")
+        workerID = connection.execute("SELECT MAX(WorkerID) FROM Workers").fetchone()[0]
+        connection.execute("INSERT INTO User_Preferences (WorkerID) VALUES (?)", (workerID,))
+        with pytest.raises(sqlite3.IntegrityError):
+            connection.execute("INSERT INTO User_Preferences (WorkerID) VALUES (-1)")
+        connection.execute("UPDATE Tasks SET WorkerID = NULL WHERE WorkerID = ?", (workerID,))
+        connection.execute("DELETE FROM Accounts WHERE WorkerID = ?", (workerID,))
+        connection.execute("DELETE FROM Workers WHERE WorkerID = ?", (workerID,))
+        assert connection.execute("SELECT COUNT(*) FROM User_Preferences").fetchone()[0] == 0
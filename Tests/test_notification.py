@@ -1,6 +1,12 @@
+import json
+import os
+import sqlite3
+
 import pytest
 
 from Database import Notification, DatabaseConnection
+from Database.NotificationDispatcher import NotificationDispatcher
+from Database.NotificationTemplates import NotificationTemplates
 from configuration import Configuration
 
 
@@ -17,9 +23,9 @@ class TestNotification:
 
     @pytest.fixture(scope="class")
     def configure_exclude(self, notification, notification_id):
-        notification.config.writeNotificationExclusions(notification.employee_id, str(notification_id))
+        # Deleting the notification at the end of the class removes the dismissal with it
+        notification.exclude_notification(notification_id)
         yield 0
-        notification.config.deleteNotificationExclusions(notification.employee_id)
 
     def test_singleton(self):
         obj1 = Notification(2)
@@ -33,7 +39,6 @@ class TestNotification:
         assert notification.config is Configuration()
 
     def test_get_notification(self, notification, configure_exclude):
-        print(notification.config.getNotificationExclusions(notification.employee_id))
         assert "Supervisor level message unique" not in [value[2] for value in notification.get_notifications()]
 
     def test_read_notification(self, notification):
@@ -45,3 +50,75 @@ class TestNotification:
     def test_delete_notification(self, notification, notification_id):
         notification.__delete_notification__(notification_id)
         assert "Supervisor level message unique" not in [value[2] for value in notification.__read_notifications__()]
+
+
+class TestNotificationDispatcher:
+    @pytest.fixture
+    def dispatcher(self, tmp_path):
+        db_file = tmp_path / "notifications.db"
+        with sqlite3.connect(db_file) as connection:
+            connection.executescript("""
+                CREATE TABLE Roles (RoleID INTEGER PRIMARY KEY, RoleName TEXT);
+                INSERT INTO Roles VALUES (1, 'Administrator'), (2, 'Supervisor'), (3, 'Worker');
+                CREATE TABLE Notification (NotificationID INTEGER PRIMARY KEY AUTOINCREMENT, RoleID INTEGER,
+                Timestamp TEXT, NotificationDesc TEXT);
+            """)
+        templates = tmp_path / "Notifications.json"
+        templates.write_text(json.dumps({"Low Stock Alert": {"Title": "Low Stock Alert",
+                                                             "Message": "{} is low on stock (50%).",
+                                                             "Access": "Supervisor"}}))
+        dispatcher = NotificationDispatcher(str(db_file), str(templates))
+        yield dispatcher, db_file
+        dispatcher.close()
+
+    def test_burst_is_one_transaction(self, dispatcher):
+        dispatcher, db_file = dispatcher
+        for i in range(50):
+            dispatcher.submit("Low Stock Alert", f"Product {i}", 1)
+        dispatcher.flush()
+
+        assert dispatcher.transactions == 1
+        with sqlite3.connect(db_file) as connection:
+            rows = connection.execute("SELECT RoleID, NotificationDesc FROM Notification").fetchall()
+        assert len(rows) == 50
+        assert rows[0] == (2, "Product 0 is low on stock (50%).")
+
+    def test_unknown_key_is_ignored(self, dispatcher):
+        dispatcher, db_file = dispatcher
+        dispatcher.submit("No Such Notification", "x", 1)
+        dispatcher.flush()
+
+        with sqlite3.connect(db_file) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM Notification").fetchone()[0] == 0
+
+    def test_commits_keep_lookup_maps(self):
+        db = DatabaseConnection()
+        assert db.lookups.get("roles", "Worker") is not None
+        roles = db.lookups._maps["roles"]
+        db.notifications.submit("Low Stock Alert", "Lookup Check")
+        db.notifications.flush()
+
+        assert db.lookups.get("roles", "Worker") is not None
+        assert db.lookups._maps["roles"] is roles
+        with db.transaction():
+            db.cursor.execute("DELETE FROM Notification WHERE NotificationDesc LIKE 'Lookup Check %'")
+
+
+class TestNotificationTemplates:
+    def test_render_and_reload(self, tmp_path):
+        path = tmp_path / "Notifications.json"
+        path.write_text(json.dumps({"Low Stock Alert": {"Title": "Low Stock Alert",
+                                                        "Message": "{} is low on stock (50%).", "Access": "Worker"}}))
+        templates = NotificationTemplates(str(path))
+
+        template = templates.get("Low Stock Alert")
+        assert template.render("Seed Chair") == "Seed Chair is low on stock (50%)."
+        assert template.render() == "{} is low on stock (50%)."
+        assert templates.get("No Such Notification") is None
+
+        path.write_text(json.dumps({"Low Stock Alert": {"Title": "Low Stock", "Message": "{} is low: {}",
+                                                        "Access": "Supervisor"}}))
+        os.utime(path, ns=(os.stat(path).st_mtime_ns + 10 ** 9,) * 2)
+        template = templates.get("Low Stock Alert")
+        assert (template.title, template.access) == ("Low Stock", "Supervisor")
+        assert template.render("x") == "x is low: x"
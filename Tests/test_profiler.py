@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from Database import DatabaseConnection
+from Database.Profiler import Profiler, install
+
+
+class TestProfiler:
+    @pytest.fixture()
+    def profiler(self):
+        db = DatabaseConnection()
+        profiler = Profiler()
+        profiler.instrument(db)
+        yield profiler
+        for name in [name for name in vars(db) if name.startswith(("query_", "add_", "update_", "delete_"))]:
+            delattr(db, name)
+        db.connection.set_trace_callback(None)
+        db.read_pool.trace_callback = None
+        db.read_pool.close()
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("KEAI_PROFILE", raising=False)
+        assert install(DatabaseConnection()) is None
+
+    def test_records_calls_rows_and_statements(self, profiler, tmp_path):
+        db = DatabaseConnection()
+        for _ in range(3):
+            products = db.query_product()
+        stats = {value["method"]: value for value in profiler.snapshot()}["query_product"]
+        assert stats["calls"] == 3
+        assert stats["rows"] == 3 * len(products)
+        assert stats["statements"] >= 3
+        assert 0 <= stats["p50_ms"] <= stats["p95_ms"]
+
+        profiler.dump(tmp_path / "profile.json")
+        dumped = json.loads((tmp_path / "profile.json").read_text())
+        assert dumped["methods"][0]["method"] == "query_product"
+        assert any("Products" in value["sql"] for value in dumped["statements"])
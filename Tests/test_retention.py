@@ -0,0 +1,62 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from Database.Retention import NotificationRetention, RetentionPolicy, enable_incremental_vacuum
+
+
+class TestNotificationRetention:
+    @pytest.fixture
+    def db_file(self, tmp_path):
+        db_file = tmp_path / "retention.db"
+        old, new = datetime.now() - timedelta(days=120), datetime.now()
+        with sqlite3.connect(db_file) as connection:
+            connection.executescript("""
+                CREATE TABLE Roles (RoleID INTEGER PRIMARY KEY, RoleName TEXT);
+                INSERT INTO Roles VALUES (1, 'Administrator'), (2, 'Supervisor'), (3, 'Worker');
+                CREATE TABLE Notification (NotificationID INTEGER PRIMARY KEY AUTOINCREMENT, RoleID INTEGER NOT NULL,
+                TimeStamp TEXT, NotificationDesc TEXT);
+                CREATE TABLE Notification_Dismissals (WorkerID INTEGER, NotificationID INTEGER
+                REFERENCES Notification(NotificationID) ON DELETE CASCADE, PRIMARY KEY (WorkerID, NotificationID));
+            """)
+            # 5 old worker rows, then 8 recent worker rows and 2 recent supervisor rows
+            connection.executemany("INSERT INTO Notification (RoleID, TimeStamp, NotificationDesc) VALUES (?, ?, ?)",
+                                   [(3, str(old), f"old {i}") for i in range(5)] +
+                                   [(3, str(new), f"new {i}") for i in range(8)] +
+                                   [(2, str(new), f"supervisor {i}") for i in range(2)])
+            connection.execute("INSERT INTO Notification_Dismissals VALUES (1, 1)")
+        return db_file
+
+    def test_age_and_row_limits_are_archived_in_chunks(self, db_file, tmp_path):
+        with sqlite3.connect(db_file) as connection:
+            assert enable_incremental_vacuum(connection)
+            assert not enable_incremental_vacuum(connection)
+        archive = tmp_path / "archive.db"
+        retention = NotificationRetention(str(db_file), str(archive), RetentionPolicy(30, {"Worker": 6}),
+                                          chunk_size=2, chunk_pause=0)
+        result = retention.run()
+        assert (result.expired, result.over_limit) == (5, 2)
+        assert result.pages_freed >= 0
+
+        with sqlite3.connect(db_file) as connection:
+            kept = [row[0] for row in connection.execute("SELECT NotificationDesc FROM Notification ORDER BY 1")]
+            assert connection.execute("SELECT COUNT(*) FROM Notification_Dismissals").fetchone()[0] == 0
+            assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert kept == [f"new {i}" for i in range(2, 8)] + ["supervisor 0", "supervisor 1"]
+
+        with sqlite3.connect(archive) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM Notification").fetchone()[0] == 7
+
+    def test_delete_without_archive(self, db_file, tmp_path):
+        archive = tmp_path / "archive.db"
+        result = NotificationRetention(str(db_file), str(archive), RetentionPolicy(30, None, archive=False)).run()
+        assert (result.expired, result.over_limit) == (5, 0)
+        assert result.pages_freed == 0
+        assert not archive.exists()
+        with sqlite3.connect(db_file) as connection:
+            assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 0  # Never switched by the job
+
+    def test_policy_ignores_unknown_config_keys(self):
+        policy = RetentionPolicy.from_config({"max_age_days": 30, "comment": "kept for a month"})
+        assert policy == RetentionPolicy(30)
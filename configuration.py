@@ -1,8 +1,20 @@
+import atexit
+import copy
 import json
 import os
+import tempfile
+import threading
+
+FLUSH_DELAY = 0.5  # Seconds a change waits for further changes before config.json is written
+DEFAULT_PREFERENCES = ("user_1a", "litera")  # (profile_picture, theme_name) of a new user
 
 
 class Configuration:
+    """
+    config.json is parsed once and reads are served from memory; it is only parsed again when its mtime
+    changes. Changes are written back after FLUSH_DELAY, so a burst of them costs one write, through a
+    temporary file and os.replace, so a crash mid-write never leaves a half-written config.json.
+    """
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -11,153 +23,184 @@ class Configuration:
         return cls._instance
 
     def __init__(self):
+        if getattr(self, "_data", None) is not None:
+            return
         self.repo_file_path = f"{os.path.dirname(os.path.abspath(__file__))}"
         self.config_file_path = f"{os.path.dirname(os.path.abspath(__file__))}/config.json"
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._dirty = False
+        self._timer = None
+        self._data = {}
         self._updatePaths()
+        atexit.register(self.flush)
 
     def getGraphicsPath(self) -> str:
-        with open(self.config_file_path, "r") as f:
-            return json.load(f)["program_files"]["Graphics"]
+        return self._read()["program_files"]["Graphics"]
 
     def getDatabaseFile(self) -> str:
-        with open(self.config_file_path, "r") as f:
-            return json.load(f)["program_files"]["Database"]
+        return self._read()["program_files"]["Database"]
 
     def getPreviewFile(self) -> str:
-        with open(self.config_file_path, "r") as f:
-            return json.load(f)["program_files"]["Preview"]
+        return self._read()["program_files"]["Preview"]
 
     def getLogFile(self) -> str:
-        with open(self.config_file_path, "r") as f:
-            return json.load(f)["program_files"]["Log"]
+        return self._read()["program_files"]["Log"]
 
     def getReportsFile(self) -> str:
-        with open(self.config_file_path, "r") as f:
-            return json.load(f)["program_files"]["Reports"]
-
-    def getPreferences(self, employee_id: str) -> tuple[str, str]:
-        """Returns: (profile_picture, theme_name)"""
-        try:
-            with open(self.config_file_path, "r") as f:
-                data = json.load(f)
-                print(data['user_preferences']['user_id'][str(employee_id)])
-                # print(json.load(f)["user_preferences"]["user_id"][str(employee_id)])
-                preferences = tuple([data["user_preferences"]["user_id"][str(employee_id)]["profile_picture"],
-                                    data["user_preferences"]["user_id"][str(employee_id)]["theme_name"]])
-                return preferences
-
-        except KeyError:
-            self.writePreferences(str(employee_id))
-            return self.getPreferences(employee_id)
-            pass
-
-    def writePreferences(self, employee_id: str, profile_picture: str = "default", theme_name: str = "default"):
-        with open(self.config_file_path, "r") as f:
-            data = json.load(f)
-
-        try:
-            test = data["user_preferences"]["user_id"][str(employee_id)]["profile_picture"]
-            test = data["user_preferences"]["user_id"][str(employee_id)]["theme_name"]
-            if profile_picture != "default":
-                data["user_preferences"]["user_id"][str(employee_id)]["profile_picture"] = profile_picture
-            if theme_name != "default":
-                data["user_preferences"]["user_id"][str(employee_id)]["theme_name"] = theme_name
-
-        except KeyError:
-            data["user_preferences"]["user_id"][str(employee_id)] = {}
-            data["user_preferences"]["user_id"][str(employee_id)]["profile_picture"] = "user_1a"
-            data["user_preferences"]["user_id"][str(employee_id)]["theme_name"] = "litera"
-
-        with open(self.config_file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        return self._read()["program_files"]["Reports"]
 
-    def deletePreferences(self, employee_id: str):
-        with open(self.config_file_path, "r") as f:
-            data = json.load(f)
+    def getArchiveFile(self) -> str:
+        return self._read()["program_files"]["Archive"]
 
-        try:
-            del data["user_preferences"]["user_id"][str(employee_id)]
-            with open(self.config_file_path, "w") as f:
-                json.dump(data, f, indent=4)
+    def getNotificationRetention(self) -> dict:
+        """Returns: {"max_age_days": int, "max_rows_per_role": int | {RoleName: int}, "archive": bool}, any may be missing"""
+        return copy.deepcopy(self._read().get("notification_retention", {}))
 
-        except KeyError:
-            print('key error')
-            return
+    def getPreferences(self, employee_id: str) -> tuple[str, str]:
+        """Returns: (profile_picture, theme_name), stored in the User_Preferences table, or the defaults if none are"""
+        preferences = self._database().query_preferences(int(employee_id))
+        return DEFAULT_PREFERENCES if preferences is None else tuple(preferences)
 
-    def getNotificationExclusions(self, employee_id: str) -> list:
-        try:
-            with open(self.config_file_path, "r") as f:
-                data = json.load(f)
-            return data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"]
+    def writePreferences(self, employee_id: str, profile_picture: str = "default", theme_name: str = "default") -> bool:
+        """Returns False if there is no such employee"""
+        return self._database().write_preferences(int(employee_id),
+                                                  None if profile_picture == "default" else profile_picture,
+                                                  None if theme_name == "default" else theme_name)
 
-        except KeyError:
-            self.writeNotificationExclusions(str(employee_id))
-            return self.getNotificationExclusions(str(employee_id))
+    def deletePreferences(self, employee_id: str):
+        if not self._database().delete_preferences(int(employee_id)):
+            print('key error')
 
-    def writeNotificationExclusions(self, employee_id: str, notification_id: str = None):
-        with open(self.config_file_path, "r") as f:
-            data = json.load(f)
+        with self._lock:
+            users = self._read().get("user_preferences", {}).get("user_id", {})
+            if users.pop(str(employee_id), None) is not None:
+                self._changed()
+
+    def legacyPreferences(self) -> dict:
+        """Returns: {employee_id: {"profile_picture": str, "theme_name": str}} still kept in config.json"""
+        with self._lock:
+            users = self._read().get("user_preferences", {}).get("user_id", {})
+            return {employee_id: {key: user[key] for key in ("profile_picture", "theme_name") if key in user}
+                    for employee_id, user in users.items() if "profile_picture" in user or "theme_name" in user}
+
+    def deleteLegacyPreferences(self) -> None:
+        """Drops the profile_picture and theme_name entries from config.json once they are in the database."""
+        with self._lock:
+            users = self._read().get("user_preferences", {}).get("user_id", {})
+            for employee_id, user in list(users.items()):
+                user.pop("profile_picture", None)
+                user.pop("theme_name", None)
+                if not user:
+                    del users[employee_id]
+            self._changed()
+
+    def legacyNotificationExclusions(self) -> dict:
+        """Returns: {employee_id: [notification_id, ...]} of the exclude_notifications lists still kept in config.json"""
+        with self._lock:
+            users = self._read().get("user_preferences", {}).get("user_id", {})
+            return {employee_id: list(user["exclude_notifications"])
+                    for employee_id, user in users.items() if user.get("exclude_notifications")}
+
+    def deleteLegacyNotificationExclusions(self) -> None:
+        """Drops the exclude_notifications lists from config.json once they are in the database."""
+        with self._lock:
+            users = self._read().get("user_preferences", {}).get("user_id", {})
+            for employee_id, user in list(users.items()):
+                if user.pop("exclude_notifications", None) is None:
+                    continue
+                if not user:
+                    del users[employee_id]
+                self._changed()
+
+    def flush(self) -> None:
+        """Writes pending changes to config.json now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+
+            fd, temp_path = tempfile.mkstemp(prefix=".config.", suffix=".json", dir=self.repo_file_path)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self._data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.config_file_path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            self._mtime = os.stat(self.config_file_path).st_mtime_ns
+            self._dirty = False
+
+    # ---- helpers ---------------------------------------------------------
+
+    def _read(self) -> dict:
+        """Returns the in-memory config, parsing config.json again only if another process changed it."""
+        with self._lock:
+            if self._dirty:
+                return self._data  # Pending changes win until they are flushed
+            try:
+                mtime = os.stat(self.config_file_path).st_mtime_ns
+            except FileNotFoundError:
+                return self._data
+            if mtime != self._mtime:
+                with open(self.config_file_path, "r") as f:
+                    self._data = json.load(f)
+                self._mtime = mtime
+            return self._data
+
+    @staticmethod
+    def _database():
+        from Database import DatabaseConnection  # Imported here because Database imports this module
+        return DatabaseConnection()
+
+    def _changed(self) -> None:
+        """Schedules a write of the in-memory config, restarting the delay on every change."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(FLUSH_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
 
-        try:
-            test = data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"]
-            if notification_id in test or notification_id is None:
-                pass
-            else:
-                data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"].append(str(notification_id))
+    def _updatePaths(self) -> None:
+        program_files = {
+            "Graphics": f"{self.repo_file_path}/Graphics",
+            "Database": f"{self.repo_file_path}/Database/Database.db",
+            "Preview": f"{self.repo_file_path}/Frames/ui_preview_text.json",
+            "Log": f"{self.repo_file_path}/Database/Database.log",
+            "Reports": f"{self.repo_file_path}/Reports",
+            "Archive": f"{self.repo_file_path}/Database/Notification_Archive.db"
+        }
+        with self._lock:
+            if os.path.exists(self.config_file_path):
+                data = self._read()
+                if data.get("program_files") == program_files:
+                    return  # Nothing moved; leave the file alone
+                data["program_files"] = program_files
 
-        except KeyError:
-            if notification_id is None:
-                data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"] = []
             else:
-                data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"] = [notification_id]
-
-        with open(self.config_file_path, "w") as f:
-            json.dump(data, f, indent=4)
-
-    def deleteNotificationExclusions(self, employee_id: str):
-        with open(self.config_file_path, "r") as f:
-            data = json.load(f)
-
-        try:
-            test = data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"]
-            data["user_preferences"]["user_id"][str(employee_id)]["exclude_notifications"] = []
-
-        except KeyError:
-            return
-
-        with open(self.config_file_path, "w") as f:
-            json.dump(data, f, indent=4)
-
-    def _updatePaths(self) -> None:
-        try:
-            with open(self.config_file_path, "r") as f:
-                data = json.load(f)
-
-            data["program_files"] = {
-                "Graphics": f"{self.repo_file_path}/Graphics",
-                "Database": f"{self.repo_file_path}/Database/Database.db",
-                "Preview": f"{self.repo_file_path}/Frames/ui_preview_text.json",
-                "Log": f"{self.repo_file_path}/Database/Database.log",
-                "Reports": f"{self.repo_file_path}/Reports"
-            }
-
-        except FileNotFoundError:
-            data = {
-                "program_files": {
-                    "Graphics": f"{self.repo_file_path}/Graphics",
-                    "Database": f"{self.repo_file_path}/Database/Database.db",
-                    "Preview": f"{self.repo_file_path}/Frames/ui_preview_text.json",
-                    "Log": f"{self.repo_file_path}/Database/Database.log",
-                    "Reports": f"{self.repo_file_path}/Reports"
-                },
-                "user_preferences": {
-                    "user_id": {
+                self._data = {
+                    "program_files": program_files,
+                    "notification_retention": {
+                        "max_age_days": 90,
+                        "max_rows_per_role": 5000,
+                        "archive": True
+                    },
+                    "user_preferences": {
+                        "user_id": {
+                        }
                     }
                 }
-            }
 
-        with open(self.config_file_path, "w") as f:
-            json.dump(data, f, indent=4)
+            self._dirty = True
+            self.flush()  # The paths are needed straight away, e.g. by another process started next
 
 
 if __name__ == "__main__":
@@ -165,7 +208,4 @@ if __name__ == "__main__":
     #obj1.writePreferences('1', "user_3a", theme_name="pulse")
     #print(obj1.getPreferences('1'))
     # obj1.deletePreferences('1')
-    # obj1.writeNotificationExclusions('-1', '5')
     print(obj1.getPreferences('1'))
-    obj1.writeNotificationExclusions('1', "3")
-
@@ -3,6 +3,7 @@ from Frames.Login import Login
 from Frames.navigationFrame import navigationFrame
 from utils_session import SessionTimeout
 from ttkbootstrap.dialogs import Messagebox
+from Database import DatabaseConnection
 
 
 def onLogin(login_view, user_ctx: dict):
@@ -82,6 +83,7 @@ if __name__ == "__main__":
     ttk.window.Window.place_window_center(window)
     window.rowconfigure(0, weight=1)
     window.columnconfigure(0, weight=1)
+    DatabaseConnection().notifications.attach(window)
 
     # 初始化登录界面
     Login(window, onLogin_callback=onLogin)